@@ -1,12 +1,65 @@
 from . import prompt
 from .api_functions import *
-from .stock_history_agent.agent import stock_history_investigator
-from .current_valuation_agent.agent import current_valuation_analyst
-from .future_outlook_agent.agent import future_outlook_analyst
+from .stock_history_agent.agent import stock_history_investigator, build_stock_history_investigator
+from .current_valuation_agent.agent import current_valuation_analyst, build_current_valuation_analyst
+from .future_outlook_agent.agent import future_outlook_analyst, build_future_outlook_analyst
 
-from google.adk.agents import LlmAgent
+import asyncio
+
+# api_functions puts this directory on the path; share its services modules
+from services import answer_cache, data_access, deadline, query_parsing
+
+from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.tools.agent_tool import AgentTool
 
+
+async def prefetch_ticker_snapshot(callback_context: CallbackContext):
+    """
+    Prefetches one shared ticker snapshot for every symbol in the request before
+    the specialists start, so their parallel tool calls read the same data.
+    """
+    user_content = callback_context.user_content
+    text = " ".join(part.text for part in (user_content.parts if user_content else []) if part.text)
+    symbols = query_parsing.extract_ticker_symbols(text)
+    if symbols:
+        await asyncio.to_thread(data_access.prefetch_ticker_snapshot, symbols)
+        callback_context.state["prefetched_symbols"] = symbols
+    return None
+
+
+# Parallel orchestration: all three specialists answer at once, then their
+# output_key results are merged into a single report. The specialists here are
+# separate instances from the ones wrapped in AgentTool below, with instructions
+# that work from the request's symbols instead of asking the user for them.
+parallel_specialists = ParallelAgent(
+    name="parallel_specialists",
+    description="Runs the history, valuation and outlook specialists concurrently.",
+    sub_agents=[
+        build_stock_history_investigator(parallel=True),
+        build_current_valuation_analyst(parallel=True),
+        build_future_outlook_analyst(parallel=True),
+    ],
+    before_agent_callback=prefetch_ticker_snapshot,
+)
+
+full_picture_synthesizer = LlmAgent(
+    name="full_picture_synthesizer",
+    model="gemini-2.5-flash",
+    description="Merges the specialists' findings into one report.",
+    instruction=prompt.FULL_PICTURE_SYNTHESIZER_PROMPT,
+    output_key="full_picture_analyst_output",
+)
+
+full_picture_analyst = SequentialAgent(
+    name="full_picture_analyst",
+    description=(
+        "Answers multi-aspect questions (history, valuation and outlook together) by "
+        "dispatching all specialists in parallel and merging their results."
+    ),
+    sub_agents=[parallel_specialists, full_picture_synthesizer],
+)
+
 root_stock_agent = LlmAgent(
     name="stock_master_analyst",
     model="gemini-2.5-pro",
@@ -17,10 +70,17 @@ root_stock_agent = LlmAgent(
 
     instruction= prompt.STOCK_MASTER_ANALYST_PROMPT,
     output_key="stock_master_analyst_output",
-    
+
+    # Repeated questions are answered from the cache while the tool results
+    # behind the cached answer are unchanged. Every other turn gets a time
+    # budget that its tool calls inherit, removed again when the turn ends
+    before_agent_callback=[answer_cache.serve_cached_answer, deadline.start_turn],
+    after_agent_callback=[deadline.end_turn, answer_cache.store_answer],
+
     tools=[
         AgentTool(agent=stock_history_investigator),
         AgentTool(agent=current_valuation_analyst),
         AgentTool(agent=future_outlook_analyst),
+        AgentTool(agent=full_picture_analyst),
     ],
 )
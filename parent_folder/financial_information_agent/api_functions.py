@@ -6,9 +6,12 @@ from bs4 import BeautifulSoup
 import re
 from urllib.parse import urlparse, urljoin
 
-# Add the parent directory to the Python path so we can import the scraper module
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-import scraper.scraper as scraper
+# Add this directory to the Python path so we can import the shared services
+# (the data-access layer also brings in the scraper module)
+sys.path.append(os.path.dirname(__file__))
+from services import comparison, content_index, data_access, deadline, entity_tagger, indicators, live_quotes, portfolio, records, statements
+from services import screener as screener_service
+from scraper import passages
 
 # Add yfinance for real-time stock data
 try:
@@ -33,7 +36,7 @@ def check_robots_txt(url: str) -> dict:
         parsed_url = urlparse(url)
         robots_url = urljoin(f"{parsed_url.scheme}://{parsed_url.netloc}", '/robots.txt')
         
-        response = requests.get(robots_url, timeout=5)
+        response = requests.get(robots_url, timeout=deadline.timeout(5, f"checking {robots_url}"))
         if response.status_code == 200:
             # Basic check: if 'Disallow: /' is present, assume general disallow
             if "Disallow: /" in response.text:
@@ -54,7 +57,7 @@ def check_robots_txt(url: str) -> dict:
                 "allowed": True,
                 "message": f"No robots.txt found for {url}, assuming scraping is allowed"
             }
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, deadline.DeadlineExceeded) as e:
         return {
             "status": "error",
             "error_message": f"Error checking robots.txt at {url}: {str(e)}"
@@ -73,7 +76,7 @@ def scrape_raw_content(url: str) -> dict:
               or 'error_message' if something went wrong.
     """
     try:
-        response = requests.get(url, timeout=15)
+        response = requests.get(url, timeout=deadline.timeout(15, f"downloading {url}"))
         response.raise_for_status()
         
         return {
@@ -82,7 +85,7 @@ def scrape_raw_content(url: str) -> dict:
             "url": url,
             "status_code": response.status_code
         }
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, deadline.DeadlineExceeded) as e:
         return {
             "status": "error",
             "error_message": f"Failed to retrieve {url}: {str(e)}"
@@ -93,12 +96,15 @@ def scrape_raw_content(url: str) -> dict:
             "error_message": f"An unexpected error occurred while processing {url}: {str(e)}"
         }
 
-def scrape_multiple_urls(urls: list) -> dict:
+def scrape_multiple_urls(urls: list, query: str = "") -> dict:
     """
     Scrapes content from multiple URLs and returns results for each.
     
     Args:
         urls (list): List of URLs to scrape
+        query (str): What you are looking for, e.g. "AAPL guidance services revenue".
+                     When given, each result holds only the most relevant passages
+                     of its page instead of the whole text.
         
     Returns:
         dict: A dictionary with 'status' ("success" or "error") and 'results' 
@@ -110,12 +116,14 @@ def scrape_multiple_urls(urls: list) -> dict:
             "error_message": "No URLs provided"
         }
     
+    # Pages are downloaded concurrently and parsed in worker processes
+    print(f"Scraping {len(urls)} URLs")
+    scraped = data_access.scrape_pages(urls)
     results = []
     for url in urls:
-        result = scan_website_content(url)
         results.append({
             "url": url,
-            "result": result
+            "result": _scan_result(url, scraped[url], query)
         })
     
     return {
@@ -125,26 +133,101 @@ def scrape_multiple_urls(urls: list) -> dict:
     }
 
 # New tool for scanning website content (from previous version)
-def scan_website_content(url: str) -> dict:
+def scan_website_content(url: str, query: str = "") -> dict:
     """
     Scans a given URL and extracts the main text content, cleaning out noise.
     This tool is suitable for extracting articles, reports, or general text
     from web pages, especially financial news or information sites.
+    Pass a query to get only the passages of the page that answer it, which is
+    much shorter than the whole page.
 
     Args:
         url (str): The URL of the website to scan.
+        query (str): What you are looking for on the page, e.g. "NVDA data center
+                     revenue guidance" ("" = return the whole text).
 
     Returns:
         dict: A dictionary with 'status' ("success" or "error") and 'content' (the scraped text)
-              or 'error_message' if something went wrong.
+              or, with a query, 'passages' (the best matching passages, best first,
+              with their position on the page), or 'error_message' if something went wrong.
     """
     print(f"Agent is calling scrape_content for URL: {url}")
-    scraped_text = scraper.scrape_content(url)
-    if "Failed to retrieve" in scraped_text or "No main content found" in scraped_text or "disallowed by robots.txt" in scraped_text:
+    try:
+        scraped_text = data_access.scrape_page(url)
+    except deadline.DeadlineExceeded as e:
+        return {"status": "error", "error_message": str(e)}
+    return _scan_result(url, scraped_text, query)
+
+def _scan_result(url: str, scraped_text: str, query: str = "") -> dict:
+    """
+    Turns scraped text (or a scraper error message) into a tool result and indexes it.
+    With a query, the result holds the best matching passages instead of the whole text.
+    """
+    if "Failed to retrieve" in scraped_text or "No main content found" in scraped_text or "disallowed by robots.txt" in scraped_text \
+            or scraped_text.startswith("An unexpected error occurred"):
         return {"status": "error", "error_message": scraped_text}
     else:
+        # Keep the whole text searchable for later questions (see search_scraped_content)
+        try:
+            content_index.get_index().add(url, scraped_text)
+        except Exception as e:
+            print(f"Could not index {url}: {e}")
+        if query:
+            return {"status": "success", "query": query, "content_length": len(scraped_text),
+                    **_relevant_passages(scraped_text, query)}
         return {"status": "success", "content": scraped_text}
 
+def _relevant_passages(text: str, query: str) -> dict:
+    """Top BM25 passages of text for query, also matching the company behind any ticker or name in it."""
+    boost_terms = []
+    for symbol in entity_tagger.tag(query):
+        boost_terms += [symbol, entity_tagger.get_tagger().names.get(symbol, "")]
+    return passages.rank_passages(text, query, boost_terms=boost_terms)
+
+def search_scraped_content(query: str, symbol: str = "", since: str = "") -> dict:
+    """
+    Searches the text of previously scraped web pages and news articles
+    (everything scan_website_content, scrape_multiple_urls and the background
+    crawler have extracted), best match first. Much faster than scraping pages
+    again, so try it first for news and sentiment questions.
+    
+    Args:
+        query (str): Search terms, e.g. "guidance outlook data center". May be
+                     empty to list the newest pages for a symbol.
+        symbol (str): Only pages mentioning this company, as a ticker or name, e.g. "NVDA" ("" = any).
+        since (str): Only pages fetched after this, e.g. "2025-06-01", "24h" or "7d" ("" = any time).
+        
+    Returns:
+        dict: A dictionary with 'status', 'total_results' and 'results' (url,
+              title, fetched_at, symbols and a text snippet per page), or 'error_message'.
+    """
+    if not query and not symbol:
+        return {
+            "status": "error",
+            "error_message": "Provide a query, a symbol, or both"
+        }
+    
+    try:
+        print(f"Searching scraped content for {query!r} (symbol={symbol!r}, since={since!r})")
+        
+        if symbol:
+            symbol = entity_tagger.resolve_symbol(symbol) or symbol
+        results = content_index.get_index().search(query, symbol=symbol, since=since)
+        
+        return {
+            "status": "success",
+            "query": query,
+            "symbol": symbol.upper(),
+            "total_results": len(results),
+            "results": results
+        }
+        
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error searching scraped content: {str(e)}"
+        }
+
 def get_realtime_stock_price(symbol: str) -> dict:
     """
     Retrieves the real-time stock price for a given stock symbol using yfinance.
@@ -155,6 +238,7 @@ def get_realtime_stock_price(symbol: str) -> dict:
     Returns:
         dict: A dictionary with 'status' ("success" or "error") and 'price', 'currency', 
               'change', 'change_percent', 'volume', 'market_cap' or 'error_message'.
+              Values are raw numbers; 'change_percent' is in percent.
     """
     if not YFINANCE_AVAILABLE:
         return {
@@ -165,40 +249,28 @@ def get_realtime_stock_price(symbol: str) -> dict:
     try:
         print(f"Fetching real-time stock price for: {symbol.upper()}")
         
-        # Get stock info using yfinance
-        ticker = yf.Ticker(symbol.upper())
-        info = ticker.info
+        # Serve from the live quote table when a fresh tick is available
+        live = live_quotes.get_service()
+        if live is not None:
+            tick = live.latest(symbol)
+            if tick is not None:
+                data_access.note_source_ttl(data_access.QUOTE_TTL_SECONDS)
+                return records.QuoteRecord.from_info(symbol.upper(), tick.as_info()).to_dict()
+            live.subscribe([symbol])
         
-        # Get current price and other data
-        current_price = info.get('currentPrice', info.get('regularMarketPrice'))
+        # Lightweight quote (fast_info) instead of the full info blob
+        info = data_access.get_quote(symbol)
+        quote = records.QuoteRecord.from_info(symbol.upper(), info)
         
-        if not current_price:
+        if quote is None:
             return {
                 "status": "error", 
                 "error_message": f"Could not retrieve price for {symbol.upper()}. Symbol may be invalid."
             }
         
-        # Get additional information
-        currency = info.get('currency', 'USD')
-        previous_close = info.get('previousClose', current_price)
-        change = current_price - previous_close if previous_close else 0
-        change_percent = (change / previous_close * 100) if previous_close else 0
-        volume = info.get('volume', 0)
-        market_cap = info.get('marketCap', 0)
-        company_name = info.get('longName', symbol.upper())
-        
-        return {
-            "status": "success",
-            "symbol": symbol.upper(),
-            "company_name": company_name,
-            "price": f"{current_price:.2f}",
-            "currency": currency,
-            "change": f"{change:+.2f}",
-            "change_percent": f"{change_percent:+.2f}%",
-            "volume": f"{volume:,}",
-            "market_cap": f"${market_cap:,}" if market_cap else "N/A",
-            "previous_close": f"{previous_close:.2f}"
-        }
+        # Not published to the live table: the quote may come from the cache and
+        # would pass for a fresh tick there; the feed picks the symbol up instead
+        return quote.to_dict()
         
     except Exception as e:
         return {
@@ -238,13 +310,11 @@ def get_company_news(company_name: str) -> dict:
         }
     
     try:
-        print(f"Fetching real-time news for: {company_name}")
-        
-        # Try to get news using the company name/symbol
-        ticker = yf.Ticker(company_name.upper())
+        # Resolve company names ("Google") to their ticker locally before asking yfinance
+        symbol = entity_tagger.resolve_symbol(company_name) or company_name
+        print(f"Fetching real-time news for: {company_name} ({symbol.upper()})")
         
-        # Get news articles
-        news = ticker.news
+        news = data_access.get_ticker_news(symbol)
         
         if not news:
             return {
@@ -261,12 +331,13 @@ def get_company_news(company_name: str) -> dict:
                 "publisher": article.get('publisher', 'Unknown'),
                 "published": article.get('published', 'Unknown'),
                 "url": article.get('link', ''),
-                "sentiment": article.get('sentiment', 'neutral')
+                "sentiment": article.get('sentiment', 'neutral'),
+                "mentioned_symbols": entity_tagger.tag(f"{article.get('title', '')}\n{article.get('summary', '')}")
             })
         
         return {
             "status": "success",
-            "company": company_name.upper(),
+            "company": symbol.upper(),
             "news_count": len(processed_news),
             "news_articles": processed_news
         }
@@ -317,6 +388,8 @@ def analyze_financial_report(report_text: str) -> dict:
 def get_company_profile(symbol: str) -> dict:
     """
     Gets comprehensive company profile information using yfinance.
+    Numbers are returned raw (null when unavailable); margins, growth and
+    dividend yield are fractions (0.25 == 25%).
     
     Args:
         symbol (str): The stock ticker symbol (e.g., "TSLA", "AAPL", "GOOGL").
@@ -333,39 +406,9 @@ def get_company_profile(symbol: str) -> dict:
     try:
         print(f"Fetching company profile for: {symbol.upper()}")
         
-        ticker = yf.Ticker(symbol.upper())
-        info = ticker.info
+        info = data_access.get_ticker_info(symbol)
         
-        # Extract key company information
-        profile = {
-            "status": "success",
-            "symbol": symbol.upper(),
-            "company_name": info.get('longName', symbol.upper()),
-            "sector": info.get('sector', 'N/A'),
-            "industry": info.get('industry', 'N/A'),
-            "description": info.get('longBusinessSummary', 'No description available'),
-            "website": info.get('website', 'N/A'),
-            "employees": info.get('fullTimeEmployees', 'N/A'),
-            "country": info.get('country', 'N/A'),
-            "city": info.get('city', 'N/A'),
-            "state": info.get('state', 'N/A'),
-            "founded": info.get('founded', 'N/A'),
-            "ceo": info.get('companyOfficers', [{}])[0].get('name', 'N/A') if info.get('companyOfficers') else 'N/A',
-            "market_cap": f"${info.get('marketCap', 0):,}" if info.get('marketCap') else 'N/A',
-            "enterprise_value": f"${info.get('enterpriseValue', 0):,}" if info.get('enterpriseValue') else 'N/A',
-            "pe_ratio": f"{info.get('trailingPE', 0):.2f}" if info.get('trailingPE') else 'N/A',
-            "forward_pe": f"{info.get('forwardPE', 0):.2f}" if info.get('forwardPE') else 'N/A',
-            "price_to_book": f"{info.get('priceToBook', 0):.2f}" if info.get('priceToBook') else 'N/A',
-            "debt_to_equity": f"{info.get('debtToEquity', 0):.2f}" if info.get('debtToEquity') else 'N/A',
-            "profit_margins": f"{info.get('profitMargins', 0)*100:.2f}%" if info.get('profitMargins') else 'N/A',
-            "revenue_growth": f"{info.get('revenueGrowth', 0)*100:.2f}%" if info.get('revenueGrowth') else 'N/A',
-            "52_week_high": f"${info.get('fiftyTwoWeekHigh', 0):.2f}" if info.get('fiftyTwoWeekHigh') else 'N/A',
-            "52_week_low": f"${info.get('fiftyTwoWeekLow', 0):.2f}" if info.get('fiftyTwoWeekLow') else 'N/A',
-            "beta": f"{info.get('beta', 0):.2f}" if info.get('beta') else 'N/A',
-            "dividend_yield": f"{info.get('dividendYield', 0)*100:.2f}%" if info.get('dividendYield') else 'N/A'
-        }
-        
-        return profile
+        return records.CompanyProfileRecord.from_info(symbol.upper(), info).to_dict()
         
     except Exception as e:
         return {
@@ -373,15 +416,22 @@ def get_company_profile(symbol: str) -> dict:
             "error_message": f"Error fetching company profile for {symbol.upper()}: {str(e)}"
         }
 
-def get_financial_metrics(symbol: str) -> dict:
+def get_financial_metrics(symbol: str, period: str = "annual") -> dict:
     """
-    Gets detailed financial metrics and ratios for a company.
+    Gets detailed financial metrics and ratios for a company: revenue, net income,
+    free cash flow, margins, ROE, ROA, leverage and growth rates, for the latest
+    filing period and every earlier period available.
+    Numbers are returned raw (null when unavailable); ratios, margins and growth
+    rates are fractions (0.25 == 25%). Quarterly periods also get year-over-year
+    growth rates (*_growth_yoy) next to the quarter-over-quarter ones.
     
     Args:
         symbol (str): The stock ticker symbol.
+        period (str): "annual" (default) or "quarterly".
         
     Returns:
-        dict: A dictionary with financial metrics and ratios.
+        dict: A dictionary with the latest period's metrics and a 'history' of
+              every metric per period (oldest first).
     """
     if not YFINANCE_AVAILABLE:
         return {
@@ -392,45 +442,202 @@ def get_financial_metrics(symbol: str) -> dict:
     try:
         print(f"Fetching financial metrics for: {symbol.upper()}")
         
-        ticker = yf.Ticker(symbol.upper())
+        ratios = statements.get_statement_ratios(symbol, period)
+        if ratios.empty:
+            return {
+                "status": "error",
+                "error_message": f"No financial statements found for {symbol.upper()}"
+            }
         
-        # Get financial statements
-        income_stmt = ticker.income_stmt
-        balance_sheet = ticker.balance_sheet
-        cash_flow = ticker.cashflow
+        metrics = records.FinancialMetricsRecord.from_row(
+            symbol.upper(), period, ratios.index[-1], ratios.iloc[-1]
+        ).to_dict()
+        metrics["history"] = {
+            "period_end": [d.strftime('%Y-%m-%d') for d in ratios.index],
+            **{column: [records.to_number(v) for v in ratios[column]] for column in ratios.columns},
+        }
         
-        # Get latest annual data
-        if not income_stmt.empty:
-            latest_revenue = income_stmt.loc['Total Revenue'].iloc[0] if 'Total Revenue' in income_stmt.index else 0
-            latest_net_income = income_stmt.loc['Net Income'].iloc[0] if 'Net Income' in income_stmt.index else 0
-        else:
-            latest_revenue = 0
-            latest_net_income = 0
-            
-        if not balance_sheet.empty:
-            latest_assets = balance_sheet.loc['Total Assets'].iloc[0] if 'Total Assets' in balance_sheet.index else 0
-            latest_liabilities = balance_sheet.loc['Total Liabilities'].iloc[0] if 'Total Liabilities' in balance_sheet.index else 0
-        else:
-            latest_assets = 0
-            latest_liabilities = 0
+        return metrics
         
-        metrics = {
+    except Exception as e:
+        return {
+            "status": "error", 
+            "error_message": f"Error fetching financial metrics for {symbol.upper()}: {str(e)}"
+        }
+
+def screen_stocks(sector: str = "", min_pe: float = 0.0, max_pe: float = 0.0,
+                  max_forward_pe: float = 0.0, max_price_to_book: float = 0.0,
+                  min_dividend_yield: float = 0.0, max_beta: float = 0.0,
+                  sort_by: str = "market_cap", descending: bool = True, limit: int = 10) -> dict:
+    """
+    Screens a universe of large companies by valuation fields in one call, e.g.
+    "tech stocks under 20x earnings" is sector="Technology", max_pe=20.
+    A bound of 0 means "no bound". Dividend yield is a fraction (0.02 == 2%).
+    
+    Args:
+        sector (str): Substring of the sector or industry, e.g. "Technology" ("" = any).
+        min_pe (float): Minimum trailing P/E.
+        max_pe (float): Maximum trailing P/E.
+        max_forward_pe (float): Maximum forward P/E.
+        max_price_to_book (float): Maximum price/book.
+        min_dividend_yield (float): Minimum dividend yield.
+        max_beta (float): Maximum beta.
+        sort_by (str): One of pe_ratio, forward_pe, price_to_book, beta, dividend_yield, market_cap.
+        descending (bool): Rank from highest to lowest.
+        limit (int): Maximum number of results.
+        
+    Returns:
+        dict: A dictionary with 'status', 'matches' (list of symbols with their
+              fields) and 'loaded_count' (rows of the universe loaded so far;
+              right after startup not every company is screened yet), or
+              'error_message'.
+    """
+    try:
+        print(f"Screening stocks: sector={sector!r} max_pe={max_pe} sort_by={sort_by}")
+        
+        # Rows come from the background refresher; at most a few stale rows are
+        # reloaded here, and not while a refresh is already running
+        screener = screener_service.get_screener()
+        if screener.loaded_count == 0:
+            # Just started: wait for the refresher's first batch within the turn's budget
+            screener.wait_for_rows(deadline.timeout(screener_service.FIRST_LOAD_TIMEOUT_SECONDS,
+                                                    "loading the screener"))
+        if screener.loaded_count == 0:
+            return {
+                "status": "error",
+                "error_message": "The stock screener is still loading its data; try again shortly."
+            }
+        screener.refresh(max_rows=screener_service.INLINE_REFRESH_ROWS, blocking=False)
+        
+        bound = lambda value: value if value else None
+        filters = {
+            "pe_ratio": (bound(min_pe), bound(max_pe)),
+            "forward_pe": (None, bound(max_forward_pe)),
+            "price_to_book": (None, bound(max_price_to_book)),
+            "dividend_yield": (bound(min_dividend_yield), None),
+            "beta": (None, bound(max_beta)),
+        }
+        matches = screener.query(
+            filters={field: b for field, b in filters.items() if b != (None, None)},
+            sector=sector, sort_by=sort_by, descending=descending, limit=limit,
+        )
+        
+        return {
             "status": "success",
-            "symbol": symbol.upper(),
-            "revenue": f"${latest_revenue:,.0f}" if latest_revenue else 'N/A',
-            "net_income": f"${latest_net_income:,.0f}" if latest_net_income else 'N/A',
-            "total_assets": f"${latest_assets:,.0f}" if latest_assets else 'N/A',
-            "total_liabilities": f"${latest_liabilities:,.0f}" if latest_liabilities else 'N/A',
-            "return_on_equity": f"{(latest_net_income / (latest_assets - latest_liabilities) * 100):.2f}%" if (latest_assets - latest_liabilities) > 0 else 'N/A',
-            "return_on_assets": f"{(latest_net_income / latest_assets * 100):.2f}%" if latest_assets > 0 else 'N/A'
+            "universe_size": len(screener.symbols),
+            "loaded_count": screener.loaded_count,
+            "match_count": len(matches),
+            "matches": matches
         }
         
-        return metrics
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error screening stocks: {str(e)}"
+        }
+
+def compare_companies(symbols: list, period: str = "1y") -> dict:
+    """
+    Compares several companies side by side in one call: price, valuation ratios,
+    profitability, leverage and growth, plus their price performance over the
+    period rebased to 100 at the start. Every metric is a list aligned with
+    'symbols'. Ratios and returns are fractions (0.25 == 25%).
+    
+    Args:
+        symbols (list): Two or more ticker symbols, e.g. ["AAPL", "MSFT", "GOOGL"].
+        period (str): Performance period, e.g. "6mo", "1y", "5y".
+        
+    Returns:
+        dict: A dictionary with 'status', 'symbols', 'metrics', 'returns' and
+              'normalized_prices', or 'error_message'. When some symbols could
+              not be loaded, 'partial' is True and 'errors' maps each to its error.
+    """
+    if not YFINANCE_AVAILABLE:
+        return {
+            "status": "error", 
+            "error_message": "yfinance not available. Install with: pip install yfinance"
+        }
+    
+    try:
+        print(f"Comparing companies: {symbols} over {period}")
+        
+        return {"status": "success", **comparison.compare(symbols, period)}
         
     except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error comparing {symbols}: {str(e)}"
+        }
+
+def get_technical_indicators(symbol: str, interval: str = "1d") -> dict:
+    """
+    Gets the current technical indicators of a stock: simple moving averages
+    (20, 50, 200 bars), exponential moving averages (12, 26), RSI (14), MACD
+    (12, 26, 9), Bollinger bands (20, 2) and ATR (14), plus readings of them
+    (price vs. moving averages, RSI zone, MACD trend). Values are raw numbers
+    in the stock's currency (RSI 0..100, Bollinger %B 0..1 inside the bands).
+    
+    Args:
+        symbol (str): The stock ticker symbol.
+        interval (str): Bar interval: "1h", "1d" (default) or "1wk".
+        
+    Returns:
+        dict: A dictionary with 'status', 'as_of', 'close', 'provisional' (True
+              while the latest bar is still forming), 'indicators' and 'signals',
+              or 'error_message'.
+    """
+    if not YFINANCE_AVAILABLE:
         return {
             "status": "error", 
-            "error_message": f"Error fetching financial metrics for {symbol.upper()}: {str(e)}"
+            "error_message": "yfinance not available. Install with: pip install yfinance"
+        }
+    
+    try:
+        print(f"Computing {interval} technical indicators for: {symbol}")
+        
+        return {"status": "success", **indicators.get_indicators(symbol, interval)}
+        
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error computing technical indicators for {symbol.upper()}: {str(e)}"
+        }
+
+def analyze_portfolio(symbols: list, weights: list = None, benchmark: str = "SPY", period: str = "1y") -> dict:
+    """
+    Analyzes how a basket of holdings has behaved together, in one call:
+    portfolio return, volatility, max drawdown and beta to a benchmark, plus
+    per-holding volatility, beta, contribution to portfolio risk and
+    correlations. Per-holding values are lists aligned with 'symbols'.
+    Returns, volatilities and contributions are annualized fractions
+    (0.25 == 25%).
+    
+    Args:
+        symbols (list): Ticker symbols of the holdings, e.g. ["AAPL", "MSFT", "JNJ"].
+        weights (list): One weight per symbol, in any unit (shares of the portfolio,
+                        dollar amounts); omit for equal weights.
+        benchmark (str): Index or ETF to measure beta against, e.g. "SPY" or "^GSPC".
+        period (str): History period, e.g. "6mo", "1y", "5y".
+        
+    Returns:
+        dict: A dictionary with 'status', 'symbols', 'portfolio', 'holdings',
+              'correlation' and 'excluded', or 'error_message'.
+    """
+    if not YFINANCE_AVAILABLE:
+        return {
+            "status": "error", 
+            "error_message": "yfinance not available. Install with: pip install yfinance"
+        }
+    
+    try:
+        print(f"Analyzing portfolio of {len(symbols)} symbols against {benchmark} over {period}")
+        
+        return {"status": "success", **portfolio.analyze(symbols, weights, benchmark, period)}
+        
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error analyzing portfolio of {len(symbols)} symbols: {str(e)}"
         }
 
 def get_enhanced_company_news(symbol: str) -> dict:
@@ -452,8 +659,7 @@ def get_enhanced_company_news(symbol: str) -> dict:
     try:
         print(f"Fetching enhanced news for: {symbol.upper()}")
         
-        ticker = yf.Ticker(symbol.upper())
-        news = ticker.news
+        news = data_access.get_ticker_news(symbol)
         
         if not news:
             return {
@@ -471,7 +677,8 @@ def get_enhanced_company_news(symbol: str) -> dict:
                     "publisher": article.get('publisher', 'Unknown publisher'),
                     "published": article.get('published', 'Unknown date'),
                     "url": article.get('link', ''),
-                    "sentiment": article.get('sentiment', 'neutral')
+                    "sentiment": article.get('sentiment', 'neutral'),
+                    "mentioned_symbols": entity_tagger.tag(f"{article.get('title', '')}\n{article.get('summary', '')}")
                 }
                 processed_news.append(processed_article)
             except Exception as e:
@@ -491,13 +698,16 @@ def get_enhanced_company_news(symbol: str) -> dict:
             "error_message": f"Error fetching news for {symbol.upper()}: {str(e)}"
         }
 
-def get_company_wikipedia_info(company_name: str) -> dict:
+def get_company_wikipedia_info(company_name: str, query: str = "") -> dict:
     """
     Scrapes additional company information from Wikipedia and other sources.
     This complements the API data with more detailed background information.
     
     Args:
         company_name (str): The company name or symbol to search for.
+        query (str): What you want to know, e.g. "acquisitions and subsidiaries".
+                     When given, the article passages that answer it are returned
+                     instead of the opening of the article.
         
     Returns:
         dict: A dictionary with additional company information from web sources.
@@ -510,12 +720,12 @@ def get_company_wikipedia_info(company_name: str) -> dict:
         wiki_url = f"https://en.wikipedia.org/wiki/{company_name.replace(' ', '_')}"
         
         # Use the scraper to get content
-        scraped_content = scraper.scrape_content(wiki_url)
+        scraped_content = data_access.scrape_page(wiki_url)
         
         if "Failed to retrieve" in scraped_content or "No main content found" in scraped_content:
             # Try alternative search
             search_url = f"https://en.wikipedia.org/wiki/Special:Search/{company_name.replace(' ', '_')}"
-            scraped_content = scraper.scrape_content(search_url)
+            scraped_content = data_access.scrape_page(search_url)
         
         if "Failed to retrieve" in scraped_content or "No main content found" in scraped_content:
             return {
@@ -531,9 +741,13 @@ def get_company_wikipedia_info(company_name: str) -> dict:
             "status": "success",
             "company_name": company_name,
             "source": "Wikipedia",
-            "content_preview": scraped_content[:500] + "..." if len(scraped_content) > 500 else scraped_content,
             "key_facts": {}
         }
+        if query:
+            info["query"] = query
+            info.update(passages.rank_passages(scraped_content, query, boost_terms=[company_name]))
+        else:
+            info["content_preview"] = scraped_content[:500] + "..." if len(scraped_content) > 500 else scraped_content
         
         # Extract founding year if present
         import re
@@ -559,40 +773,58 @@ def get_company_wikipedia_info(company_name: str) -> dict:
             "error_message": f"Error fetching Wikipedia info for {company_name}: {str(e)}"
         }
 
+# Most time get_comprehensive_company_info may take (less if the turn has less left)
+COMPREHENSIVE_INFO_BUDGET_SECONDS = 20
+
 def get_comprehensive_company_info(symbol: str) -> dict:
     """
     Gets comprehensive company information by combining multiple sources.
     This is the main function that aggregates all company data.
+    The sources are queried concurrently within a time budget; sources that do
+    not answer in time are left out and the result is marked as partial.
     
     Args:
         symbol (str): The stock ticker symbol.
         
     Returns:
-        dict: A comprehensive dictionary with all available company information.
+        dict: A comprehensive dictionary with all available company information,
+              with 'partial' and 'missing_sections' when some sources timed out.
     """
     print(f"Getting comprehensive information for: {symbol.upper()}")
     
-    # Get all available information
-    stock_price = get_realtime_stock_price(symbol)
-    company_profile = get_company_profile(symbol)
-    financial_metrics = get_financial_metrics(symbol)
-    enhanced_news = get_enhanced_company_news(symbol)
+    def wiki_info():
+        # Try to get Wikipedia info using company name (the profile is shared, not fetched twice)
+        company_profile = get_company_profile(symbol)
+        company_name = company_profile.get('company_name', symbol) if company_profile.get('status') == 'success' else symbol
+        return get_company_wikipedia_info(company_name)
     
-    # Try to get Wikipedia info using company name
-    company_name = company_profile.get('company_name', symbol) if company_profile.get('status') == 'success' else symbol
-    wiki_info = get_company_wikipedia_info(company_name)
+    # Get all available information
+    with deadline.budget(COMPREHENSIVE_INFO_BUDGET_SECONDS):
+        sections, missing = deadline.gather({
+            "stock_price": lambda: get_realtime_stock_price(symbol),
+            "company_profile": lambda: get_company_profile(symbol),
+            "financial_metrics": lambda: get_financial_metrics(symbol),
+            "news": lambda: get_enhanced_company_news(symbol),
+            "additional_info": wiki_info,
+        }, f"getting comprehensive information for {symbol.upper()}")
+    # Sources that ran out of time themselves report it as an error
+    missing += [name for name, result in sections.items()
+                if isinstance(result, dict) and deadline.EXHAUSTED in str(result.get("error_message", ""))]
     
     # Compile comprehensive report
     comprehensive_info = {
         "status": "success",
         "symbol": symbol.upper(),
         "timestamp": "Current",
-        "stock_price": stock_price,
-        "company_profile": company_profile,
-        "financial_metrics": financial_metrics,
-        "news": enhanced_news,
-        "additional_info": wiki_info
+        "partial": bool(missing),
     }
+    for section in ("stock_price", "company_profile", "financial_metrics", "news", "additional_info"):
+        comprehensive_info[section] = sections.get(section) or {
+            "status": "error",
+            "error_message": "Skipped: the time budget ran out before this source answered"
+        }
+    if missing:
+        comprehensive_info["missing_sections"] = missing
     
     return comprehensive_info
 
@@ -0,0 +1,92 @@
+"""
+Benchmark of the two quote paths used by the price tools:
+the full yf.Ticker(symbol).info blob versus the lightweight fast_info quote
+(data_access.get_quote). For every symbol and round, both paths run on a fresh
+Ticker with every cache bypassed; latency, upstream requests and response bytes
+are reported per path.
+
+Usage:
+    python benchmark_quote_paths.py [SYMBOL ...] [--rounds N]
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(__file__))
+from services import cache_backend, data_access
+
+import yfinance as yf
+from yfinance.data import YfData
+
+
+class _Traffic:
+    """Counts the requests and response bytes yfinance makes."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+
+    def install(self):
+        original = YfData._make_request
+        traffic = self
+
+        def counting_request(self, *args, **kwargs):
+            response = original(self, *args, **kwargs)
+            traffic.requests += 1
+            traffic.bytes += len(response.content or b'')
+            return response
+
+        YfData._make_request = counting_request
+
+
+def _measure(traffic: _Traffic, load) -> tuple:
+    requests_before, bytes_before = traffic.requests, traffic.bytes
+    started = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - started
+    return elapsed, traffic.requests - requests_before, traffic.bytes - bytes_before
+
+
+def _info_path(symbol: str):
+    return yf.Ticker(symbol).info
+
+
+def _quote_path(symbol: str):
+    return data_access._load_quote(symbol)
+
+
+def run(symbols: list, rounds: int) -> dict:
+    cache_backend.set_backend(cache_backend.NullBackend())
+    traffic = _Traffic()
+    traffic.install()
+    # Cookie and crumb set-up happens once per process; keep it out of the numbers
+    yf.Ticker(symbols[0]).info
+
+    results = {}
+    for name, load in (("info", _info_path), ("fast_info", _quote_path)):
+        samples = [_measure(traffic, lambda: load(symbol)) for _ in range(rounds) for symbol in symbols]
+        latencies = [s[0] for s in samples]
+        results[name] = {
+            "median_ms": statistics.median(latencies) * 1000,
+            "p95_ms": sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)] * 1000,
+            "requests_per_quote": statistics.mean(s[1] for s in samples),
+            "kb_per_quote": statistics.mean(s[2] for s in samples) / 1024,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("symbols", nargs="*", default=["AAPL", "MSFT", "NVDA", "JPM", "XOM"])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Benchmarking quote paths for {', '.join(args.symbols)} ({args.rounds} rounds)")
+    results = run([s.upper() for s in args.symbols], args.rounds)
+    print(f"{'path':<10} {'median ms':>10} {'p95 ms':>10} {'requests':>9} {'KB':>9}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['median_ms']:>10.1f} {r['p95_ms']:>10.1f} "
+              f"{r['requests_per_quote']:>9.1f} {r['kb_per_quote']:>9.1f}")
@@ -2,19 +2,41 @@ from . import prompt
 import sys
 import os
 
+from google.adk.agents import LlmAgent
+
 # Add parent directory to path to import shared_tools
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from shared_tools import get_tools_for_agent
+from services.answer_cache import record_tool_result
+
+# Model for this specialty; override with the CURRENT_VALUATION_MODEL environment variable
+DEFAULT_MODEL = os.getenv("CURRENT_VALUATION_MODEL", "gemini-2.5-flash-lite")
+
+def build_current_valuation_analyst(model: str = DEFAULT_MODEL, parallel: bool = False) -> LlmAgent:
+    """
+    Creates a new current_valuation_analyst agent.
+    Each call returns a fresh instance, because an ADK agent can only belong to one parent.
+
+    Args:
+        model (str): The model to run this specialist on.
+        parallel (bool): Build the instance for parallel_specialists, which works
+            from the symbols of the request instead of asking the user.
 
-class CurrentValuationAnalyst:
-    def __init__(self):
-        self.name = "current_valuation_analyst"
-        self.description = (
+    Returns:
+        LlmAgent: The configured agent.
+    """
+    return LlmAgent(
+        name="current_valuation_analyst",
+        model=model,
+        description=(
             "Delivers a real-time snapshot of a company's financial health, valuation ratios, "
             "and core profile information."
-        )
-        self.instruction = prompt.CURRENT_VALUATION_ANALYST_PROMPT
-        self.output_key = "current_valuation_analyst_output"
-        self.tools = get_tools_for_agent('current_valuation')
+        ),
+        instruction=(prompt.CURRENT_VALUATION_ANALYST_PARALLEL_PROMPT if parallel
+                     else prompt.CURRENT_VALUATION_ANALYST_PROMPT),
+        output_key="current_valuation_analyst_output",
+        after_tool_callback=record_tool_result,
+        tools=get_tools_for_agent('current_valuation'),
+    )
 
-current_valuation_analyst = CurrentValuationAnalyst()
+current_valuation_analyst = build_current_valuation_analyst()
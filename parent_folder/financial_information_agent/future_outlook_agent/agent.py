@@ -2,19 +2,41 @@ from . import prompt
 import sys
 import os
 
+from google.adk.agents import LlmAgent
+
 # Add parent directory to path to import shared_tools
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from shared_tools import get_tools_for_agent
+from services.answer_cache import record_tool_result
+
+# Model for this specialty; override with the FUTURE_OUTLOOK_MODEL environment variable
+DEFAULT_MODEL = os.getenv("FUTURE_OUTLOOK_MODEL", "gemini-2.5-flash")
+
+def build_future_outlook_analyst(model: str = DEFAULT_MODEL, parallel: bool = False) -> LlmAgent:
+    """
+    Creates a new future_outlook_analyst agent.
+    Each call returns a fresh instance, because an ADK agent can only belong to one parent.
+
+    Args:
+        model (str): The model to run this specialist on.
+        parallel (bool): Build the instance for parallel_specialists, which works
+            from the symbols of the request instead of asking the user.
 
-class FutureOutlookAnalyst:
-    def __init__(self):
-        self.name = "future_outlook_analyst"
-        self.description = (
+    Returns:
+        LlmAgent: The configured agent.
+    """
+    return LlmAgent(
+        name="future_outlook_analyst",
+        model=model,
+        description=(
             "Analyzes web sentiment, real-time news, and public content to evaluate a company's "
             "potential future performance and public perception."
-        )
-        self.instruction = prompt.FUTURE_OUTLOOK_ANALYST_PROMPT
-        self.output_key = "future_outlook_analyst_output"
-        self.tools = get_tools_for_agent('future_outlook')
+        ),
+        instruction=(prompt.FUTURE_OUTLOOK_ANALYST_PARALLEL_PROMPT if parallel
+                     else prompt.FUTURE_OUTLOOK_ANALYST_PROMPT),
+        output_key="future_outlook_analyst_output",
+        after_tool_callback=record_tool_result,
+        tools=get_tools_for_agent('future_outlook'),
+    )
 
-future_outlook_analyst = FutureOutlookAnalyst()
+future_outlook_analyst = build_future_outlook_analyst()
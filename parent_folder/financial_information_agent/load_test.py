@@ -0,0 +1,545 @@
+"""
+Load test of root_stock_agent: drives many concurrent chat sessions through the
+full agent tree (root, AgentTool specialists, the parallel full-picture
+pipeline and every tool) in one process, without any network access.
+
+Every LlmAgent runs on a scripted stand-in model that waits a configurable
+latency and then emits the tool calls a real model typically makes for the
+question (root -> specialist -> price, profile, statements, news, scraping ->
+answer). yfinance and HTTP are replaced by offline fakes that return realistic
+data after a configurable upstream latency, so the numbers measure the agent
+framework, the tools, the caches and the scraping pipeline of this process.
+
+Reports throughput, p50/p95/p99 turn latency, model and tool calls and the
+memory retained per session (tracemalloc), for capacity planning and for
+regression checks between versions.
+
+Usage:
+    python load_test.py [--sessions N] [--turns T] [--concurrency C]
+                        [--model-latency MS] [--upstream-latency MS]
+                        [--tool-threads N] [--profile-rate R] [--no-memory]
+                        [--json] [--verbose]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+import zlib
+from collections import Counter
+
+# Keep the content index and every cache of the test in memory
+os.environ.setdefault("CONTENT_INDEX_PATH", ":memory:")
+os.environ.setdefault("MARKET_DATA_CACHE", "memory")
+os.environ.pop("SCRAPER_RENDERING", None)
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pandas as pd
+import requests
+import yfinance as yf
+
+from google.adk.agents import LlmAgent
+from google.adk.agents.run_config import RunConfig, ToolThreadPoolConfig
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+
+from financial_information_agent.agent import root_stock_agent
+from services import entity_tagger, profiling, query_parsing
+import scraper.boilerplate as boilerplate
+
+APP_NAME = "load_test"
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA", "JPM", "XOM", "JNJ",
+           "V", "WMT", "PG", "KO", "PFE", "INTC", "AMD", "NFLX", "DIS", "BA"]
+
+# (question template, specialist the root agent routes it to)
+QUESTIONS = [
+    ("What is {symbol} trading at right now and how is it valued?", "current_valuation_analyst"),
+    ("How have {symbol}'s revenue and margins developed over the last quarters?", "stock_history_investigator"),
+    ("What is the outlook for {symbol}? Any recent news I should know about?", "future_outlook_analyst"),
+    ("Give me the full picture on {symbol}: history, valuation and outlook.", "full_picture_analyst"),
+]
+
+# Agent name -> steps; each step is the tool calls the model emits in one response
+# (name, arguments built from the symbol and a peer symbol). Calls to tools the
+# agent does not have are skipped.
+SCRIPTS = {
+    "current_valuation_analyst": [
+        [("get_realtime_stock_price", lambda s, peer: {"symbol": s}),
+         ("get_company_profile", lambda s, peer: {"symbol": s})],
+        [("get_financial_metrics", lambda s, peer: {"symbol": s})],
+    ],
+    "stock_history_investigator": [
+        [("get_financial_metrics", lambda s, peer: {"symbol": s, "period": "quarterly"}),
+         ("get_technical_indicators", lambda s, peer: {"symbol": s})],
+        [("compare_companies", lambda s, peer: {"symbols": [s, peer], "period": "1y"})],
+    ],
+    "future_outlook_analyst": [
+        [("get_enhanced_company_news", lambda s, peer: {"symbol": s}),
+         ("search_scraped_content", lambda s, peer: {"query": s})],
+        [("scan_website_content", lambda s, peer: {"url": f"https://news.example.com/{s.lower()}/latest",
+                                                    "query": f"{s} guidance margins outlook"})],
+    ],
+}
+
+ANSWER_SENTENCE = ("{symbol} trades at {n} times earnings with steady margins; revenue growth, "
+                   "balance sheet strength and recent news point to a stable outlook. ")
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def _count(name: str, amount: int = 1):
+    with _counters_lock:
+        _counters[name] += amount
+
+
+# ---------------------------------------------------------------------------
+# Scripted model
+# ---------------------------------------------------------------------------
+
+def _current_turn(contents) -> tuple:
+    """The text of the latest user message and the contents after it."""
+    for index in range(len(contents) - 1, -1, -1):
+        content = contents[index]
+        if content.role == "user" and any(part.text for part in content.parts or ()):
+            return " ".join(part.text for part in content.parts if part.text), contents[index + 1:]
+    return "", contents
+
+
+def _symbol_of(text: str) -> str:
+    symbols = query_parsing.extract_ticker_symbols(text)
+    return symbols[0] if symbols else (entity_tagger.resolve_symbol(text) or "AAPL")
+
+
+def _route(text: str) -> str:
+    lowered = text.lower()
+    for template, agent_name in QUESTIONS:
+        if template.split("{symbol}")[-1].lower().strip(" ?.:") in lowered:
+            return agent_name
+    return "current_valuation_analyst"
+
+
+def _usage(prompt_tokens: int, output_tokens: int) -> types.GenerateContentResponseUsageMetadata:
+    _count("prompt_tokens", prompt_tokens)
+    _count("output_tokens", output_tokens)
+    return types.GenerateContentResponseUsageMetadata(prompt_token_count=prompt_tokens,
+                                                      candidates_token_count=output_tokens,
+                                                      total_token_count=prompt_tokens + output_tokens)
+
+
+class ScriptedModel(BaseLlm):
+    """
+    Stand-in for a real model. For the agent it is attached to, it answers the
+    n-th model call of a turn with the n-th step of that agent's script (or,
+    for the root agent, with a call to the specialist the question belongs to)
+    and with a final text answer once the script is done.
+    """
+
+    agent_name: str = ""
+    latency_seconds: float = 0.0
+    answer_sentences: int = 8
+
+    async def generate_content_async(self, llm_request, stream: bool = False):
+        _count("model_calls")
+        await asyncio.sleep(self.latency_seconds)
+        text, turn = _current_turn(llm_request.contents)
+        symbol = _symbol_of(text)
+        tools = llm_request.tools_dict
+        step = sum(1 for content in turn if any(part.function_response for part in content.parts or ()))
+
+        if tools and any(isinstance(tool, AgentTool) for tool in tools.values()):
+            steps = [[(_route(text), lambda s, peer: {"request": text})]]
+        else:
+            steps = SCRIPTS.get(self.agent_name, [])
+        peer = "MSFT" if symbol != "MSFT" else "AAPL"
+        # Token counts are estimated from the request size (about 4 characters a token)
+        prompt_tokens = len(str(llm_request.contents)) // 4
+        while step < len(steps):
+            calls = [(name, build(symbol, peer)) for name, build in steps[step] if name in tools]
+            if calls:
+                for name, _ in calls:
+                    _count(f"call:{name}")
+                yield LlmResponse(content=types.Content(role="model", parts=[
+                    types.Part(function_call=types.FunctionCall(name=name, args=args)) for name, args in calls
+                ]), usage_metadata=_usage(prompt_tokens, 20 * len(calls)))
+                return
+            step += 1
+
+        answer = "".join(ANSWER_SENTENCE.format(symbol=symbol, n=20 + i) for i in range(self.answer_sentences))
+        yield LlmResponse(content=types.Content(role="model", parts=[
+            types.Part.from_text(text=f"[{self.agent_name}] {answer}")
+        ]), usage_metadata=_usage(prompt_tokens, len(answer) // 4))
+
+
+def _llm_agents(agent):
+    """Every LlmAgent in the tree, including those wrapped in AgentTools."""
+    stack, seen = [agent], set()
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, LlmAgent):
+            yield current
+            stack.extend(tool.agent for tool in current.tools if isinstance(tool, AgentTool))
+        stack.extend(current.sub_agents)
+
+
+def install_scripted_models(agent, latency_seconds: float) -> int:
+    """Puts a ScriptedModel behind every LlmAgent of the tree; returns how many."""
+    agents = list(_llm_agents(agent))
+    for llm_agent in agents:
+        llm_agent.model = ScriptedModel(model=f"scripted-{llm_agent.name}", agent_name=llm_agent.name,
+                                        latency_seconds=latency_seconds)
+    return len(agents)
+
+
+# ---------------------------------------------------------------------------
+# Offline yfinance and HTTP
+# ---------------------------------------------------------------------------
+
+def _seed(symbol: str) -> int:
+    return zlib.crc32(symbol.encode("utf-8"))
+
+
+def _base_price(symbol: str) -> float:
+    return 20.0 + _seed(symbol) % 480
+
+
+_PERIOD_DAYS = {"1d": 1, "2d": 2, "5d": 5, "1mo": 21, "3mo": 63, "6mo": 126, "ytd": 200, "1y": 252,
+                "2y": 504, "5y": 1260, "10y": 2520, "max": 2520}
+
+
+class FakeTicker:
+    """Offline yf.Ticker with deterministic, plausible data for any symbol."""
+
+    upstream_latency_seconds = 0.0
+
+    def __init__(self, ticker, session=None):
+        self.ticker = ticker.upper()
+        self._random = np.random.default_rng(_seed(self.ticker))
+
+    def _upstream(self, what: str):
+        _count("upstream_requests")
+        _count(f"upstream:{what}")
+        time.sleep(self.upstream_latency_seconds)
+
+    @property
+    def info(self) -> dict:
+        self._upstream("info")
+        price = _base_price(self.ticker)
+        name = entity_tagger.get_tagger().names.get(self.ticker) or f"{self.ticker.title()} Corporation"
+        return {
+            "symbol": self.ticker, "quoteType": "EQUITY", "exchange": "NMS", "currency": "USD",
+            "longName": name, "shortName": name, "sector": "Technology", "industry": "Software",
+            "country": "United States", "city": "Springfield", "state": "CA", "website": "https://example.com",
+            "fullTimeEmployees": 10000 + _seed(self.ticker) % 150000,
+            "longBusinessSummary": f"{name} designs, manufactures and sells products worldwide. " * 6,
+            "currentPrice": price, "regularMarketPrice": price, "previousClose": price * 0.99,
+            "volume": 1000000 + _seed(self.ticker) % 9000000, "marketCap": int(price * 1e9),
+            "enterpriseValue": int(price * 1.05e9), "trailingPE": 12 + _seed(self.ticker) % 30,
+            "forwardPE": 10 + _seed(self.ticker) % 25, "priceToBook": 1.5 + _seed(self.ticker) % 9,
+            "beta": 0.6 + (_seed(self.ticker) % 100) / 100, "dividendYield": (_seed(self.ticker) % 40) / 1000,
+            "profitMargins": 0.05 + (_seed(self.ticker) % 30) / 100, "revenueGrowth": 0.02 + (_seed(self.ticker) % 20) / 100,
+            "debtToEquity": 20 + _seed(self.ticker) % 150, "fiftyTwoWeekHigh": price * 1.2, "fiftyTwoWeekLow": price * 0.7,
+            "companyOfficers": [{"name": "Alex Smith", "title": "Chief Executive Officer"}],
+        }
+
+    @property
+    def fast_info(self) -> dict:
+        self._upstream("fast_info")
+        price = _base_price(self.ticker)
+        return {"lastPrice": price, "previousClose": price * 0.99, "lastVolume": 1000000 + _seed(self.ticker) % 9000000,
+                "marketCap": price * 1e9, "currency": "USD", "exchange": "NMS"}
+
+    @property
+    def news(self) -> list:
+        self._upstream("news")
+        name = entity_tagger.get_tagger().names.get(self.ticker) or self.ticker
+        return [{
+            "title": f"{name} ({self.ticker}) {headline}",
+            "summary": f"Analysts discuss {name}'s latest quarter and its guidance for the year ahead.",
+            "publisher": "Example Wire",
+            "published": f"2026-10-{10 + i:02d}",
+            "link": f"https://news.example.com/{self.ticker.lower()}/story-{i}",
+        } for i, headline in enumerate(("beats estimates", "raises guidance", "expands buyback",
+                                        "announces new product", "faces supply questions"))]
+
+    def _statement(self, rows: dict, periods: int, quarterly: bool) -> pd.DataFrame:
+        self._upstream("statement")
+        freq = "QE-DEC" if quarterly else "YE-DEC"
+        dates = pd.date_range(end="2025-12-31", periods=periods, freq=freq)[::-1]
+        scale = _base_price(self.ticker) * 1e8 / (4 if quarterly else 1)
+        growth = np.cumprod(1 + self._random.normal(0.02, 0.03, periods))[::-1]
+        return pd.DataFrame({date: {row: share * scale * g for row, share in rows.items()}
+                             for date, g in zip(dates, growth)})
+
+    _INCOME = {"Total Revenue": 1.0, "Gross Profit": 0.45, "Operating Income": 0.28, "Net Income": 0.22}
+    _BALANCE = {"Total Assets": 3.0, "Total Liabilities Net Minority Interest": 1.8,
+                "Stockholders Equity": 1.2, "Total Debt": 0.9}
+    _CASHFLOW = {"Operating Cash Flow": 0.3, "Capital Expenditure": -0.08, "Free Cash Flow": 0.22}
+
+    income_stmt = property(lambda self: self._statement(self._INCOME, 4, False))
+    balance_sheet = property(lambda self: self._statement(self._BALANCE, 4, False))
+    cashflow = property(lambda self: self._statement(self._CASHFLOW, 4, False))
+    quarterly_income_stmt = property(lambda self: self._statement(self._INCOME, 8, True))
+    quarterly_balance_sheet = property(lambda self: self._statement(self._BALANCE, 8, True))
+    quarterly_cashflow = property(lambda self: self._statement(self._CASHFLOW, 8, True))
+
+
+def fake_download(tickers, period="1mo", interval="1d", group_by="column", **kwargs) -> pd.DataFrame:
+    """Offline yf.download: a random walk of prices per symbol."""
+    symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+    _count("upstream_requests")
+    _count("upstream:download")
+    time.sleep(FakeTicker.upstream_latency_seconds)
+    days = _PERIOD_DAYS.get(period, 252)
+    if interval.endswith("m"):
+        index = pd.date_range(end=pd.Timestamp("2026-10-16 16:00"), periods=days * 390, freq="min")
+    else:
+        index = pd.bdate_range(end="2026-10-16", periods=days)
+    columns = {}
+    for symbol in symbols:
+        # One walk per symbol, ending at its base price, so every period and
+        # interval shows the same bars for the same dates
+        random = np.random.default_rng(_seed(symbol))
+        length = max(len(index), _PERIOD_DAYS["max"])
+        walk = np.cumprod(1 + random.normal(0.0004, 0.015, length))
+        closes = (_base_price(symbol) * walk / walk[-1])[-len(index):]
+        volumes = random.integers(100000, 1000000, length)[-len(index):]
+        spread = np.abs(random.normal(0, 0.005, length))[-len(index):]
+        opens = closes * (1 + random.normal(0, 0.003, length)[-len(index):])
+        bars = (("Open", opens), ("High", closes * (1 + spread)), ("Low", closes * (1 - spread)),
+                ("Close", closes), ("Volume", volumes))
+        for field, values in bars:
+            columns[(symbol, field) if group_by == "ticker" else (field, symbol)] = values
+    return pd.DataFrame(columns, index=index)
+
+
+_ARTICLE = """<html><head><title>{name} news</title></head><body>
+<nav class="site-nav"><a href="/">Home</a> <a href="/markets">Markets</a> <a href="/tech">Tech</a></nav>
+<main><article><h1>{name} ({symbol}) reports quarterly results</h1>
+{paragraphs}
+</article></main>
+<footer class="site-footer">Copyright Example News. Subscribe to our newsletter.</footer>
+</body></html>"""
+
+
+def _page(url: str) -> str:
+    parts = [part for part in url.split("/") if part]
+    symbol = (parts[2] if "example.com" in url else parts[-1]).replace("_", " ").upper()
+    name = entity_tagger.get_tagger().names.get(symbol) or symbol.title()
+    paragraphs = "\n".join(
+        f"<p>{name} said revenue grew {5 + i}% year over year, helped by demand for its core products. "
+        f"Management expects margins to stay stable, and analysts raised their targets for {symbol}. "
+        f"The company was founded in 19{70 + i} and its headquarters are in Springfield.</p>"
+        for i in range(12)
+    )
+    return _ARTICLE.format(name=name, symbol=symbol, paragraphs=paragraphs)
+
+
+def fake_request(session, method, url, *args, **kwargs) -> requests.Response:
+    """Offline requests.Session.request: robots.txt allows everything; every page is an article."""
+    _count("http_requests")
+    time.sleep(FakeTicker.upstream_latency_seconds)
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response.encoding = "utf-8"
+    if url.endswith("/robots.txt"):
+        response.headers["Content-Type"] = "text/plain"
+        response._content = b"User-agent: *\nAllow: /\n"
+    else:
+        response.headers["Content-Type"] = "text/html; charset=utf-8"
+        response._content = _page(url).encode("utf-8")
+    return response
+
+
+def install_offline_fakes(upstream_latency_seconds: float):
+    """Replaces yfinance and HTTP with the offline fakes for this process."""
+    FakeTicker.upstream_latency_seconds = upstream_latency_seconds
+    yf.Ticker = FakeTicker
+    yf.download = fake_download
+    requests.Session.request = fake_request
+    # Do not write the learned boilerplate of the fake site into the repository
+    boilerplate.get_learner().path = None
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+def _question(user_index: int, turn: int) -> str:
+    template, _ = QUESTIONS[(user_index + turn) % len(QUESTIONS)]
+    return template.format(symbol=SYMBOLS[(user_index * 7 + turn * 3) % len(SYMBOLS)])
+
+
+async def _ask(runner: Runner, run_config: RunConfig, user_id: str, session_id: str, question: str):
+    answer = None
+    async for event in runner.run_async(user_id=user_id, session_id=session_id, run_config=run_config,
+                                        new_message=types.Content(role="user", parts=[types.Part.from_text(text=question)])):
+        if event.is_final_response() and event.content and event.content.parts:
+            answer = "".join(part.text or "" for part in event.content.parts) or answer
+    return answer
+
+
+async def _session(runner, service, run_config, user_index, turns, think_seconds, gate, latencies, failures):
+    user_id = f"user-{user_index}"
+    session = await service.create_session(app_name=APP_NAME, user_id=user_id)
+    for turn in range(turns):
+        if turn and think_seconds:
+            await asyncio.sleep(think_seconds)
+        async with gate:
+            started = time.perf_counter()
+            try:
+                answer = await _ask(runner, run_config, user_id, session.id, _question(user_index, turn))
+            except Exception as e:
+                failures.append(f"{user_id} turn {turn}: {e!r}")
+                continue
+            latencies.append(time.perf_counter() - started)
+        if not answer:
+            failures.append(f"{user_id} turn {turn}: no answer")
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+async def run(sessions: int, turns: int, concurrency: int, think_seconds: float = 0.0,
+              tool_threads: int = 0, trace_memory: bool = True) -> dict:
+    """
+    Runs the load test (fakes and scripted models must already be installed).
+
+    Args:
+        sessions (int): Simulated users, each with its own session.
+        turns (int): Questions each user asks, one after the other.
+        concurrency (int): Most turns in flight at once.
+        think_seconds (float): Pause of each user between two turns.
+        tool_threads (int): Run synchronous tools on a thread pool of this size
+                            (0: on the event loop, the ADK default).
+        trace_memory (bool): Measure retained memory with tracemalloc (slows the run).
+
+    Returns:
+        dict: Throughput, latency percentiles, call counts, memory and failures.
+    """
+    service = InMemorySessionService()
+    runner = Runner(app_name=APP_NAME, agent=root_stock_agent, session_service=service)
+    run_config = RunConfig(tool_thread_pool_config=ToolThreadPoolConfig(max_workers=tool_threads)) \
+        if tool_threads else RunConfig()
+
+    # One warm-up turn outside the measurement: lazy imports, registries, pools
+    warm_up_service = InMemorySessionService()
+    warm_up = Runner(app_name=APP_NAME, agent=root_stock_agent, session_service=warm_up_service)
+    warm_up_session = await warm_up_service.create_session(app_name=APP_NAME, user_id="warm-up")
+    await _ask(warm_up, run_config, "warm-up", warm_up_session.id, "What is IBM trading at right now?")
+    _counters.clear()
+
+    if trace_memory:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+    latencies, failures = [], []
+    gate = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _session(runner, service, run_config, i, turns, think_seconds, gate, latencies, failures)
+        for i in range(sessions)
+    ))
+    elapsed = time.perf_counter() - started
+    memory = {}
+    if trace_memory:
+        # Sessions (with their events and state) are still held by the session service
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory = {
+            "retained_mb": (retained - baseline) / 2 ** 20,
+            "peak_mb": (peak - baseline) / 2 ** 20,
+            "kb_per_session": (retained - baseline) / 1024 / sessions,
+        }
+
+    latencies.sort()
+    return {
+        "sessions": sessions,
+        "turns": len(latencies),
+        "failures": failures,
+        "elapsed_seconds": elapsed,
+        "turns_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": statistics.mean(latencies) * 1000 if latencies else float("nan"),
+            "p50": _percentile(latencies, 0.50) * 1000,
+            "p95": _percentile(latencies, 0.95) * 1000,
+            "p99": _percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else float("nan"),
+        },
+        "per_turn": {name: count / max(1, len(latencies)) for name, count in sorted(_counters.items())},
+        "memory": memory,
+    }
+
+
+def _print_report(result: dict):
+    latency = result["latency_ms"]
+    print(f"Sessions: {result['sessions']}  turns: {result['turns']}  failures: {len(result['failures'])}  "
+          f"wall time: {result['elapsed_seconds']:.2f}s")
+    print(f"Throughput: {result['turns_per_second']:.2f} turns/s")
+    print(f"Turn latency ms: mean {latency['mean']:.0f}  p50 {latency['p50']:.0f}  p95 {latency['p95']:.0f}  "
+          f"p99 {latency['p99']:.0f}  max {latency['max']:.0f}")
+    per_turn = result["per_turn"]
+    print("Per turn: " + "  ".join(f"{name} {per_turn.get(name, 0):.1f}" for name in
+                                   ("model_calls", "prompt_tokens", "output_tokens", "upstream_requests", "http_requests")))
+    print("  calls: " + "  ".join(f"{name[5:]} {count:.2f}" for name, count in per_turn.items() if name.startswith("call:")))
+    print("  upstream: " + "  ".join(f"{name[9:]} {count:.2f}" for name, count in per_turn.items()
+                                    if name.startswith("upstream:")))
+    if result["memory"]:
+        memory = result["memory"]
+        print(f"Memory: {memory['kb_per_session']:.0f} KB retained per session "
+              f"({memory['retained_mb']:.1f} MB total, peak {memory['peak_mb']:.1f} MB above baseline)")
+    for failure in result["failures"][:10]:
+        print(f"  failed: {failure}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent simulated users")
+    parser.add_argument("--turns", type=int, default=3, help="questions per user")
+    parser.add_argument("--concurrency", type=int, default=0, help="most turns in flight (default: all sessions)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between a user's turns")
+    parser.add_argument("--model-latency", type=float, default=300.0, help="ms per scripted model call")
+    parser.add_argument("--upstream-latency", type=float, default=50.0, help="ms per fake yfinance/HTTP request")
+    parser.add_argument("--tool-threads", type=int, default=0, help="thread pool for sync tools (0: event loop)")
+    parser.add_argument("--profile-rate", type=float, default=0.0,
+                        help="share of tool calls to profile (see services/profiling.py)")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster, no memory figures)")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep the tools' progress output")
+    args = parser.parse_args()
+
+    install_offline_fakes(args.upstream_latency / 1000)
+    install_scripted_models(root_stock_agent, args.model_latency / 1000)
+    profiling.set_sample_rate(args.profile_rate)
+    print(f"Load test: {args.sessions} sessions x {args.turns} turns, model latency {args.model_latency:.0f} ms, "
+          f"upstream latency {args.upstream_latency:.0f} ms")
+
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        result = asyncio.run(run(args.sessions, args.turns, args.concurrency or args.sessions,
+                                 args.think_time, args.tool_threads, not args.no_memory))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_report(result)
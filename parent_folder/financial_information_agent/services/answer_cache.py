@@ -0,0 +1,168 @@
+"""
+Answer cache in front of the agents.
+
+The answer to the first turn of a session is cached under (normalized intent,
+symbols). While an answer is produced, the data-access layer records the TTL
+of every source its tools read (quotes, 'info', price history, pages); the
+answer is then kept only as long as the shortest of them, so a repeated
+question is answered without any model or tool call while its data is still
+current, and by the agents again once any of it may have changed.
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+
+from google.genai import types
+
+from . import data_access, query_parsing
+
+MAX_ENTRIES = 512
+# Longest an answer is kept, also when its tools read no source with a TTL
+# (e.g. a search of the content index, which the crawler keeps extending)
+MAX_AGE_SECONDS = 15 * 60
+
+# Collects the tool results of the answer currently being produced
+_recording = contextvars.ContextVar("answer_cache_recording", default=None)
+
+
+class _Recording:
+    """The cache key of an in-progress answer and what its tools read."""
+
+    __slots__ = ("key", "tool_calls", "source_ttls", "complete")
+
+    def __init__(self, key):
+        self.key = key
+        self.tool_calls = 0
+        self.source_ttls = []  # filled by data_access (see collect_source_ttls)
+        self.complete = True   # False once a tool failed or returned partial data
+
+
+class AnswerCache:
+    """Thread-safe LRU of answers, each with its own expiry."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_age_seconds: float = MAX_AGE_SECONDS):
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, answer)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, answer: str, ttl_seconds: float):
+        ttl_seconds = min(ttl_seconds, self.max_age_seconds)
+        if ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+answer_cache = AnswerCache()
+
+
+def is_complete(result) -> bool:
+    """False for a tool result that reports an error or is missing parts."""
+    if not isinstance(result, dict):
+        return True
+    return (result.get("status", "success") == "success"
+            and not result.get("partial") and not result.get("missing_sections"))
+
+
+def cache_key(text: str):
+    """
+    Builds the cache key of a query, or None if the query names no ticker
+    (answers that are not tied to a symbol's data are not cached).
+    """
+    symbols = query_parsing.extract_ticker_symbols(text)
+    if not symbols:
+        return None
+    return (query_parsing.normalize_intent(text, symbols), tuple(sorted(symbols)))
+
+
+def _has_earlier_turns(callback_context) -> bool:
+    """True if the session already holds events of a previous invocation."""
+    invocation_id = callback_context.invocation_id
+    return any(event.invocation_id != invocation_id for event in callback_context.session.events)
+
+
+def _user_text(callback_context) -> str:
+    user_content = callback_context.user_content
+    if not user_content or not user_content.parts:
+        return ""
+    return " ".join(part.text for part in user_content.parts if part.text)
+
+
+def serve_cached_answer(callback_context):
+    """
+    before_agent_callback for the root agent. Returns the cached answer (skipping
+    every model and tool call) while the data it was built from is current;
+    otherwise starts recording what the tools of the new answer read. Only the
+    first turn of a session is cached: later turns may refer to earlier ones
+    ("and its competitors?"), so the question alone does not determine them.
+    """
+    # A failed turn skips store_answer; never let its recording carry over
+    _recording.set(None)
+    data_access.collect_source_ttls(None)
+    if _has_earlier_turns(callback_context):
+        return None
+    key = cache_key(_user_text(callback_context))
+    if key is None:
+        return None
+
+    answer = answer_cache.get(key)
+    if answer is not None:
+        return types.Content(role="model", parts=[types.Part.from_text(text=answer)])
+
+    recording = _Recording(key)
+    _recording.set(recording)
+    data_access.collect_source_ttls(recording.source_ttls)
+    return None
+
+
+def record_tool_result(tool, args, tool_context, tool_response):
+    """
+    after_tool_callback for the specialist agents. Counts the tool results that
+    contribute to the answer being produced, and notes whether any of them
+    failed or came back partial (an answer built on those is not cached).
+    """
+    recording = _recording.get()
+    if recording is not None and getattr(tool, 'func', None) is not None:
+        recording.tool_calls += 1
+        if not is_complete(tool_response):
+            recording.complete = False
+    return None
+
+
+def store_answer(callback_context):
+    """
+    after_agent_callback for the root agent. Caches the final answer for as
+    long as the shortest TTL of the sources its tools read, unless one of the
+    tool results was an error or partial: a retry may well succeed, so such an
+    answer is not reused.
+    """
+    recording = _recording.get()
+    if recording is None:
+        return None
+    _recording.set(None)
+    data_access.collect_source_ttls(None)
+    answer = callback_context.state.get("stock_master_analyst_output")
+    if answer and recording.tool_calls and recording.complete:
+        answer_cache.put(recording.key, answer, min(recording.source_ttls, default=MAX_AGE_SECONDS))
+    return None
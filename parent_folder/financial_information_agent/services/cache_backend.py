@@ -0,0 +1,273 @@
+"""
+Pluggable cache backends for upstream market data and scraped pages.
+
+Values are stored as compact binary blobs (pickle, zlib-compressed above a
+small size) with a TTL, and every backend evicts by size once it exceeds its
+byte budget. The SQLite backend is a single file shared by every worker
+process on a host (and survives restarts); the Redis backend shares one cache
+across hosts.
+
+Select the backend with MARKET_DATA_CACHE:
+    "memory" (default, per process), "sqlite", "redis" or "none".
+MARKET_DATA_CACHE_PATH sets the SQLite file, MARKET_DATA_CACHE_URL the Redis
+URL and MARKET_DATA_CACHE_MAX_MB the size budget.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scraper', 'crawl_data',
+                                   'market_data_cache.sqlite3')
+COMPRESS_ABOVE_BYTES = 1024
+
+# Returned by get() on a miss, so that None can be cached
+MISSING = object()
+
+_RAW = b'\x00'
+_COMPRESSED = b'\x01'
+
+
+def serialize(value) -> bytes:
+    """Pickles a value, compressing it when that pays off."""
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) > COMPRESS_ABOVE_BYTES:
+        compressed = zlib.compress(data, 6)
+        if len(compressed) < len(data):
+            return _COMPRESSED + compressed
+    return _RAW + data
+
+
+def deserialize(blob: bytes):
+    if blob[:1] == _COMPRESSED:
+        return pickle.loads(zlib.decompress(blob[1:]))
+    return pickle.loads(blob[1:])
+
+
+class MemoryBackend:
+    """In-process LRU cache with TTLs and a byte budget."""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, blob)
+        self._size = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            if entry[0] <= time.time():
+                self._remove(key)
+                return MISSING
+            self._entries.move_to_end(key)
+            blob = entry[1]
+        return deserialize(blob)
+
+    def set(self, key: str, value, ttl_seconds: float):
+        blob = serialize(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() + ttl_seconds, blob)
+            self._size += len(blob)
+            while self._size > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: str):
+        self._size -= len(self._entries.pop(key)[1])
+
+
+class SQLiteBackend:
+    """
+    Cache in one SQLite file shared by all processes on the host. Expired rows
+    are purged and least recently used rows evicted once the file's payload
+    exceeds max_bytes.
+    """
+
+    name = "sqlite"
+
+    # Access times are only written back this often, to keep reads read-only
+    TOUCH_INTERVAL_SECONDS = 60
+    EVICT_EVERY_WRITES = 100
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache(accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections are per thread; the file itself is shared
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str):
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute(
+            "SELECT value, expires_at, accessed_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            return MISSING
+        if now - row[2] > self.TOUCH_INTERVAL_SECONDS:
+            with connection:
+                connection.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return deserialize(row[0])
+
+    def set(self, key: str, value, ttl_seconds: float):
+        blob = serialize(value)
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache(key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl_seconds, now),
+            )
+        with self._writes_lock:
+            self._writes += 1
+            evict = self._writes % self.EVICT_EVERY_WRITES == 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Purges expired rows, then the least recently used ones beyond max_bytes."""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            # Evict down to 90% of the budget so that eviction does not run on every write
+            excess = total - int(self.max_bytes * 0.9)
+            freed = 0
+            doomed = []
+            for key, size in connection.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+                doomed.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            connection.executemany("DELETE FROM cache WHERE key = ?", doomed)
+
+    def delete(self, key: str):
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM cache")
+
+
+class RedisBackend:
+    """Cache shared across hosts; size eviction is left to Redis' maxmemory policy."""
+
+    name = "redis"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "market-data:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str):
+        blob = self._client.get(self.prefix + key)
+        return MISSING if blob is None else deserialize(blob)
+
+    def set(self, key: str, value, ttl_seconds: float):
+        self._client.set(self.prefix + key, serialize(value), px=max(1, int(ttl_seconds * 1000)))
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + '*'):
+            self._client.delete(key)
+
+
+class NullBackend:
+    """Caches nothing."""
+
+    name = "none"
+
+    def get(self, key: str):
+        return MISSING
+
+    def set(self, key: str, value, ttl_seconds: float):
+        pass
+
+    def delete(self, key: str):
+        pass
+
+    def clear(self):
+        pass
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(kind: str = None):
+    """Creates the backend named by kind (default: MARKET_DATA_CACHE)."""
+    kind = (kind or os.getenv("MARKET_DATA_CACHE", "memory")).strip().lower()
+    max_bytes = int(float(os.getenv("MARKET_DATA_CACHE_MAX_MB", DEFAULT_MAX_BYTES / 2 ** 20)) * 2 ** 20)
+    if kind == "sqlite":
+        return SQLiteBackend(os.getenv("MARKET_DATA_CACHE_PATH") or DEFAULT_SQLITE_PATH, max_bytes)
+    if kind == "redis":
+        try:
+            return RedisBackend(os.getenv("MARKET_DATA_CACHE_URL", "redis://localhost:6379/0"))
+        except ImportError:
+            print("Warning: redis not installed (pip install redis); using the in-memory cache")
+            return MemoryBackend(max_bytes)
+    if kind == "none":
+        return NullBackend()
+    return MemoryBackend(max_bytes)
+
+
+def get_backend():
+    """Returns the process-wide cache backend, creating it on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend()
+        return _backend
+
+
+def set_backend(backend):
+    """Installs a specific backend as the process-wide one (e.g. in tests)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -0,0 +1,167 @@
+"""
+Peer comparison of several companies in one pass.
+
+Quotes, profiles and statement ratios of every symbol are fetched concurrently
+(through the coalescing data-access layer and the statements cache) while the
+price history of all symbols comes from a single batched download. The result
+is an aligned matrix: every metric is a list with one value per symbol.
+"""
+
+import contextvars
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import data_access, statements
+from .records import CompanyProfileRecord, QuoteRecord, to_number
+
+MAX_SYMBOLS = 12
+MAX_SERIES_POINTS = 60
+TRADING_DAYS_PER_YEAR = 252
+
+# Matrix rows: output name -> (source, field)
+MATRIX_FIELDS = (
+    ("price", "quote", "price"),
+    ("change_percent", "quote", "change_percent"),
+    ("market_cap", "profile", "market_cap"),
+    ("pe_ratio", "profile", "pe_ratio"),
+    ("forward_pe", "profile", "forward_pe"),
+    ("price_to_book", "profile", "price_to_book"),
+    ("beta", "profile", "beta"),
+    ("dividend_yield", "profile", "dividend_yield"),
+    ("profit_margins", "profile", "profit_margins"),
+    ("revenue", "statements", "revenue"),
+    ("net_income", "statements", "net_income"),
+    ("free_cash_flow", "statements", "free_cash_flow"),
+    ("net_margin", "statements", "net_margin"),
+    ("return_on_equity", "statements", "return_on_equity"),
+    ("debt_to_equity", "statements", "debt_to_equity"),
+    ("annual_revenue_growth", "statements", "revenue_growth"),
+)
+
+
+def _fundamentals(symbol: str) -> dict:
+    """Loads the quote, profile and latest statement ratios of one symbol."""
+    info = data_access.get_ticker_info(symbol) or {}
+    quote = QuoteRecord.from_info(symbol, info)
+    try:
+        ratios = statements.get_statement_ratios(symbol)
+        latest = ratios.iloc[-1] if not ratios.empty else None
+    except Exception as e:
+        print(f"Could not load statements for {symbol}: {e}")
+        latest = None
+    return {
+        "company_name": info.get('longName', symbol),
+        "quote": quote,
+        "profile": CompanyProfileRecord.from_info(symbol, info),
+        "statements": latest,
+    }
+
+
+def _field(values: dict, source: str, field: str):
+    record = values.get(source)
+    if record is None:
+        return None
+    if source == "statements":
+        return to_number(record.get(field))
+    return getattr(record, field)
+
+
+def _return_statistics(closes: pd.DataFrame) -> dict:
+    """Total return, annualized volatility and max drawdown per symbol (fractions)."""
+    filled = closes.ffill()
+    first = closes.bfill().iloc[0].to_numpy(dtype='float64')
+    last = filled.iloc[-1].to_numpy(dtype='float64')
+    daily = closes.pct_change(fill_method=None).to_numpy(dtype='float64')
+    prices = filled.to_numpy(dtype='float64')
+    # A symbol without prices is an all-NaN column; its statistics are NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if len(daily) > 2:
+            volatility = np.nanstd(daily, axis=0, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)
+        else:
+            volatility = np.full(len(first), np.nan)
+        drawdown = np.nanmin(prices / np.fmax.accumulate(prices, axis=0) - 1, axis=0)
+    return {
+        "total_return": last / first - 1,
+        "annualized_volatility": volatility,
+        "max_drawdown": drawdown,
+    }
+
+
+def _nullable(values) -> list:
+    return [None if v is None or v != v else float(v) for v in values]
+
+
+def compare(symbols: list, period: str = "1y") -> dict:
+    """
+    Builds the comparison matrix and normalized return series for several symbols.
+
+    Args:
+        symbols (list): Ticker symbols (at most MAX_SYMBOLS).
+        period (str): History period for the return series, e.g. "6mo", "1y", "5y".
+
+    Returns:
+        dict: 'symbols', 'metrics' (metric -> one value per symbol), 'returns'
+              (performance statistics per symbol) and 'normalized_prices'
+              (dates plus one series per symbol, rebased to 100 at the start).
+              A symbol that fails to load (invalid, timed out) gets None
+              metrics and an entry in 'errors'; the others are still compared.
+    """
+    symbols = list(dict.fromkeys(data_access.normalize_symbol(s) for s in symbols if s))
+    if len(symbols) < 2:
+        raise ValueError("Provide at least two symbols to compare")
+    if len(symbols) > MAX_SYMBOLS:
+        raise ValueError(f"Compare at most {MAX_SYMBOLS} symbols at a time")
+
+    # Workers run in copies of the caller's context, so the turn's deadline applies to them
+    with ThreadPoolExecutor(max_workers=len(symbols) + 1) as pool:
+        history_future = pool.submit(contextvars.copy_context().run, data_access.get_price_history, symbols, period)
+        futures = [pool.submit(contextvars.copy_context().run, _fundamentals, s) for s in symbols]
+        fundamentals, errors = {}, {}
+        for symbol, future in zip(symbols, futures):
+            try:
+                fundamentals[symbol] = future.result()
+            except Exception as e:
+                print(f"Could not load {symbol} for the comparison: {e}")
+                fundamentals[symbol] = {"company_name": None}
+                errors[symbol] = str(e)
+        try:
+            closes = history_future.result()
+        except Exception as e:
+            print(f"Could not load the price history of {symbols}: {e}")
+            closes = pd.DataFrame(columns=symbols, dtype='float64')
+            errors["price_history"] = str(e)
+    if all(symbol in errors for symbol in symbols):
+        raise ValueError(f"None of {', '.join(symbols)} could be loaded: {errors}")
+
+    metrics = {"company_name": [fundamentals[s]["company_name"] for s in symbols]}
+    for name, source, field in MATRIX_FIELDS:
+        metrics[name] = [_field(fundamentals[s], source, field) for s in symbols]
+
+    closes = closes.dropna(how='all')
+    result = {"symbols": symbols, "period": period, "metrics": metrics}
+    if errors:
+        result["partial"] = True
+        result["errors"] = errors
+    if closes.empty:
+        result["returns"] = None
+        result["normalized_prices"] = None
+        return result
+
+    statistics = _return_statistics(closes)
+    result["returns"] = {name: _nullable(values) for name, values in statistics.items()}
+
+    # Rebase every series to 100 at its first available price, then thin it out
+    normalized = closes.ffill().div(closes.bfill().iloc[0]).mul(100)
+    step = max(1, int(np.ceil(len(normalized) / MAX_SERIES_POINTS)))
+    sampled = normalized.iloc[::step]
+    if sampled.index[-1] != normalized.index[-1]:
+        sampled = pd.concat([sampled, normalized.iloc[-1:]])
+    result["normalized_prices"] = {
+        "dates": [d.strftime('%Y-%m-%d') for d in sampled.index],
+        **{s: [None if v != v else round(float(v), 2) for v in sampled[s]] for s in symbols},
+    }
+    return result
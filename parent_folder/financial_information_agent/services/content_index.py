@@ -0,0 +1,216 @@
+"""
+Local full-text index of scraped pages.
+
+Every page the scraping tools (or the crawl pipeline) extract is stored in a
+SQLite FTS5 table with its URL, fetch time and the ticker symbols mentioned in
+it, so later questions can be answered from already scraped content with one
+BM25-ranked query instead of fetching the pages again.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from . import entity_tagger
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scraper', 'crawl_data',
+                                  'content_index.sqlite3')
+
+SNIPPET_TOKENS = 40
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS document_symbols (
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    symbol TEXT NOT NULL,
+    PRIMARY KEY (symbol, document_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS documents_fetched_at ON documents(fetched_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, content='documents', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+_TERM_PATTERN = re.compile(r'\w+')
+_RELATIVE_SINCE = re.compile(r'^(\d+)\s*([hdw])$')
+_SINCE_UNITS = {'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+
+def parse_since(since) -> float:
+    """
+    Converts a 'since' bound to a Unix timestamp.
+
+    Accepts an ISO date or datetime ("2025-06-01"), a relative age ("24h",
+    "7d", "2w"), a Unix timestamp, or "" / None for no bound (returns 0).
+    """
+    if since is None or since == "":
+        return 0.0
+    if isinstance(since, (int, float)):
+        return float(since)
+    text = str(since).strip().lower()
+    relative = _RELATIVE_SINCE.match(text)
+    if relative:
+        return time.time() - int(relative.group(1)) * _SINCE_UNITS[relative.group(2)]
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise ValueError(f"since must be an ISO date or an age like '7d', got {since!r}")
+
+
+def to_match_expression(query: str) -> str:
+    """Turns free text into an FTS5 expression matching any of its terms (ranked by BM25)."""
+    terms = dict.fromkeys(term.lower() for term in _TERM_PATTERN.findall(query or ''))
+    return ' OR '.join(f'"{term}"' for term in terms)
+
+
+class ContentIndex:
+    """SQLite FTS5 index of page text, safe to share between threads."""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("CONTENT_INDEX_PATH") or DEFAULT_INDEX_PATH
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA foreign_keys = ON")
+            if self.path != ':memory:':
+                self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.executescript(_SCHEMA)
+
+    def add(self, url: str, text: str, title: str = "", fetched_at: float = None, symbols=None) -> int:
+        """
+        Stores (or replaces) the text of one page.
+
+        Args:
+            url (str): Page URL (one document per URL).
+            text (str): Cleaned page text.
+            title (str): Optional page title.
+            fetched_at (float): Unix time the page was fetched (default: now).
+            symbols (list): Tickers the page is about (default: detected in the text).
+
+        Returns:
+            int: The document id.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        if symbols is None:
+            symbols = entity_tagger.tag(f"{title}\n{text}")
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "INSERT INTO documents(url, title, body, fetched_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET title = excluded.title, body = excluded.body, "
+                "fetched_at = excluded.fetched_at RETURNING id",
+                (url, title or "", text, fetched_at),
+            ).fetchone()
+            document_id = row[0]
+            self._connection.execute("DELETE FROM document_symbols WHERE document_id = ?", (document_id,))
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO document_symbols(document_id, symbol) VALUES (?, ?)",
+                [(document_id, symbol.upper()) for symbol in symbols],
+            )
+        return document_id
+
+    def search(self, query: str = "", symbol: str = "", since=None, limit: int = 10) -> list:
+        """
+        Finds indexed pages, best BM25 match first (newest first without a query).
+
+        Args:
+            query (str): Free-text query; pages matching any term are returned.
+            symbol (str): Only pages mentioning this ticker or company ("" = any).
+            since: Only pages fetched after this bound (see parse_since()).
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: One dict per page with 'url', 'title', 'fetched_at' (ISO),
+                  'symbols' and a 'snippet' around the matched terms.
+        """
+        expression = to_match_expression(query)
+        conditions, parameters = ["d.fetched_at >= ?"], [parse_since(since)]
+        if symbol:
+            conditions.append("d.id IN (SELECT document_id FROM document_symbols WHERE symbol = ?)")
+            parameters.append(entity_tagger.resolve_symbol(symbol) or symbol.strip().upper())
+        if expression:
+            sql = (
+                "SELECT d.id, d.url, d.title, d.fetched_at, "
+                f"snippet(documents_fts, 1, '', '', ' ... ', {SNIPPET_TOKENS}) AS snippet "
+                "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+                f"WHERE documents_fts MATCH ? AND {' AND '.join(conditions)} "
+                "ORDER BY bm25(documents_fts, 2.0, 1.0) LIMIT ?"
+            )
+            parameters = [expression] + parameters
+        else:
+            sql = (
+                "SELECT d.id, d.url, d.title, d.fetched_at, substr(d.body, 1, 300) AS snippet "
+                f"FROM documents d WHERE {' AND '.join(conditions)} "
+                "ORDER BY d.fetched_at DESC LIMIT ?"
+            )
+        parameters.append(max(int(limit), 0))
+
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+            symbols = {}
+            if rows:
+                ids = [row['id'] for row in rows]
+                placeholders = ', '.join('?' * len(ids))
+                for document_id, ticker in self._connection.execute(
+                        f"SELECT document_id, symbol FROM document_symbols WHERE document_id IN ({placeholders})",
+                        ids):
+                    symbols.setdefault(document_id, []).append(ticker)
+
+        return [
+            {
+                "url": row['url'],
+                "title": row['title'],
+                "fetched_at": datetime.fromtimestamp(row['fetched_at']).isoformat(timespec='seconds'),
+                "symbols": sorted(symbols.get(row['id'], [])),
+                "snippet": row['snippet'],
+            }
+            for row in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def add_crawled_document(self, document: dict):
+        """Crawl pipeline sink: indexes a document stored by scraper/crawl_pipeline.py."""
+        if document.get('text'):
+            self.add(document['url'], document['text'], title=document.get('title', ''),
+                     fetched_at=document.get('fetched_at'))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> ContentIndex:
+    """Returns the process-wide content index, opening it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ContentIndex()
+        return _index
@@ -0,0 +1,426 @@
+"""
+Data-access layer for upstream market data and scraped pages.
+
+All tools go through these helpers instead of calling yfinance or the scraper
+directly, so concurrent identical requests are coalesced into one upstream call
+and results are shared through the configured cache backend (see
+cache_backend.py), across worker processes when that backend is shared.
+"""
+
+import contextvars
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import cache_backend, deadline, market_calendar, symbol_registry
+from .single_flight import SingleFlight
+
+# Add the repository root to the Python path so we can import the scraper module
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+import scraper.scraper as scraper
+import scraper.batch_scraper as batch_scraper
+
+try:
+    import yfinance as yf
+    YFINANCE_AVAILABLE = True
+except ImportError:
+    YFINANCE_AVAILABLE = False
+
+# yfinance's preferred HTTP backend, with plain requests as the fallback
+try:
+    from curl_cffi import requests as http_backend
+    _SESSION_OPTIONS = {"impersonate": "chrome"}
+except ImportError:
+    import requests as http_backend
+    _SESSION_OPTIONS = {}
+
+_ticker_flight = SingleFlight()
+_scrape_flight = SingleFlight()
+
+# Ticker attributes prefetched together so that parallel sub-agents working on
+# the same question share one snapshot instead of fetching them independently.
+SNAPSHOT_ATTRIBUTES = ('info', 'news', 'income_stmt', 'balance_sheet', 'cashflow')
+SNAPSHOT_TTL_SECONDS = 120
+
+# How long upstream values stay in the shared cache. Price-dependent values
+# (quotes, 'info', price history) use these while their market trades and are
+# kept until the next open once it has closed (see market_calendar.ttl)
+ATTRIBUTE_TTL_SECONDS = {
+    'info': 60,
+    'news': 300,
+    'income_stmt': 6 * 3600, 'balance_sheet': 6 * 3600, 'cashflow': 6 * 3600,
+    'quarterly_income_stmt': 6 * 3600, 'quarterly_balance_sheet': 6 * 3600, 'quarterly_cashflow': 6 * 3600,
+}
+DEFAULT_TTL_SECONDS = 300
+QUOTE_TTL_SECONDS = 15
+INTRADAY_HISTORY_TTL_SECONDS = 60
+DAILY_HISTORY_TTL_SECONDS = 15 * 60
+SCRAPE_TTL_SECONDS = 15 * 60
+
+# Longest wait for any single upstream HTTP request. Loads outlive the deadline
+# of the turn that started them, so this is what bounds a hung upstream call
+UPSTREAM_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", "10"))
+
+# Scraper results starting with these are errors and are not cached
+_SCRAPE_ERRORS = ("Failed to retrieve", "Scraping of", "No main content found", "An unexpected error occurred")
+
+_snapshot_lock = threading.Lock()
+_snapshots = {}  # symbol -> (expires_at, {attribute: value})
+
+# TTLs of the sources read in the current context while answer_cache records
+# an answer (None when nothing is collecting)
+_source_ttls = contextvars.ContextVar("source_ttls", default=None)
+
+
+class _BoundedSession(http_backend.Session):
+    """HTTP session that caps the timeout of every request at UPSTREAM_TIMEOUT_SECONDS."""
+
+    def request(self, method, url, *args, **kwargs):
+        timeout = kwargs.get('timeout')
+        if not isinstance(timeout, (int, float)) or timeout > UPSTREAM_TIMEOUT_SECONDS:
+            kwargs['timeout'] = UPSTREAM_TIMEOUT_SECONDS
+        return super().request(method, url, *args, **kwargs)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def upstream_session():
+    """The process-wide session for yfinance requests (yfinance shares one session anyway)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _BoundedSession(**_SESSION_OPTIONS)
+        return _session
+
+
+def _ticker(symbol: str):
+    return yf.Ticker(symbol, session=upstream_session())
+
+
+def download_prices(symbols: list, **kwargs):
+    """yf.download with the bounded session and timeout."""
+    return yf.download(symbols, session=upstream_session(), timeout=UPSTREAM_TIMEOUT_SECONDS, **kwargs)
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Returns the canonical form of a ticker symbol used for request keys."""
+    return symbol.strip().upper()
+
+
+def collect_source_ttls(ttls):
+    """
+    Collects, into the list ttls, the TTL of every source read from now on in
+    the current context (None stops collecting). The shortest of them is how
+    long an answer built from those reads stays current.
+    """
+    _source_ttls.set(ttls)
+
+
+def note_source_ttl(ttl_seconds: float):
+    """Records the TTL of a source read in the current context (see collect_source_ttls)."""
+    ttls = _source_ttls.get()
+    if ttls is not None:
+        ttls.append(ttl_seconds)
+
+
+def _cache_get(key: str):
+    try:
+        return cache_backend.get_backend().get(key)
+    except Exception as e:
+        print(f"Cache read failed for {key}: {e}")
+        return cache_backend.MISSING
+
+
+def _cache_set(key: str, value, ttl_seconds: float):
+    try:
+        cache_backend.get_backend().set(key, value, ttl_seconds)
+    except Exception as e:
+        print(f"Cache write failed for {key}: {e}")
+
+
+def _cached(flight: SingleFlight, key: str, ttl_seconds: float, load):
+    """
+    Serves key from the cache backend, or loads it once (coalesced) and caches it.
+    A caller under a deadline waits at most until the deadline (DeadlineExceeded);
+    the load still completes and fills the cache.
+    """
+    note_source_ttl(ttl_seconds)
+    value = _cache_get(key)
+    if value is not cache_backend.MISSING:
+        return value
+
+    def load_and_store():
+        value = load()
+        if value is not None:
+            _cache_set(key, value, ttl_seconds)
+        return value
+
+    return deadline.coalesce(flight, key, load_and_store, f"loading {key}")
+
+
+def get_ticker_attribute(symbol: str, attribute: str):
+    """
+    Reads one attribute of a yfinance Ticker (e.g. 'info', 'news', 'income_stmt').
+    Values from a live prefetched snapshot are returned without an upstream call;
+    otherwise concurrent reads of the same attribute for the same symbol share
+    one request.
+
+    Args:
+        symbol (str): The stock ticker symbol.
+        attribute (str): Name of the yf.Ticker attribute to read.
+
+    Returns:
+        The attribute value as returned by yfinance.
+    """
+    symbol = normalize_symbol(symbol)
+    # Malformed symbols and recent failed lookups are rejected without a round trip
+    symbol_registry.get_registry().check(symbol)
+    with _snapshot_lock:
+        snapshot = _snapshots.get(symbol)
+    if snapshot and snapshot[0] > time.monotonic() and attribute in snapshot[1]:
+        note_source_ttl(snapshot[0] - time.monotonic())
+        return snapshot[1][attribute]
+    ttl_seconds = ATTRIBUTE_TTL_SECONDS.get(attribute, DEFAULT_TTL_SECONDS)
+    if attribute == 'info':
+        ttl_seconds = market_calendar.ttl(symbol, ttl_seconds)
+    return _cached(
+        _ticker_flight, f"ticker:{symbol}:{attribute}", ttl_seconds,
+        lambda: _load_attribute(symbol, attribute),
+    )
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether an upstream error is an HTTP 404 (a definite 'no such symbol')."""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 404
+
+
+def _load_attribute(symbol: str, attribute: str):
+    """
+    Reads a Ticker attribute upstream; 'info' results also teach the symbol
+    registry. Only a 404 on 'info' (which quote lookups also fall back to)
+    marks the symbol invalid: other endpoints 404 for symbols that have no
+    news, holders or calendar, which says nothing about the symbol itself.
+    """
+    registry = symbol_registry.get_registry()
+    try:
+        value = getattr(_ticker(symbol), attribute)
+    except Exception as e:
+        if attribute == 'info' and _is_not_found(e):
+            registry.record_invalid(symbol, "not found upstream")
+            raise symbol_registry.InvalidSymbolError(symbol, "not found upstream", registry.suggest(symbol)) from e
+        raise
+    if attribute == 'info':
+        registry.record_info(symbol, value)
+        if symbol_registry.looks_invalid(value):
+            raise symbol_registry.InvalidSymbolError(symbol, "no quote data found", registry.suggest(symbol))
+    return value
+
+
+def get_ticker_info(symbol: str) -> dict:
+    """Returns yf.Ticker(symbol).info, coalescing concurrent identical requests."""
+    return get_ticker_attribute(symbol, 'info')
+
+
+def get_quote(symbol: str) -> dict:
+    """
+    Returns the latest price, previous close, volume, market cap and currency of
+    a symbol from yfinance's lightweight fast_info (chart data) instead of the
+    full 'info' blob, in 'info' key names so records.QuoteRecord.from_info can
+    read it. The company name comes from the symbol registry or an already
+    cached 'info'; the full 'info' request is only made when fast_info has no price.
+    Outside market hours a quote is kept until the next open.
+    """
+    symbol = normalize_symbol(symbol)
+    symbol_registry.get_registry().check(symbol)
+    with _snapshot_lock:
+        snapshot = _snapshots.get(symbol)
+    if snapshot and snapshot[0] > time.monotonic() and 'info' in snapshot[1]:
+        note_source_ttl(snapshot[0] - time.monotonic())
+        return snapshot[1]['info']
+    return _cached(_ticker_flight, f"quote:{symbol}", market_calendar.ttl(symbol, QUOTE_TTL_SECONDS),
+                   lambda: _load_quote(symbol))
+
+
+def _fast_field(fast_info, key: str):
+    try:
+        value = fast_info[key]
+    except Exception:
+        return None
+    return None if value is None or value != value else value  # NaN -> None
+
+
+def _load_quote(symbol: str) -> dict:
+    fast_info = _ticker(symbol).fast_info
+    price = _fast_field(fast_info, 'lastPrice')
+    if not price:
+        return get_ticker_info(symbol)
+    quote = {
+        'currentPrice': price,
+        'previousClose': _fast_field(fast_info, 'previousClose'),
+        'volume': _fast_field(fast_info, 'lastVolume'),
+        'marketCap': _fast_field(fast_info, 'marketCap'),
+        'currency': _fast_field(fast_info, 'currency') or 'USD',
+        'exchange': _fast_field(fast_info, 'exchange'),
+    }
+    name = symbol_registry.get_registry().details(symbol).get('name')
+    if not name:
+        info = _cache_get(f"ticker:{symbol}:info")
+        name = info.get('longName') if isinstance(info, dict) else None
+    if name:
+        quote['longName'] = name
+    symbol_registry.get_registry().record_info(symbol, quote)
+    return quote
+
+
+def get_ticker_news(symbol: str) -> list:
+    """Returns yf.Ticker(symbol).news, coalescing concurrent identical requests."""
+    return get_ticker_attribute(symbol, 'news')
+
+
+def get_price_history(symbols: list, period: str = "1y", interval: str = "1d"):
+    """
+    Downloads adjusted close prices for several symbols in one batched request.
+    Concurrent identical requests share one download.
+
+    Args:
+        symbols (list): Ticker symbols.
+        period (str): yfinance period, e.g. "1mo", "1y", "5y", "max".
+        interval (str): yfinance bar interval, e.g. "1d", "1wk".
+
+    Returns:
+        pandas.DataFrame: Close prices, one column per symbol, indexed by date.
+    """
+    symbols = list(dict.fromkeys(normalize_symbol(s) for s in symbols))
+
+    def download():
+        data = download_prices(symbols, period=period, interval=interval, auto_adjust=True,
+                               progress=False, threads=True)
+        closes = data['Close'] if 'Close' in data else data
+        if getattr(closes, 'ndim', 2) == 1:
+            closes = closes.to_frame(symbols[0])
+        return closes.reindex(columns=symbols)
+
+    ttl_seconds = INTRADAY_HISTORY_TTL_SECONDS if interval.endswith(('m', 'h')) else DAILY_HISTORY_TTL_SECONDS
+    # New bars only appear while one of the markets trades
+    ttl_seconds = min(market_calendar.ttl(symbol, ttl_seconds) for symbol in symbols)
+    return _cached(_ticker_flight, f"history:{','.join(symbols)}:{period}:{interval}", ttl_seconds, download)
+
+
+def get_price_bars(symbol: str, period: str = "1y", interval: str = "1d"):
+    """
+    Downloads the OHLCV bars of one symbol (split-adjusted, not dividend-adjusted,
+    like a price chart). Concurrent identical requests share one download.
+
+    Args:
+        symbol (str): Ticker symbol.
+        period (str): yfinance period, e.g. "5d", "1y", "2y".
+        interval (str): yfinance bar interval, e.g. "1h", "1d", "1wk".
+
+    Returns:
+        pandas.DataFrame: Open, High, Low, Close and Volume columns indexed by
+        bar start, without bars that have no close.
+    """
+    symbol = normalize_symbol(symbol)
+    symbol_registry.get_registry().check(symbol)
+
+    def download():
+        data = download_prices([symbol], period=period, interval=interval, auto_adjust=False,
+                               progress=False, threads=False, group_by='ticker')
+        if data.columns.nlevels > 1:
+            data = data[symbol] if symbol in data.columns.get_level_values(0) else data.iloc[:, :0]
+        columns = [c for c in ('Open', 'High', 'Low', 'Close', 'Volume') if c in data.columns]
+        return data[columns].dropna(subset=['Close']) if 'Close' in columns else data.iloc[:0, :0]
+
+    ttl_seconds = INTRADAY_HISTORY_TTL_SECONDS if interval.endswith(('m', 'h')) else DAILY_HISTORY_TTL_SECONDS
+    return _cached(_ticker_flight, f"bars:{symbol}:{period}:{interval}",
+                   market_calendar.ttl(symbol, ttl_seconds), download)
+
+
+def _cacheable_scrape(text) -> bool:
+    return bool(text) and not text.startswith(_SCRAPE_ERRORS)
+
+
+def scrape_page(url: str) -> str:
+    """Returns scraper.scrape_content(url), cached and coalescing concurrent identical requests."""
+    key = f"page:{url}"
+    note_source_ttl(SCRAPE_TTL_SECONDS)
+    text = _cache_get(key)
+    if text is not cache_backend.MISSING:
+        return text
+
+    def scrape():
+        text = scraper.scrape_content(url)
+        if _cacheable_scrape(text):
+            _cache_set(key, text, SCRAPE_TTL_SECONDS)
+        return text
+
+    return deadline.coalesce(_scrape_flight, key, scrape, f"scraping {url}")
+
+
+def scrape_pages(urls: list) -> dict:
+    """
+    Scrapes several pages at once: downloads run concurrently and the HTML is
+    parsed in a pool of worker processes (see scraper/batch_scraper.py). Pages
+    still in the cache are not fetched again.
+
+    Returns:
+        dict: url -> cleaned text or scrape_content's error message (also for
+              pages not scraped before the deadline).
+    """
+    note_source_ttl(SCRAPE_TTL_SECONDS)
+    results = {url: _cache_get(f"page:{url}") for url in dict.fromkeys(urls)}
+    missing = [url for url, text in results.items() if text is cache_backend.MISSING]
+    if missing:
+        def scrape():
+            scraped = batch_scraper.scrape_batch(missing)
+            for url, text in scraped.items():
+                if _cacheable_scrape(text):
+                    _cache_set(f"page:{url}", text, SCRAPE_TTL_SECONDS)
+            return scraped
+
+        try:
+            results.update(deadline.call(scrape, f"scraping {len(missing)} pages"))
+        except deadline.DeadlineExceeded as e:
+            results.update({url: f"Failed to retrieve {url}: {e}" for url in missing})
+    return results
+
+
+def prefetch_ticker_snapshot(symbols: list) -> dict:
+    """
+    Fetches the snapshot attributes of every symbol concurrently and keeps them
+    for SNAPSHOT_TTL_SECONDS, so that sub-agents dispatched in parallel read
+    the same data without further upstream calls.
+
+    Args:
+        symbols (list): Ticker symbols to prefetch.
+
+    Returns:
+        dict: Mapping of symbol to the list of attributes that failed to load.
+    """
+    symbols = list(dict.fromkeys(normalize_symbol(s) for s in symbols if s))
+    if not symbols or not YFINANCE_AVAILABLE:
+        return {}
+
+    jobs = [(symbol, attribute) for symbol in symbols for attribute in SNAPSHOT_ATTRIBUTES]
+    with ThreadPoolExecutor(max_workers=min(len(jobs), 16)) as pool:
+        # Each job keeps the caller's context, and with it the turn's deadline
+        futures = {job: pool.submit(contextvars.copy_context().run, get_ticker_attribute, *job) for job in jobs}
+
+    failures = {}
+    loaded = {symbol: {} for symbol in symbols}
+    for (symbol, attribute), future in futures.items():
+        try:
+            loaded[symbol][attribute] = future.result()
+        except Exception:
+            failures.setdefault(symbol, []).append(attribute)
+
+    expires_at = time.monotonic() + SNAPSHOT_TTL_SECONDS
+    with _snapshot_lock:
+        for symbol, values in loaded.items():
+            _snapshots[symbol] = (expires_at, values)
+    return failures
@@ -0,0 +1,179 @@
+"""
+End-to-end deadlines for a turn.
+
+A deadline is an absolute time kept in a context variable. It follows the turn
+into every tool call, into the tasks of parallel agents and into the worker
+threads started with gather() and call(). Budgets nest, and an inner budget
+can only shorten the deadline it runs under.
+
+Upstream loads (yfinance, page scrapes) run through coalesce() or call().
+Without a deadline this is a plain (coalesced) call. With a deadline, the load
+runs in a thread of its own and the caller, like every caller coalesced onto
+the same load, waits on it for at most the time that is left, then gets
+DeadlineExceeded. The load carries on, bounded by its network timeouts, and
+still fills the cache for the next request. No caller ever holds a thread of a
+shared pool while waiting, so hung loads cannot starve later turns. Aggregate tools use
+gather() to run their parts concurrently and report the parts that did not
+finish in time instead of waiting for them.
+"""
+
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+from .single_flight import SingleFlight, WaitTimeout
+
+# Budget of one agent turn (model and tool calls); see start_turn()
+TURN_BUDGET_SECONDS = float(os.getenv("TURN_BUDGET_SECONDS", "60"))
+
+# Start of every DeadlineExceeded message (tools pass it on in their error messages)
+EXHAUSTED = "Time budget exhausted"
+
+_deadline = contextvars.ContextVar("deadline", default=None)  # time.monotonic() value or None
+_turn_token = contextvars.ContextVar("deadline_turn_token", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the time budget of the current turn or tool is spent."""
+
+    def __init__(self, what: str = "the request"):
+        super().__init__(f"{EXHAUSTED} while {what}")
+
+
+def remaining():
+    """Seconds left before the current deadline (None when there is none)."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check(what: str = "the request"):
+    """Raises DeadlineExceeded if the current deadline has passed."""
+    if expired():
+        raise DeadlineExceeded(what)
+
+
+def timeout(default: float, what: str = "the request") -> float:
+    """
+    A network timeout for one request: default, or the time left before the
+    deadline if that is shorter. Raises DeadlineExceeded if no time is left.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded(what)
+    return min(default, left)
+
+
+@contextmanager
+def budget(seconds: float):
+    """Runs the block under a deadline of at most seconds from now."""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def start_turn(callback_context):
+    """
+    before_agent_callback for the root agent: gives the turn TURN_BUDGET_SECONDS,
+    which every tool call of the turn (and of the sub-agents) inherits.
+    """
+    # A turn that failed never ran end_turn(); its deadline must not become the
+    # one this turn restores
+    end_turn(callback_context)
+    _turn_token.set(_deadline.set(time.monotonic() + TURN_BUDGET_SECONDS))
+    return None
+
+
+def end_turn(callback_context):
+    """after_agent_callback for the root agent: removes the deadline set by start_turn()."""
+    token = _turn_token.get()
+    if token is not None:
+        _turn_token.set(None)
+        try:
+            _deadline.reset(token)
+        except (ValueError, RuntimeError):
+            _deadline.set(None)  # the turn ended in another context than it started in
+    return None
+
+
+def _detached(fn):
+    # The load runs to completion in the background; only its callers are bounded
+    def run():
+        _deadline.set(None)
+        return fn()
+    return run
+
+
+def coalesce(flight: SingleFlight, key, fn, what: str = "loading data"):
+    """
+    flight.do(key, fn) within the current deadline.
+
+    Returns:
+        What fn() returns. Raises DeadlineExceeded if the deadline passes first
+        (the load keeps running in its own thread).
+    """
+    left = remaining()
+    if left is None:
+        return flight.do(key, fn)
+    if left <= 0:
+        raise DeadlineExceeded(what)
+    try:
+        return flight.do(key, _detached(fn), timeout=left)
+    except WaitTimeout:
+        raise DeadlineExceeded(what) from None
+
+
+def call(fn, what: str = "loading data"):
+    """
+    Calls fn() within the current deadline (not coalesced with other calls).
+
+    Returns:
+        What fn() returns. Raises DeadlineExceeded if the deadline passes first
+        (fn keeps running in its own thread).
+    """
+    return coalesce(SingleFlight(), None, fn, what)
+
+
+def gather(parts: dict, what: str = "collecting results") -> tuple:
+    """
+    Runs the callables in parts (name -> zero-argument callable) concurrently,
+    within the current deadline.
+
+    Returns:
+        tuple: (results, missing). results maps each finished part to its value.
+               missing lists the parts that did not finish in time or raised
+               DeadlineExceeded. Other exceptions are re-raised.
+    """
+    # One thread per part, for this call only: parts of concurrent sessions
+    # never queue behind each other. Unfinished parts are left to end on their
+    # own (their loads run under the same deadline).
+    pool = ThreadPoolExecutor(max_workers=max(1, len(parts)), thread_name_prefix="deadline-parts")
+    futures = {name: pool.submit(contextvars.copy_context().run, fn) for name, fn in parts.items()}
+    wait(futures.values(), timeout=remaining())
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results, missing = {}, []
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            missing.append(name)
+            continue
+        try:
+            results[name] = future.result()
+        except DeadlineExceeded:
+            missing.append(name)
+    if missing:
+        print(f"{EXHAUSTED} while {what}; skipped: {', '.join(missing)}")
+    return results, missing
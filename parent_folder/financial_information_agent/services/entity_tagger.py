@@ -0,0 +1,295 @@
+"""
+Company and ticker entity tagging.
+
+A symbol dictionary (company names, common aliases and ticker symbols) is
+compiled once into an Aho-Corasick automaton, so every scraped page or headline
+is tagged with all the companies it mentions in one linear pass over the text,
+and free-text company names resolve to tickers without a network round trip.
+"""
+
+import csv
+import os
+import re
+import threading
+from collections import deque
+
+from .query_parsing import _NON_TICKER_WORDS
+
+# symbol, official name, aliases. Extend or override with SYMBOLS_FILE: a CSV
+# file with the columns symbol,name,aliases (aliases separated by "|").
+DEFAULT_SYMBOLS = (
+    ("AAPL", "Apple Inc.", ("Apple",)),
+    ("MSFT", "Microsoft Corporation", ("Microsoft",)),
+    ("NVDA", "NVIDIA Corporation", ("Nvidia",)),
+    ("GOOGL", "Alphabet Inc.", ("Alphabet", "Google")),
+    ("META", "Meta Platforms, Inc.", ("Meta Platforms", "Facebook")),
+    ("AVGO", "Broadcom Inc.", ("Broadcom",)),
+    ("ORCL", "Oracle Corporation", ("Oracle",)),
+    ("CRM", "Salesforce, Inc.", ("Salesforce",)),
+    ("ADBE", "Adobe Inc.", ("Adobe",)),
+    ("AMD", "Advanced Micro Devices, Inc.", ("Advanced Micro Devices",)),
+    ("CSCO", "Cisco Systems, Inc.", ("Cisco",)),
+    ("ACN", "Accenture plc", ("Accenture",)),
+    ("IBM", "International Business Machines Corporation", ("International Business Machines",)),
+    ("INTC", "Intel Corporation", ("Intel",)),
+    ("QCOM", "QUALCOMM Incorporated", ("Qualcomm",)),
+    ("TXN", "Texas Instruments Incorporated", ("Texas Instruments",)),
+    ("AMAT", "Applied Materials, Inc.", ("Applied Materials",)),
+    ("INTU", "Intuit Inc.", ("Intuit",)),
+    ("NOW", "ServiceNow, Inc.", ("ServiceNow",)),
+    ("MU", "Micron Technology, Inc.", ("Micron",)),
+    ("AMZN", "Amazon.com, Inc.", ("Amazon",)),
+    ("TSLA", "Tesla, Inc.", ("Tesla",)),
+    ("HD", "The Home Depot, Inc.", ("Home Depot",)),
+    ("MCD", "McDonald's Corporation", ("McDonald's", "McDonalds")),
+    ("NKE", "NIKE, Inc.", ("Nike",)),
+    ("SBUX", "Starbucks Corporation", ("Starbucks",)),
+    ("LOW", "Lowe's Companies, Inc.", ("Lowe's", "Lowes")),
+    ("BKNG", "Booking Holdings Inc.", ("Booking Holdings",)),
+    ("JPM", "JPMorgan Chase & Co.", ("JPMorgan", "JP Morgan", "JPMorgan Chase")),
+    ("BAC", "Bank of America Corporation", ("Bank of America",)),
+    ("WFC", "Wells Fargo & Company", ("Wells Fargo",)),
+    ("GS", "The Goldman Sachs Group, Inc.", ("Goldman Sachs", "Goldman")),
+    ("MS", "Morgan Stanley", ()),
+    ("V", "Visa Inc.", ("Visa",)),
+    ("MA", "Mastercard Incorporated", ("Mastercard",)),
+    ("AXP", "American Express Company", ("American Express", "Amex")),
+    ("BRK-B", "Berkshire Hathaway Inc.", ("Berkshire Hathaway", "Berkshire", "BRK.B")),
+    ("UNH", "UnitedHealth Group Incorporated", ("UnitedHealth",)),
+    ("JNJ", "Johnson & Johnson", ()),
+    ("LLY", "Eli Lilly and Company", ("Eli Lilly", "Lilly")),
+    ("PFE", "Pfizer Inc.", ("Pfizer",)),
+    ("MRK", "Merck & Co., Inc.", ("Merck",)),
+    ("ABBV", "AbbVie Inc.", ("AbbVie",)),
+    ("TMO", "Thermo Fisher Scientific Inc.", ("Thermo Fisher",)),
+    ("ABT", "Abbott Laboratories", ("Abbott",)),
+    ("XOM", "Exxon Mobil Corporation", ("Exxon Mobil", "ExxonMobil", "Exxon")),
+    ("CVX", "Chevron Corporation", ("Chevron",)),
+    ("COP", "ConocoPhillips", ()),
+    ("WMT", "Walmart Inc.", ("Walmart",)),
+    ("PG", "The Procter & Gamble Company", ("Procter & Gamble", "P&G")),
+    ("KO", "The Coca-Cola Company", ("Coca-Cola", "Coca Cola", "Coke")),
+    ("PEP", "PepsiCo, Inc.", ("PepsiCo", "Pepsi")),
+    ("COST", "Costco Wholesale Corporation", ("Costco",)),
+    ("CAT", "Caterpillar Inc.", ("Caterpillar",)),
+    ("GE", "General Electric Company", ("General Electric", "GE Aerospace")),
+    ("HON", "Honeywell International Inc.", ("Honeywell",)),
+    ("UPS", "United Parcel Service, Inc.", ("United Parcel Service",)),
+    ("BA", "The Boeing Company", ("Boeing",)),
+    ("NEE", "NextEra Energy, Inc.", ("NextEra",)),
+    ("DUK", "Duke Energy Corporation", ("Duke Energy",)),
+    ("T", "AT&T Inc.", ("AT&T",)),
+    ("VZ", "Verizon Communications Inc.", ("Verizon",)),
+    ("DIS", "The Walt Disney Company", ("Walt Disney", "Disney")),
+    ("NFLX", "Netflix, Inc.", ("Netflix",)),
+    ("F", "Ford Motor Company", ("Ford Motor", "Ford")),
+    ("GM", "General Motors Company", ("General Motors",)),
+    ("UBER", "Uber Technologies, Inc.", ("Uber",)),
+    ("ABNB", "Airbnb, Inc.", ("Airbnb",)),
+    ("PYPL", "PayPal Holdings, Inc.", ("PayPal",)),
+    ("SHOP", "Shopify Inc.", ("Shopify",)),
+    ("PLTR", "Palantir Technologies Inc.", ("Palantir",)),
+    ("SNOW", "Snowflake Inc.", ("Snowflake",)),
+    ("TSM", "Taiwan Semiconductor Manufacturing Company Limited", ("TSMC", "Taiwan Semiconductor")),
+    ("ASML", "ASML Holding N.V.", ()),
+    ("BABA", "Alibaba Group Holding Limited", ("Alibaba",)),
+    ("SONY", "Sony Group Corporation", ("Sony",)),
+    ("TM", "Toyota Motor Corporation", ("Toyota",)),
+    ("SAP", "SAP SE", ()),
+    ("C", "Citigroup Inc.", ("Citigroup", "Citi")),
+    ("SPOT", "Spotify Technology S.A.", ("Spotify",)),
+    ("COIN", "Coinbase Global, Inc.", ("Coinbase",)),
+    ("RIVN", "Rivian Automotive, Inc.", ("Rivian",)),
+    ("LMT", "Lockheed Martin Corporation", ("Lockheed Martin", "Lockheed")),
+    ("RTX", "RTX Corporation", ("Raytheon",)),
+    ("SPY", "SPDR S&P 500 ETF Trust", ()),
+    ("QQQ", "Invesco QQQ Trust", ()),
+)
+
+# Corporate suffixes ignored when resolving names ("Apple Inc." == "apple")
+_NAME_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "companies", "ltd",
+    "limited", "plc", "llc", "sa", "se", "nv", "ag", "group", "holding", "holdings", "the",
+}
+_WORD_PATTERN = re.compile(r"[a-z0-9&']+")
+
+# Tickers that are also everyday words; they only count when written as "$NOW"
+_AMBIGUOUS_TICKERS = {"NOW", "LOW", "COST", "CAT", "MA", "MS", "GE", "KO", "PG", "HD", "BA",
+                      "SPOT", "SHOP", "SNOW", "COIN", "UBER", "SONY", "SAP", "ASML", "TM", "GS"}
+
+
+def normalize_name(name: str) -> str:
+    """Lower-cases a company name and drops punctuation and corporate suffixes."""
+    words = _WORD_PATTERN.findall(name.lower().replace('.com', ''))
+    words = [w for w in words if w not in _NAME_SUFFIXES]
+    return ' '.join(words)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class EntityTagger:
+    """
+    Aho-Corasick automaton over company names, aliases and ticker symbols.
+
+    Names match regardless of case but must start with a capital letter (so
+    "apple pie" is not Apple). Tickers must appear in upper case, and
+    single letters or tickers that double as common words ("NOW", "LOW",
+    "COST") only count with a "$" prefix.
+    """
+
+    def __init__(self, entries):
+        self.names = {}
+        self._by_name = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]  # node -> [(length, symbol, case_sensitive)]
+        for symbol, name, aliases in entries:
+            self._add(symbol, name, aliases)
+        self._build()
+
+    def _add(self, symbol: str, name: str, aliases=()):
+        symbol = symbol.strip().upper()
+        self.names[symbol] = name
+        for alias in (name, *aliases):
+            self._by_name.setdefault(normalize_name(alias), symbol)
+            self._insert(alias.lower(), symbol, False)
+            stripped = normalize_name(alias)
+            if stripped and stripped != alias.lower():
+                self._insert(stripped, symbol, False)
+        self._insert(symbol, symbol, True)
+        if '-' in symbol:
+            self._insert(symbol.replace('-', '.'), symbol, True)
+
+    def _insert(self, pattern: str, symbol: str, case_sensitive: bool):
+        node = 0
+        for char in pattern.lower():
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        output = (len(pattern), symbol, case_sensitive)
+        if output not in self._outputs[node]:
+            self._outputs[node].append(output)
+
+    def _build(self):
+        """Computes failure links breadth-first and merges outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def _ticker_allowed(self, text: str, start: int, end: int, symbol: str) -> bool:
+        surface = text[start:end]
+        if surface != surface.upper() or surface.replace('.', '-') != symbol:
+            return False
+        if start > 0 and text[start - 1] == '$':
+            return True
+        return len(symbol) > 1 and symbol not in _NON_TICKER_WORDS and symbol not in _AMBIGUOUS_TICKERS
+
+    def find(self, text: str) -> list:
+        """
+        Returns every entity mention as (start, end, symbol), leftmost-longest
+        and non-overlapping, in one pass over the text.
+        """
+        if not text:
+            return []
+        lowered = text.lower()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        candidates = []
+        node = 0
+        for index, char in enumerate(lowered):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, symbol, case_sensitive in outputs[node]:
+                start, end = index + 1 - length, index + 1
+                if start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                if end < len(lowered) and _is_word_char(lowered[end]):
+                    continue
+                if case_sensitive:
+                    if not self._ticker_allowed(text, start, end, symbol):
+                        continue
+                elif text[start].islower():
+                    continue
+                candidates.append((start, end, symbol))
+
+        candidates.sort(key=lambda match: (match[0], -match[1]))
+        mentions, covered_until = [], 0
+        for start, end, symbol in candidates:
+            if start >= covered_until:
+                mentions.append((start, end, symbol))
+                covered_until = end
+        return mentions
+
+    def tag(self, text: str) -> list:
+        """Returns the symbols mentioned in a text, in order of first mention."""
+        return list(dict.fromkeys(symbol for _, _, symbol in self.find(text)))
+
+    def resolve(self, query: str):
+        """
+        Resolves a ticker or free-text company name to a ticker symbol.
+
+        Returns:
+            str or None: The symbol, or None if the query names no known company.
+        """
+        if not query or not query.strip():
+            return None
+        candidate = query.strip().lstrip('$').upper().replace('.', '-')
+        if candidate in self.names:
+            return candidate
+        symbol = self._by_name.get(normalize_name(query))
+        if symbol:
+            return symbol
+        mentioned = self.tag(query)
+        return mentioned[0] if mentioned else None
+
+
+
+def load_entries() -> list:
+    """Returns DEFAULT_SYMBOLS plus the entries of SYMBOLS_FILE, if set."""
+    entries = list(DEFAULT_SYMBOLS)
+    path = os.getenv("SYMBOLS_FILE", "").strip()
+    if path:
+        with open(path, 'r', encoding='utf-8', newline='') as file:
+            for row in csv.DictReader(file):
+                if row.get('symbol') and row.get('name'):
+                    aliases = tuple(a.strip() for a in (row.get('aliases') or '').split('|') if a.strip())
+                    entries.append((row['symbol'], row['name'], aliases))
+    return entries
+
+
+_tagger = None
+_tagger_lock = threading.Lock()
+
+
+def get_tagger() -> EntityTagger:
+    """Returns the process-wide tagger, building the automaton on first use."""
+    global _tagger
+    with _tagger_lock:
+        if _tagger is None:
+            _tagger = EntityTagger(load_entries())
+        return _tagger
+
+
+def tag(text: str) -> list:
+    """Symbols mentioned in text (see EntityTagger.tag)."""
+    return get_tagger().tag(text)
+
+
+def resolve_symbol(query: str):
+    """Ticker for a symbol or company name, or None (see EntityTagger.resolve)."""
+    return get_tagger().resolve(query)
@@ -0,0 +1,500 @@
+"""
+Technical indicator engine with incremental updates.
+
+Each (symbol, interval) gets an IndicatorSet. It is initialized once, with
+vectorized NumPy/pandas passes over the stored bar history. After that, every
+indicator keeps a small running state and is updated in O(1) per new bar:
+- running sums for SMA and Bollinger bands
+- the previous smoothed value for EMA, RSI, MACD and ATR
+
+Later questions fetch only a short recent window of bars (through the cached
+data-access layer) and append the bars not seen yet. The full history is only
+downloaded again when the window no longer reaches the last known bar or the
+history was re-adjusted (e.g. after a split).
+
+The last bar of a download is still forming. It is never committed to the
+running state: its values are computed "as if" it closed now, and live quote
+ticks (see live_quotes) move its close, high and low between downloads.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from . import data_access, live_quotes, market_calendar
+
+# interval -> (history loaded on first use, window fetched for updates, bar length)
+INTERVALS = {
+    "1h": ("3mo", "5d", timedelta(hours=1)),
+    "1d": ("2y", "1mo", timedelta(days=1)),
+    "1wk": ("10y", "6mo", timedelta(weeks=1)),
+}
+
+# A known bar whose close moved by more than this in a new download means the
+# history was re-adjusted, and the indicators are rebuilt from scratch
+READJUSTED_TOLERANCE = 1e-3
+
+# Indicator sets kept in memory (least recently used ones are dropped)
+MAX_SETS = 256
+
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+
+
+def _number(value, digits: int = 4):
+    return None if value is None or value != value else round(float(value), digits)
+
+
+class _Smoother:
+    """
+    Exponential smoothing seeded with the simple average of the first 'length'
+    values (the usual convention for EMA, Wilder's RSI and ATR).
+    """
+
+    def __init__(self, length: int, alpha: float):
+        self.length = length
+        self.alpha = alpha
+        self.value = None
+        self._seed_sum = 0.0
+        self._seed_count = 0
+
+    def initialize(self, values: np.ndarray) -> np.ndarray:
+        """Smooths a whole series at once (leading NaNs are skipped) and keeps the final state."""
+        result = np.full(len(values), np.nan)
+        valid = np.flatnonzero(~np.isnan(values))
+        self.value, self._seed_sum, self._seed_count = None, 0.0, 0
+        if len(valid) < self.length:
+            self._seed_sum, self._seed_count = float(values[valid].sum()), len(valid)
+            return result
+        first = valid[0]
+        seeded = values[first + self.length - 1:].copy()
+        seeded[0] = values[first:first + self.length].mean()
+        result[first + self.length - 1:] = pd.Series(seeded).ewm(alpha=self.alpha, adjust=False).mean().to_numpy()
+        self.value = float(result[-1])
+        return result
+
+    def peek(self, x):
+        if x is None:
+            return self.value
+        if self.value is None:
+            return (self._seed_sum + x) / self.length if self._seed_count + 1 == self.length else None
+        return self.value + self.alpha * (x - self.value)
+
+    def push(self, x):
+        value = self.peek(x)
+        if x is not None and self.value is None:
+            self._seed_sum += x
+            self._seed_count += 1
+        self.value = value
+        return value
+
+
+class _Window:
+    """Running sum and sum of squares over the last 'length' values."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.values = deque(maxlen=length)
+        self.total = 0.0
+        self.total_squares = 0.0
+        self._pushes = 0
+
+    def initialize(self, values: np.ndarray):
+        self.values = deque(values[-self.length:].tolist(), maxlen=self.length)
+        self._resum()
+
+    def _resum(self):
+        # Recomputed once per window length so that rounding errors cannot accumulate (amortized O(1))
+        self.total = sum(self.values)
+        self.total_squares = sum(v * v for v in self.values)
+        self._pushes = 0
+
+    def peek(self, x: float):
+        """(mean, population standard deviation) with x appended, or None while the window fills."""
+        if len(self.values) + 1 < self.length:
+            return None
+        dropped = self.values[0] if len(self.values) == self.length else 0.0
+        mean = (self.total + x - dropped) / self.length
+        variance = (self.total_squares + x * x - dropped * dropped) / self.length - mean * mean
+        return mean, max(variance, 0.0) ** 0.5
+
+    def push(self, x: float):
+        result = self.peek(x)
+        if len(self.values) == self.length:
+            dropped = self.values[0]
+            self.total -= dropped
+            self.total_squares -= dropped * dropped
+        self.values.append(x)
+        self.total += x
+        self.total_squares += x * x
+        self._pushes += 1
+        if self._pushes >= self.length:
+            self._resum()
+        return result
+
+
+class SMA:
+    def __init__(self, length: int):
+        self.name = f"sma_{length}"
+        self._window = _Window(length)
+
+    def initialize(self, high, low, close) -> dict:
+        self._window.initialize(close)
+        return {self.name: pd.Series(close).rolling(self._window.length).mean().to_numpy()}
+
+    def _output(self, result) -> dict:
+        return {self.name: None if result is None else result[0]}
+
+    def peek(self, high, low, close) -> dict:
+        return self._output(self._window.peek(close))
+
+    def push(self, high, low, close) -> dict:
+        return self._output(self._window.push(close))
+
+
+class EMA:
+    def __init__(self, length: int):
+        self.name = f"ema_{length}"
+        self._smoother = _Smoother(length, 2 / (length + 1))
+
+    def initialize(self, high, low, close) -> dict:
+        return {self.name: self._smoother.initialize(close)}
+
+    def peek(self, high, low, close) -> dict:
+        return {self.name: self._smoother.peek(close)}
+
+    def push(self, high, low, close) -> dict:
+        return {self.name: self._smoother.push(close)}
+
+
+class RSI:
+    """Wilder's relative strength index."""
+
+    def __init__(self, length: int = 14):
+        self.name = "rsi"
+        self._gains = _Smoother(length, 1 / length)
+        self._losses = _Smoother(length, 1 / length)
+        self._previous_close = None
+
+    @staticmethod
+    def _rsi(gain, loss):
+        if gain is None or loss is None:
+            return None
+        return 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+
+    def initialize(self, high, low, close) -> dict:
+        change = np.diff(close, prepend=np.nan)
+        gains = self._gains.initialize(np.where(np.isnan(change), np.nan, np.fmax(change, 0)))
+        losses = self._losses.initialize(np.where(np.isnan(change), np.nan, np.fmax(-change, 0)))
+        self._previous_close = float(close[-1]) if len(close) else None
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(losses == 0, 100.0, 100 - 100 / (1 + gains / losses))
+        return {self.name: rsi}
+
+    def _changes(self, close):
+        if self._previous_close is None:
+            return None, None
+        change = close - self._previous_close
+        return max(change, 0.0), max(-change, 0.0)
+
+    def peek(self, high, low, close) -> dict:
+        gain, loss = self._changes(close)
+        return {self.name: self._rsi(self._gains.peek(gain), self._losses.peek(loss))}
+
+    def push(self, high, low, close) -> dict:
+        gain, loss = self._changes(close)
+        self._previous_close = close
+        return {self.name: self._rsi(self._gains.push(gain), self._losses.push(loss))}
+
+
+class MACD:
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = _Smoother(fast, 2 / (fast + 1))
+        self._slow = _Smoother(slow, 2 / (slow + 1))
+        self._signal = _Smoother(signal, 2 / (signal + 1))
+
+    @staticmethod
+    def _output(line, signal) -> dict:
+        histogram = None if line is None or signal is None else line - signal
+        return {"macd": line, "macd_signal": signal, "macd_histogram": histogram}
+
+    def initialize(self, high, low, close) -> dict:
+        line = self._fast.initialize(close) - self._slow.initialize(close)
+        signal = self._signal.initialize(line)
+        return {"macd": line, "macd_signal": signal, "macd_histogram": line - signal}
+
+    def _line(self, fast, slow):
+        return None if fast is None or slow is None else fast - slow
+
+    def peek(self, high, low, close) -> dict:
+        line = self._line(self._fast.peek(close), self._slow.peek(close))
+        return self._output(line, self._signal.peek(line))
+
+    def push(self, high, low, close) -> dict:
+        line = self._line(self._fast.push(close), self._slow.push(close))
+        return self._output(line, self._signal.push(line))
+
+
+class BollingerBands:
+    def __init__(self, length: int = 20, width: float = 2.0):
+        self.width = width
+        self._window = _Window(length)
+
+    def _output(self, result, close) -> dict:
+        if result is None:
+            return {"bollinger_middle": None, "bollinger_upper": None, "bollinger_lower": None,
+                    "bollinger_percent_b": None}
+        middle, deviation = result
+        upper, lower = middle + self.width * deviation, middle - self.width * deviation
+        return {"bollinger_middle": middle, "bollinger_upper": upper, "bollinger_lower": lower,
+                "bollinger_percent_b": (close - lower) / (upper - lower) if upper > lower else None}
+
+    def initialize(self, high, low, close) -> dict:
+        self._window.initialize(close)
+        rolling = pd.Series(close).rolling(self._window.length)
+        middle, deviation = rolling.mean().to_numpy(), rolling.std(ddof=0).to_numpy()
+        upper, lower = middle + self.width * deviation, middle - self.width * deviation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent_b = (close - lower) / (upper - lower)
+        return {"bollinger_middle": middle, "bollinger_upper": upper, "bollinger_lower": lower,
+                "bollinger_percent_b": percent_b}
+
+    def peek(self, high, low, close) -> dict:
+        return self._output(self._window.peek(close), close)
+
+    def push(self, high, low, close) -> dict:
+        return self._output(self._window.push(close), close)
+
+
+class ATR:
+    """Wilder's average true range."""
+
+    def __init__(self, length: int = 14):
+        self.name = "atr"
+        self._smoother = _Smoother(length, 1 / length)
+        self._previous_close = None
+
+    def _true_range(self, high, low) -> float:
+        if self._previous_close is None:
+            return high - low
+        return max(high - low, abs(high - self._previous_close), abs(low - self._previous_close))
+
+    def initialize(self, high, low, close) -> dict:
+        previous = np.concatenate(([np.nan], close[:-1]))
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+        self._previous_close = float(close[-1]) if len(close) else None
+        return {self.name: self._smoother.initialize(true_range)}
+
+    def peek(self, high, low, close) -> dict:
+        return {self.name: self._smoother.peek(self._true_range(high, low))}
+
+    def push(self, high, low, close) -> dict:
+        value = self._smoother.push(self._true_range(high, low))
+        self._previous_close = close
+        return {self.name: value}
+
+
+def default_indicators() -> list:
+    return [SMA(20), SMA(50), SMA(200), EMA(12), EMA(26), RSI(14), MACD(12, 26, 9),
+            BollingerBands(20, 2.0), ATR(14)]
+
+
+def _columns(bars: pd.DataFrame) -> tuple:
+    """High, low and close arrays of a bar frame (close stands in for missing highs and lows)."""
+    close = bars['Close'].to_numpy(dtype='float64')
+    high = bars['High'].to_numpy(dtype='float64') if 'High' in bars else close
+    low = bars['Low'].to_numpy(dtype='float64') if 'Low' in bars else close
+    high = np.fmax(np.where(np.isnan(high), close, high), close)
+    low = np.fmin(np.where(np.isnan(low), close, low), close)
+    return high, low, close
+
+
+class IndicatorSet:
+    """The indicators of one symbol and interval: committed state plus the forming bar."""
+
+    def __init__(self, symbol: str, interval: str, indicators=None):
+        self.symbol = symbol
+        self.interval = interval
+        self.indicators = indicators if indicators is not None else default_indicators()
+        self.lock = threading.Lock()
+        self.last_timestamp = None  # start of the last committed bar
+        self.last_close = None
+        self.committed = {}         # indicator values after the last committed bar
+        self.forming = None         # [start, high, low, close] of the bar still in progress
+        self.bar_count = 0
+
+    def initialize(self, bars: pd.DataFrame):
+        """Builds every indicator from the full history in vectorized passes."""
+        if bars.empty:
+            raise ValueError(f"No price history for {self.symbol}")
+        high, low, close = _columns(bars)
+        values = {}
+        # All bars but the last one are final
+        for indicator in self.indicators:
+            series = indicator.initialize(high[:-1], low[:-1], close[:-1])
+            values.update({name: float(v[-1]) if len(v) and v[-1] == v[-1] else None for name, v in series.items()})
+        self.committed = values
+        self.bar_count = len(bars) - 1
+        self.last_timestamp = bars.index[-2] if len(bars) > 1 else None
+        self.last_close = float(close[-2]) if len(bars) > 1 else None
+        self.forming = [bars.index[-1], float(high[-1]), float(low[-1]), float(close[-1])]
+
+    def push(self, timestamp, high: float, low: float, close: float):
+        """Commits one closed bar (O(1) per indicator)."""
+        values = {}
+        for indicator in self.indicators:
+            values.update(indicator.push(high, low, close))
+        self.committed = values
+        self.bar_count += 1
+        self.last_timestamp, self.last_close = timestamp, close
+
+    def extend(self, bars: pd.DataFrame) -> bool:
+        """
+        Appends the bars of a recent download that come after the last committed
+        bar; the newest one becomes the forming bar.
+
+        Returns:
+            bool: False when the bars cannot continue the state (they start after
+                  the last committed bar, or its close changed); the set must
+                  then be initialized again.
+        """
+        if bars.empty:
+            return True
+        if self.last_timestamp is None or bars.index[0] > self.last_timestamp:
+            return False
+        high, low, close = _columns(bars)
+        position = bars.index.searchsorted(self.last_timestamp)
+        if position < len(bars) and bars.index[position] == self.last_timestamp and \
+                abs(close[position] / self.last_close - 1) > READJUSTED_TOLERANCE:
+            return False
+        start = bars.index.searchsorted(self.last_timestamp, side='right')
+        if start >= len(bars):
+            return True
+        for row in range(start, len(bars) - 1):
+            self.push(bars.index[row], float(high[row]), float(low[row]), float(close[row]))
+        self.forming = [bars.index[-1], float(high[-1]), float(low[-1]), float(close[-1])]
+        return True
+
+    def apply_tick(self, price: float):
+        """Moves the forming bar to a new trade price."""
+        if self.forming is not None and price:
+            self.forming[1] = max(self.forming[1], price)
+            self.forming[2] = min(self.forming[2], price)
+            self.forming[3] = price
+
+    def values(self) -> dict:
+        """Indicator values as of the forming bar (computed without committing it)."""
+        if self.forming is None:
+            return dict(self.committed)
+        _, high, low, close = self.forming
+        values = {}
+        for indicator in self.indicators:
+            values.update(indicator.peek(high, low, close))
+        return values
+
+
+def _bar_contains(bar_start, bar_length: timedelta, timestamp: float, tz) -> bool:
+    start = pd.Timestamp(bar_start)
+    start = start.tz_localize(tz) if start.tzinfo is None else start.tz_convert(tz)
+    moment = pd.Timestamp(datetime.fromtimestamp(timestamp, tz))
+    return start <= moment < start + bar_length
+
+
+def _signals(close: float, values: dict) -> dict:
+    def relation(level):
+        return None if level is None else ("above" if close > level else "below")
+
+    rsi = values.get("rsi")
+    histogram = values.get("macd_histogram")
+    short, long = values.get("sma_50"), values.get("sma_200")
+    return {
+        "price_vs_sma_50": relation(short),
+        "price_vs_sma_200": relation(long),
+        "sma_50_vs_sma_200": None if short is None or long is None else (
+            "golden_cross" if short > long else "death_cross"),
+        "rsi_zone": None if rsi is None else (
+            "overbought" if rsi >= RSI_OVERBOUGHT else "oversold" if rsi <= RSI_OVERSOLD else "neutral"),
+        "macd_trend": None if histogram is None else ("bullish" if histogram > 0 else "bearish"),
+    }
+
+
+_lock = threading.Lock()
+_sets = OrderedDict()  # (symbol, interval) -> IndicatorSet, least recently used first
+
+
+def _indicator_set(symbol: str, interval: str) -> IndicatorSet:
+    with _lock:
+        indicator_set = _sets.get((symbol, interval))
+        if indicator_set is None:
+            indicator_set = _sets[(symbol, interval)] = IndicatorSet(symbol, interval)
+        _sets.move_to_end((symbol, interval))
+        while len(_sets) > MAX_SETS:
+            _sets.popitem(last=False)
+        return indicator_set
+
+
+def get_indicators(symbol: str, interval: str = "1d") -> dict:
+    """
+    Current technical indicators of a symbol.
+
+    Args:
+        symbol (str): Ticker symbol.
+        interval (str): Bar interval, one of INTERVALS.
+
+    Returns:
+        dict: 'symbol', 'interval', 'as_of' (start of the latest bar), 'close',
+              'provisional' (True while the latest bar is still forming),
+              'indicators' (name -> value) and 'signals' (readings of the values).
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"interval must be one of {sorted(INTERVALS)}, got {interval!r}")
+    symbol = data_access.normalize_symbol(symbol)
+    history_period, update_period, bar_length = INTERVALS[interval]
+
+    indicator_set = _indicator_set(symbol, interval)
+
+    # Downloads run outside the set's lock (they are coalesced and bounded by the
+    # caller's deadline); the lock only covers the in-memory updates
+    with indicator_set.lock:
+        initialized = indicator_set.forming is not None
+    bars = data_access.get_price_bars(symbol, update_period if initialized else history_period, interval)
+    with indicator_set.lock:
+        if indicator_set.forming is None:
+            indicator_set.initialize(bars)
+            rebuild = False
+        else:
+            # Also continues a set another caller initialized in the meantime
+            rebuild = not indicator_set.extend(bars)
+    if rebuild:
+        print(f"Rebuilding {interval} indicators of {symbol} from full history")
+        bars = data_access.get_price_bars(symbol, history_period, interval)
+        with indicator_set.lock:
+            indicator_set.initialize(bars)
+
+    with indicator_set.lock:
+        service = live_quotes.get_service()
+        tick = service.latest(symbol) if service is not None else None
+        if tick is not None and _bar_contains(indicator_set.forming[0], bar_length, tick.timestamp,
+                                              market_calendar.calendar_for(symbol).tz):
+            indicator_set.apply_tick(tick.price)
+
+        bar_start, _, _, close = indicator_set.forming
+        values = indicator_set.values()
+        # The latest bar is final once its period is over or its market has closed for the day
+        provisional = not market_calendar.is_quiet(symbol) and _bar_contains(
+            bar_start, bar_length, time.time(), market_calendar.calendar_for(symbol).tz)
+
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "as_of": pd.Timestamp(bar_start).isoformat(),
+        "close": _number(close),
+        "provisional": bool(provisional),
+        "bars": indicator_set.bar_count + 1,
+        "indicators": {name: _number(value) for name, value in values.items()},
+        "signals": _signals(close, values),
+    }
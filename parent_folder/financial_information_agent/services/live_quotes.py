@@ -0,0 +1,344 @@
+"""
+Live quote service.
+
+One feed (a long-lived Yahoo streaming connection, a batched poller, or a local
+mock feed for testing) keeps the latest tick of every subscribed symbol in a
+shared in-memory table. Price tools read from that table, so a price question
+costs a dict lookup instead of a full 'info' request.
+
+Ticks taken after a market closed and settled stay current until it opens
+again (see market_calendar): they are served regardless of their age and the
+poller does not request those symbols again.
+
+The service is opt-in: set LIVE_QUOTES_FEED to "stream", "poll" or "mock".
+"""
+
+import math
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+from . import data_access, market_calendar
+from .records import to_integer, to_number
+
+# A tick older than this is not served to price tools while its market trades
+DEFAULT_MAX_AGE_SECONDS = 60
+POLL_INTERVAL_SECONDS = 15
+
+
+class Tick:
+    """Latest known quote of one symbol."""
+
+    __slots__ = ("symbol", "price", "previous_close", "day_volume", "market_cap",
+                 "currency", "name", "timestamp", "source")
+
+    def __init__(self, symbol, price, previous_close=None, day_volume=None, market_cap=None,
+                 currency=None, name=None, timestamp=None, source=""):
+        self.symbol = symbol
+        self.price = price
+        self.previous_close = previous_close
+        self.day_volume = day_volume
+        self.market_cap = market_cap
+        self.currency = currency
+        self.name = name
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.source = source
+
+    def as_info(self) -> dict:
+        """Returns the tick in yfinance 'info' key names (for records.QuoteRecord.from_info)."""
+        info = {
+            'currentPrice': self.price, 'previousClose': self.previous_close,
+            'volume': self.day_volume, 'marketCap': self.market_cap,
+            'currency': self.currency or 'USD',
+        }
+        if self.name:
+            info['longName'] = self.name
+        return info
+
+
+class QuoteTable:
+    """Thread-safe table of the latest tick per symbol."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ticks = {}
+
+    def update(self, tick: Tick):
+        with self._lock:
+            previous = self._ticks.get(tick.symbol)
+            if previous is not None:
+                # Streaming messages often carry only the changed fields
+                for field in ("previous_close", "day_volume", "market_cap", "currency", "name"):
+                    if getattr(tick, field) is None:
+                        setattr(tick, field, getattr(previous, field))
+            self._ticks[tick.symbol] = tick
+
+    def get(self, symbol: str, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS) -> Optional[Tick]:
+        with self._lock:
+            tick = self._ticks.get(symbol)
+        if tick is None:
+            return None
+        if time.time() - tick.timestamp > max_age_seconds and \
+                not market_calendar.unchanged_since(symbol, tick.timestamp):
+            return None
+        return tick
+
+    def current(self, symbol: str) -> bool:
+        """Whether the table holds a tick of symbol that cannot change before its market opens."""
+        with self._lock:
+            tick = self._ticks.get(symbol)
+        return tick is not None and market_calendar.unchanged_since(symbol, tick.timestamp)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._ticks)
+
+
+class StreamingFeed:
+    """Yahoo Finance streaming connection (yfinance.WebSocket, yfinance >= 0.2.54)."""
+
+    name = "stream"
+
+    def __init__(self):
+        self._socket = None
+
+    def run(self, service: "LiveQuoteService", stop: threading.Event):
+        import yfinance as yf
+
+        while not stop.is_set():
+            self._socket = yf.WebSocket(verbose=False)
+            try:
+                self._socket.subscribe(sorted(service.subscriptions()))
+                self._socket.listen(lambda message: service.publish(self._to_tick(message)))
+            except Exception as e:
+                if not stop.is_set():
+                    print(f"Live quote stream disconnected: {e}; reconnecting")
+                    stop.wait(5)
+            finally:
+                self._close()
+
+    def subscribe(self, symbols):
+        if self._socket is not None:
+            self._socket.subscribe(list(symbols))
+
+    def unsubscribe(self, symbols):
+        if self._socket is not None:
+            self._socket.unsubscribe(list(symbols))
+
+    def stop(self):
+        self._close()
+
+    def _close(self):
+        socket, self._socket = self._socket, None
+        if socket is not None:
+            try:
+                socket.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _to_tick(message: dict) -> Tick:
+        timestamp = to_number(message.get('time'))
+        return Tick(
+            symbol=message.get('id'),
+            price=to_number(message.get('price')),
+            previous_close=to_number(message.get('previous_close')),
+            day_volume=to_integer(message.get('day_volume')),
+            market_cap=to_number(message.get('market_cap')),
+            currency=message.get('currency'),
+            name=message.get('short_name'),
+            timestamp=timestamp / 1000 if timestamp else None,
+            source="stream",
+        )
+
+
+class PollingFeed:
+    """
+    Polls the subscribed symbols with one batched request per interval, leaving
+    out symbols whose market is closed and whose tick was taken after the close.
+    """
+
+    name = "poll"
+
+    def __init__(self, interval_seconds: float = POLL_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+
+    def run(self, service: "LiveQuoteService", stop: threading.Event):
+        while not stop.is_set():
+            symbols = sorted(s for s in service.subscriptions() if not service.table.current(s))
+            if symbols:
+                try:
+                    self.poll(service, symbols)
+                except Exception as e:
+                    print(f"Live quote poll failed: {e}")
+            stop.wait(self.interval_seconds)
+
+    @staticmethod
+    def poll(service: "LiveQuoteService", symbols: list):
+        # Two days of one-minute bars give the latest price and the previous close
+        data = data_access.download_prices(symbols, period="2d", interval="1m", auto_adjust=False,
+                                           progress=False, threads=True, group_by='ticker')
+        now = time.time()
+        for symbol in symbols:
+            if data.columns.nlevels > 1:
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                bars = data[symbol]
+            else:
+                bars = data  # older yfinance returns flat columns for a single symbol
+            bars = bars.dropna(subset=['Close'])
+            if bars.empty:
+                continue
+            days = bars.index.normalize()
+            today = bars[days == days[-1]]
+            earlier = bars[days != days[-1]]
+            service.publish(Tick(
+                symbol=symbol,
+                price=to_number(today['Close'].iloc[-1]),
+                previous_close=to_number(earlier['Close'].iloc[-1]) if not earlier.empty else None,
+                day_volume=to_integer(today['Volume'].sum()),
+                timestamp=now,
+                source="poll",
+            ))
+
+    def subscribe(self, symbols):
+        pass
+
+    def unsubscribe(self, symbols):
+        pass
+
+    def stop(self):
+        pass
+
+
+class MockFeed:
+    """
+    Offline random-walk feed for tests and demos. Prices start at a stable
+    per-symbol value and move by a small random step every interval.
+    """
+
+    name = "mock"
+
+    def __init__(self, interval_seconds: float = 0.5, volatility: float = 0.001, seed: int = None):
+        self.interval_seconds = interval_seconds
+        self.volatility = volatility
+        self._random = random.Random(seed)
+        self._prices = {}
+
+    def _start_price(self, symbol: str) -> float:
+        return 20 + sum(ord(c) for c in symbol) % 480
+
+    def tick(self, service: "LiveQuoteService"):
+        for symbol in sorted(service.subscriptions()):
+            previous_close = self._start_price(symbol)
+            price = self._prices.get(symbol, previous_close)
+            price *= math.exp(self._random.gauss(0, self.volatility))
+            self._prices[symbol] = price
+            service.publish(Tick(symbol, round(price, 4), previous_close=previous_close,
+                                 day_volume=self._random.randint(10_000, 5_000_000),
+                                 currency='USD', source="mock"))
+
+    def run(self, service: "LiveQuoteService", stop: threading.Event):
+        while not stop.is_set():
+            self.tick(service)
+            stop.wait(self.interval_seconds)
+
+    def subscribe(self, symbols):
+        pass
+
+    def unsubscribe(self, symbols):
+        pass
+
+    def stop(self):
+        pass
+
+
+FEEDS = {"stream": StreamingFeed, "poll": PollingFeed, "mock": MockFeed}
+
+
+class LiveQuoteService:
+    """Runs one feed in a background thread and keeps the shared quote table current."""
+
+    def __init__(self, feed=None):
+        self.table = QuoteTable()
+        self.feed = feed if feed is not None else PollingFeed()
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscriptions(self) -> set:
+        with self._lock:
+            return set(self._subscriptions)
+
+    def subscribe(self, symbols):
+        new = {data_access.normalize_symbol(s) for s in symbols}
+        with self._lock:
+            new -= self._subscriptions
+            self._subscriptions |= new
+        if new:
+            self.feed.subscribe(new)
+
+    def unsubscribe(self, symbols):
+        removed = {data_access.normalize_symbol(s) for s in symbols}
+        with self._lock:
+            removed &= self._subscriptions
+            self._subscriptions -= removed
+        if removed:
+            self.feed.unsubscribe(removed)
+
+    def publish(self, tick: Tick):
+        """Called by feeds with every new tick."""
+        if tick.symbol and tick.price:
+            self.table.update(tick)
+
+    def latest(self, symbol: str, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS) -> Optional[Tick]:
+        return self.table.get(data_access.normalize_symbol(symbol), max_age_seconds)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.feed.run, args=(self, self._stop),
+                                        name=f"live-quotes-{self.feed.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.feed.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> Optional[LiveQuoteService]:
+    """
+    Returns the process-wide live quote service, started with the feed named by
+    LIVE_QUOTES_FEED, or None when live quotes are not enabled.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            feed_name = os.getenv("LIVE_QUOTES_FEED", "").strip().lower()
+            if feed_name not in FEEDS:
+                return None
+            _service = LiveQuoteService(FEEDS[feed_name]())
+            _service.start()
+        return _service
+
+
+def set_service(service: Optional[LiveQuoteService]):
+    """Installs a specific service (e.g. one running a MockFeed) as the process-wide one."""
+    global _service
+    with _service_lock:
+        _service = service
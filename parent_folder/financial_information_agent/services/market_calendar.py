@@ -0,0 +1,354 @@
+"""
+Exchange calendars and the market-hours freshness policy.
+
+Every exchange has a time zone, regular session hours, holidays and early
+closes. From those the calendar answers whether a symbol's market is open, when
+it last closed and when it opens next. Nothing about a quote can change while
+its market is closed, so the caches, the screener refresh and the live quote
+poller use the calendar:
+
+- while a market is open, quotes keep their normal short TTLs.
+- once a market has closed and the closing prints have settled (SETTLE_SECONDS),
+  a quote fetched after the close stays valid until the next open. Off-hours
+  requests are then served from the cache with no upstream traffic.
+
+US, London, Xetra and Toronto holidays are computed from their rules. Tokyo and
+Hong Kong holidays come from the optional 'holidays' package; without it, only
+their weekends are closed. Lunch breaks and one-off closures are not modelled;
+on such days the calendar errs towards "open", which only costs freshness
+requests, never stale data.
+"""
+
+import threading
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+try:
+    import holidays as holidays_package
+except ImportError:
+    holidays_package = None
+
+# After the close, closing-auction prints and late corrections still arrive
+SETTLE_SECONDS = 15 * 60
+# Longest TTL a closed market can give a quote (covers four-day holiday weekends)
+MAX_CLOSED_TTL_SECONDS = 4 * 24 * 60 * 60
+
+MONDAY_TO_FRIDAY = frozenset(range(5))
+EVERY_DAY = frozenset(range(7))
+
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return date(year, month, day)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The n-th given weekday (0 = Monday) of a month; n = -1 is the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed_nearest(day: date) -> date:
+    # Saturday -> Friday, Sunday -> Monday
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _observed_next(day: date) -> date:
+    # A holiday on a weekend moves to the next Monday
+    return day + timedelta(days=(7 - day.weekday()) % 7) if day.weekday() >= 5 else day
+
+
+def us_holidays(year: int) -> set:
+    """NYSE and Nasdaq full-day holidays."""
+    days = {
+        nth_weekday(year, 1, 0, 3),             # Martin Luther King Jr. Day
+        nth_weekday(year, 2, 0, 3),             # Washington's Birthday
+        easter_sunday(year) - timedelta(days=2),  # Good Friday
+        nth_weekday(year, 5, 0, -1),            # Memorial Day
+        _observed_nearest(date(year, 7, 4)),    # Independence Day
+        nth_weekday(year, 9, 0, 1),             # Labor Day
+        nth_weekday(year, 11, 3, 4),            # Thanksgiving
+        _observed_nearest(date(year, 12, 25)),  # Christmas
+    }
+    # New Year's Day on a Saturday is not observed on the Friday before
+    if date(year, 1, 1).weekday() != 5:
+        days.add(_observed_nearest(date(year, 1, 1)))
+    if year >= 2022:
+        days.add(_observed_nearest(date(year, 6, 19)))  # Juneteenth
+    return days
+
+
+def us_early_closes(year: int) -> dict:
+    """NYSE and Nasdaq 13:00 closes."""
+    closes = {nth_weekday(year, 11, 3, 4) + timedelta(days=1): dtime(13, 0)}  # day after Thanksgiving
+    if date(year, 7, 4).weekday() in (1, 2, 3, 4):
+        closes[date(year, 7, 3)] = dtime(13, 0)
+    if date(year, 12, 24).weekday() in (0, 1, 2, 3):
+        closes[date(year, 12, 24)] = dtime(13, 0)
+    return closes
+
+
+def london_holidays(year: int) -> set:
+    easter = easter_sunday(year)
+    christmas, boxing_day = date(year, 12, 25), date(year, 12, 26)
+    if christmas.weekday() == 5:
+        christmas, boxing_day = date(year, 12, 27), date(year, 12, 28)
+    elif christmas.weekday() == 6:
+        christmas = date(year, 12, 27)
+    elif boxing_day.weekday() == 5:
+        boxing_day = date(year, 12, 28)
+    return {
+        _observed_next(date(year, 1, 1)),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        nth_weekday(year, 5, 0, 1),   # early May bank holiday
+        nth_weekday(year, 5, 0, -1),  # spring bank holiday
+        nth_weekday(year, 8, 0, -1),  # summer bank holiday
+        christmas,
+        boxing_day,
+    }
+
+
+def london_early_closes(year: int) -> dict:
+    return {day: dtime(12, 30) for day in (date(year, 12, 24), date(year, 12, 31)) if day.weekday() < 5}
+
+
+def xetra_holidays(year: int) -> set:
+    easter = easter_sunday(year)
+    return {date(year, 1, 1), easter - timedelta(days=2), easter + timedelta(days=1), date(year, 5, 1),
+            date(year, 12, 24), date(year, 12, 25), date(year, 12, 26), date(year, 12, 31)}
+
+
+def toronto_holidays(year: int) -> set:
+    christmas = _observed_next(date(year, 12, 25))
+    boxing_day = date(year, 12, 26)
+    if boxing_day.weekday() >= 5 or boxing_day == christmas:
+        boxing_day = christmas + timedelta(days=1)
+        if boxing_day.weekday() >= 5:
+            boxing_day += timedelta(days=7 - boxing_day.weekday())
+    may_24 = date(year, 5, 24)
+    return {
+        _observed_next(date(year, 1, 1)),
+        nth_weekday(year, 2, 0, 3),                        # Family Day
+        easter_sunday(year) - timedelta(days=2),           # Good Friday
+        may_24 - timedelta(days=may_24.weekday()),         # Victoria Day
+        _observed_next(date(year, 7, 1)),                  # Canada Day
+        nth_weekday(year, 8, 0, 1),                        # Civic Holiday
+        nth_weekday(year, 9, 0, 1),                        # Labour Day
+        nth_weekday(year, 10, 0, 2),                       # Thanksgiving
+        christmas,
+        boxing_day,
+    }
+
+
+def _country_holidays(country: str, extra_days=()):
+    def holidays_for(year: int) -> set:
+        days = {date(year, month, day) for month, day in extra_days}
+        if holidays_package is not None:
+            days |= set(holidays_package.country_holidays(country, years=year).keys())
+        return days
+    return holidays_for
+
+
+class ExchangeCalendar:
+    """
+    Regular sessions of one exchange. A session with open_time >= close_time
+    runs overnight, from open_time on the previous calendar day to close_time
+    (24-hour markets use 00:00 for both).
+    """
+
+    def __init__(self, code: str, name: str, timezone_name: str, open_time: dtime, close_time: dtime,
+                 holidays=None, early_closes=None, trading_weekdays=MONDAY_TO_FRIDAY):
+        self.code = code
+        self.name = name
+        self.tz = ZoneInfo(timezone_name)
+        self.open_time = open_time
+        self.close_time = close_time
+        self.trading_weekdays = trading_weekdays
+        self._holiday_rule = holidays
+        self._early_close_rule = early_closes
+        self._lock = threading.Lock()
+        self._years = {}  # year -> (holidays, early closes)
+
+    def _year(self, year: int) -> tuple:
+        with self._lock:
+            cached = self._years.get(year)
+        if cached is None:
+            cached = (frozenset(self._holiday_rule(year)) if self._holiday_rule else frozenset(),
+                      dict(self._early_close_rule(year)) if self._early_close_rule else {})
+            with self._lock:
+                self._years[year] = cached
+        return cached
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() in self.trading_weekdays and day not in self._year(day.year)[0]
+
+    def session(self, day: date):
+        """(open, close) of the session of a trading day as aware datetimes, or None."""
+        if not self.is_trading_day(day):
+            return None
+        close_time = self._year(day.year)[1].get(day, self.close_time)
+        open_day = day - timedelta(days=1) if self.open_time >= self.close_time else day
+        return (datetime.combine(open_day, self.open_time, self.tz),
+                datetime.combine(day, close_time, self.tz))
+
+    def _local(self, at) -> datetime:
+        if at is None:
+            return datetime.now(self.tz)
+        if isinstance(at, (int, float)):
+            return datetime.fromtimestamp(at, self.tz)
+        return at.astimezone(self.tz)
+
+    def is_open(self, at=None) -> bool:
+        """Whether a regular session is in progress at 'at' (default: now)."""
+        now = self._local(at)
+        for day in (now.date(), now.date() + timedelta(days=1)):
+            session = self.session(day)
+            if session and session[0] <= now < session[1]:
+                return True
+        return False
+
+    def last_close(self, at=None):
+        """The most recent session close at or before 'at' (None if none in two weeks)."""
+        now = self._local(at)
+        for offset in range(15):
+            session = self.session(now.date() - timedelta(days=offset))
+            if session and session[1] <= now:
+                return session[1]
+        return None
+
+    def next_open(self, at=None):
+        """The first session open after 'at' (None if none in two weeks)."""
+        now = self._local(at)
+        for offset in range(16):
+            session = self.session(now.date() + timedelta(days=offset))
+            if session and session[0] > now:
+                return session[0]
+        return None
+
+
+CALENDARS = {
+    calendar.code: calendar for calendar in (
+        ExchangeCalendar("XNYS", "New York (NYSE, Nasdaq)", "America/New_York", dtime(9, 30), dtime(16, 0),
+                         us_holidays, us_early_closes),
+        ExchangeCalendar("XLON", "London Stock Exchange", "Europe/London", dtime(8, 0), dtime(16, 30),
+                         london_holidays, london_early_closes),
+        ExchangeCalendar("XETR", "Xetra", "Europe/Berlin", dtime(9, 0), dtime(17, 30), xetra_holidays),
+        ExchangeCalendar("XTSE", "Toronto Stock Exchange", "America/Toronto", dtime(9, 30), dtime(16, 0),
+                         toronto_holidays),
+        ExchangeCalendar("XTKS", "Tokyo Stock Exchange", "Asia/Tokyo", dtime(9, 0), dtime(15, 30),
+                         _country_holidays("JP", ((1, 2), (1, 3), (12, 31)))),
+        ExchangeCalendar("XHKG", "Hong Kong Stock Exchange", "Asia/Hong_Kong", dtime(9, 30), dtime(16, 0),
+                         _country_holidays("HK")),
+        # Currencies and most futures trade from Sunday 17:00 to Friday 17:00 New York time
+        ExchangeCalendar("FX", "Currencies and futures (24/5)", "America/New_York", dtime(17, 0), dtime(17, 0)),
+        ExchangeCalendar("CRYPTO", "Crypto (24/7)", "UTC", dtime(0, 0), dtime(0, 0),
+                         trading_weekdays=EVERY_DAY),
+    )
+}
+DEFAULT_CALENDAR = "XNYS"
+
+# Yahoo exchange codes (quote 'exchange' field) -> calendar
+EXCHANGE_CODES = {
+    "NMS": "XNYS", "NGM": "XNYS", "NCM": "XNYS", "NAS": "XNYS", "NYQ": "XNYS", "ASE": "XNYS",
+    "PCX": "XNYS", "BTS": "XNYS", "NYS": "XNYS", "PNK": "XNYS", "OQB": "XNYS", "OQX": "XNYS",
+    "LSE": "XLON", "IOB": "XLON", "GER": "XETR", "ETR": "XETR", "TOR": "XTSE", "VAN": "XTSE",
+    "JPX": "XTKS", "TYO": "XTKS", "HKG": "XHKG", "CCY": "FX", "CCC": "CRYPTO",
+    "CME": "FX", "CMX": "FX", "NYM": "FX", "CBT": "FX",
+}
+# Ticker suffixes -> calendar
+SUFFIXES = {".L": "XLON", ".IL": "XLON", ".DE": "XETR", ".F": "XETR", ".TO": "XTSE", ".V": "XTSE",
+            ".T": "XTKS", ".HK": "XHKG"}
+_CRYPTO_QUOTES = ("-USD", "-USDT", "-EUR", "-BTC", "-ETH")
+
+
+def calendar_for(symbol: str, exchange: str = None) -> ExchangeCalendar:
+    """
+    The calendar of the market a symbol trades on: from its Yahoo exchange code
+    when known (given, or remembered by the symbol registry), else from the
+    ticker's form (suffix, currency pair, future, crypto pair), else New York.
+    """
+    symbol = (symbol or "").strip().upper()
+    if symbol.endswith(("=X", "=F")):
+        return CALENDARS["FX"]
+    if symbol.endswith(_CRYPTO_QUOTES):
+        return CALENDARS["CRYPTO"]
+    for suffix, code in SUFFIXES.items():
+        if symbol.endswith(suffix):
+            return CALENDARS[code]
+    if exchange is None:
+        from . import symbol_registry  # imported here: the registry's screener seed needs data_access
+        exchange = symbol_registry.get_registry().details(symbol).get('exchange')
+    return CALENDARS[EXCHANGE_CODES.get((exchange or "").upper(), DEFAULT_CALENDAR)]
+
+
+def is_open(symbol: str, at=None) -> bool:
+    """Whether the market of symbol is in its regular session."""
+    return calendar_for(symbol).is_open(at)
+
+
+def is_quiet(symbol: str, at=None) -> bool:
+    """Whether the market of symbol is closed and its closing prints have settled."""
+    calendar = calendar_for(symbol)
+    now = time.time() if at is None else at
+    if calendar.is_open(now):
+        return False
+    last_close = calendar.last_close(now)
+    return last_close is None or last_close.timestamp() + SETTLE_SECONDS <= now
+
+
+def unchanged_since(symbol: str, timestamp: float, at=None) -> bool:
+    """
+    Whether a quote of symbol taken at timestamp (epoch seconds) is still
+    current: its market is quiet and the quote was taken after it settled.
+    """
+    now = time.time() if at is None else at
+    if not is_quiet(symbol, now):
+        return False
+    last_close = calendar_for(symbol).last_close(now)
+    return last_close is None or timestamp >= last_close.timestamp() + SETTLE_SECONDS
+
+
+def ttl(symbol: str, open_ttl_seconds: float, at=None) -> float:
+    """
+    Cache TTL for a price-dependent value of symbol fetched now: open_ttl_seconds
+    while its market trades (or is settling), else until the next open.
+    """
+    now = time.time() if at is None else at
+    if not is_quiet(symbol, now):
+        return open_ttl_seconds
+    next_open = calendar_for(symbol).next_open(now)
+    if next_open is None:
+        return open_ttl_seconds
+    return max(open_ttl_seconds, min(next_open.timestamp() - now, MAX_CLOSED_TTL_SECONDS))
+
+
+def status(symbol: str, at=None) -> dict:
+    """Market status of symbol: calendar, open flag, last close and next open (ISO, exchange time)."""
+    calendar = calendar_for(symbol)
+    now = time.time() if at is None else at
+    last_close, next_open = calendar.last_close(now), calendar.next_open(now)
+    return {
+        "exchange": calendar.code,
+        "exchange_name": calendar.name,
+        "is_open": calendar.is_open(now),
+        "last_close": last_close.isoformat() if last_close else None,
+        "next_open": next_open.isoformat() if next_open else None,
+    }
@@ -0,0 +1,225 @@
+"""
+On-demand profiling of tool calls.
+
+Every tool in the shared_tools tool sets runs through profiled(). It is off by
+default, and then the wrapper only checks one context variable and one float
+before calling the tool. Profiling is switched on for a sampled share of calls
+(TOOL_PROFILE_SAMPLE_RATE, 0..1) or for everything run inside
+profile_requests(). A profiled call records:
+
+- where the time went, with either a stack sampler (TOOL_PROFILER=sample, the
+  default). It writes flamegraph-ready collapsed stacks ("a;b;c count", for
+  flamegraph.pl, speedscope or inferno).
+- or with cProfile (TOOL_PROFILER=cprofile). It writes a .prof file for pstats,
+  snakeviz or gprof2dot.
+- wall and CPU time.
+- the memory allocated during the call and its top allocation sites (tracemalloc).
+
+Each profile is tagged with the tool name and its arguments. A summary line per
+call is appended to tool_profiles.jsonl in TOOL_PROFILE_DIR.
+"""
+
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scraper', 'crawl_data', 'profiles')
+
+SAMPLE_RATE = float(os.getenv("TOOL_PROFILE_SAMPLE_RATE", "0") or 0)
+PROFILER = os.getenv("TOOL_PROFILER", "sample").strip().lower()
+PROFILE_DIR = os.getenv("TOOL_PROFILE_DIR") or DEFAULT_PROFILE_DIR
+# The sampler can only run when the profiled thread releases the GIL (at least
+# every sys.getswitchinterval(), 5 ms by default), so finer intervals gain little
+SAMPLE_INTERVAL_SECONDS = float(os.getenv("TOOL_PROFILE_INTERVAL_MS", "5")) / 1000
+TOP_ALLOCATIONS = 10
+TOP_FUNCTIONS = 15
+MAX_ARGUMENTS_LENGTH = 200
+
+_requested = contextvars.ContextVar("tool_profiling_requested", default=False)
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+_write_lock = threading.Lock()
+_UNSAFE_FILENAME = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+def set_sample_rate(rate: float):
+    """Profiles this share (0..1) of all tool calls from now on."""
+    global SAMPLE_RATE
+    SAMPLE_RATE = max(0.0, min(1.0, float(rate)))
+
+
+@contextmanager
+def profile_requests():
+    """Profiles every tool call made inside this block (and the tasks it starts)."""
+    token = _requested.set(True)
+    try:
+        yield
+    finally:
+        _requested.reset(token)
+
+
+def should_profile() -> bool:
+    if _requested.get():
+        return True
+    return SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+
+
+def describe_call(name: str, args: tuple, kwargs: dict) -> str:
+    """'tool(arg, key=value)', shortened; used to tag profiles and stacks."""
+    arguments = ", ".join([repr(a) for a in args] + [f"{k}={v!r}" for k, v in kwargs.items()])
+    if len(arguments) > MAX_ARGUMENTS_LENGTH:
+        arguments = arguments[:MAX_ARGUMENTS_LENGTH - 3] + "..."
+    # ';' separates frames in the collapsed stack format
+    return f"{name}({arguments})".replace(';', ',').replace('\n', ' ')
+
+
+def profiled(func):
+    """
+    Wraps a tool function so that its calls can be profiled. The wrapper keeps
+    the function's name, docstring and signature, which the tool declarations
+    are generated from.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not should_profile():
+            return func(*args, **kwargs)
+        return _profile_call(func, args, kwargs)
+
+    return wrapper
+
+
+class _StackSampler:
+    """Samples the call stack of one thread, below a given frame, at a fixed interval."""
+
+    def __init__(self, thread_id: int, root_frame, interval_seconds: float = SAMPLE_INTERVAL_SECONDS):
+        self.thread_id = thread_id
+        self.root_frame = root_frame
+        self.interval_seconds = interval_seconds
+        self.counts = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tool-profiler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.root_frame:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frame is None:
+                continue  # the thread is no longer inside the profiled call
+            key = tuple(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def collapsed(self, root: str) -> list:
+        return [f"{';'.join((root,) + stack)} {count}" for stack, count in self.counts.items()]
+
+
+def _start_tracing():
+    # tracemalloc is process-wide: started by the first profiled call in flight,
+    # stopped by the last one, and left alone if someone else started it
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def _profile_call(func, args, kwargs):
+    call = describe_call(func.__name__, args, kwargs)
+    _start_tracing()
+    before = tracemalloc.take_snapshot()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    started, cpu_started = time.perf_counter(), time.thread_time()
+    frame = sys._getframe()
+    profile = sampler = None
+    try:
+        if PROFILER == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                profile = None  # another profiler is active on this thread
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if profile is not None:
+                    profile.disable()
+        else:
+            with _StackSampler(threading.get_ident(), frame) as sampler:
+                return func(*args, **kwargs)
+    finally:
+        wall, cpu = time.perf_counter() - started, time.thread_time() - cpu_started
+        memory_after = tracemalloc.get_traced_memory()[0]
+        allocations = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+        _stop_tracing()
+        try:
+            _write_profile(func.__name__, call, wall, cpu, memory_after - memory_before, allocations, profile, sampler)
+        except Exception as e:
+            print(f"Could not write the profile of {call}: {e}")
+
+
+def _write_profile(name, call, wall, cpu, memory_delta, allocations, profile, sampler):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    base = os.path.join(PROFILE_DIR, f"{stamp}-{_UNSAFE_FILENAME.sub('_', name)}")
+    record = {
+        "tool": name,
+        "call": call,
+        "started_at": stamp,
+        "wall_ms": round(wall * 1000, 3),
+        "cpu_ms": round(cpu * 1000, 3),
+        "memory_delta_kb": round(memory_delta / 1024, 1),
+        "top_allocations": [
+            {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+             "size_kb": round(s.size_diff / 1024, 1), "count": s.count_diff}
+            for s in allocations[:TOP_ALLOCATIONS] if s.size_diff > 0
+        ],
+    }
+    if profile is not None:
+        record["profile"] = base + ".prof"
+        profile.dump_stats(record["profile"])
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        record["top_functions"] = [line.strip() for line in summary.getvalue().splitlines()
+                                   if line.strip()[:1].isdigit() and 'function calls' not in line]
+    if sampler is not None:
+        record["profile"] = base + ".folded"
+        record["samples"] = sum(sampler.counts.values())
+        with open(record["profile"], 'w', encoding='utf-8') as file:
+            file.write("\n".join(sampler.collapsed(call)) + "\n")
+    with _write_lock, open(os.path.join(PROFILE_DIR, 'tool_profiles.jsonl'), 'a', encoding='utf-8') as file:
+        file.write(json.dumps(record) + "\n")
@@ -0,0 +1,77 @@
+"""
+Lightweight parsing of user queries (ticker symbols mentioned in free text).
+"""
+
+import re
+
+# Upper-case words that look like tickers but are common finance/English terms.
+_NON_TICKER_WORDS = {
+    "A", "I", "AI", "AM", "AN", "AND", "ARE", "AS", "AT", "BE", "BY", "CEO", "CFO",
+    "DO", "EPS", "ETF", "EV", "FCF", "FOR", "GDP", "HOW", "IF", "IN", "IPO", "IS",
+    "IT", "ME", "MY", "NO", "OF", "OK", "ON", "OR", "PE", "PM", "ROA", "ROE", "SEC",
+    "SO", "THE", "TO", "UP", "US", "USA", "USD", "VS", "WE", "WHAT", "YOY", "EBITDA",
+}
+
+# Single-letter tickers (F, T, C) are only recognised with a "$" prefix
+_TICKER_PATTERN = re.compile(r'\$([A-Z]{1,5}(?:[.-][A-Z]{1,2})?)\b|\b([A-Z]{2,5}(?:[.-][A-Z]{1,2})?)\b')
+
+
+def extract_ticker_symbols(text: str) -> list:
+    """
+    Extracts ticker-like symbols (e.g. "NVDA", "$AAPL", "BRK.B") from free text.
+
+    Args:
+        text (str): The user query.
+
+    Returns:
+        list: Symbols in order of first appearance, without duplicates.
+    """
+    if not text:
+        return []
+    symbols = []
+    for match in _TICKER_PATTERN.finditer(text):
+        symbol = match.group(1) or match.group(2)
+        if symbol in _NON_TICKER_WORDS or symbol in symbols:
+            continue
+        symbols.append(symbol)
+    return symbols
+
+
+# Phrasings folded together so that equivalent questions share one intent key.
+_INTENT_SYNONYMS = (
+    (re.compile(r"price[\s-]+to[\s-]+earnings|p\s*/\s*e\b|\bpe ratio\b"), " pe "),
+    (re.compile(r"price[\s-]+to[\s-]+book|p\s*/\s*b\b"), " pb "),
+    (re.compile(r"\bmarket cap(italization)?\b"), " marketcap "),
+    (re.compile(r"\bstock price\b|\bshare price\b|\bquote\b"), " price "),
+    (re.compile(r"'s\b"), " "),
+)
+
+_INTENT_STOPWORDS = {
+    "a", "about", "an", "and", "are", "can", "could", "current", "currently",
+    "do", "does", "for", "give", "how", "i", "is", "it", "its", "me", "much",
+    "now", "of", "please", "right", "show", "tell", "the", "today", "what",
+    "whats", "what's", "you",
+}
+
+
+def normalize_intent(text: str, symbols: list = None) -> str:
+    """
+    Reduces a query to a canonical intent string: lower-cased, synonyms folded,
+    punctuation, stop words and ticker symbols removed, remaining words sorted.
+
+    Args:
+        text (str): The user query.
+        symbols (list): Ticker symbols to drop from the intent (default: extracted from text).
+
+    Returns:
+        str: The normalized intent, e.g. "pe" for "What's AAPL's P/E ratio?".
+    """
+    if symbols is None:
+        symbols = extract_ticker_symbols(text)
+    lowered = text.lower()
+    for symbol in symbols:
+        lowered = re.sub(r'\$?\b' + re.escape(symbol.lower()) + r'\b', ' ', lowered)
+    for pattern, replacement in _INTENT_SYNONYMS:
+        lowered = pattern.sub(replacement, lowered)
+    words = re.findall(r"[a-z0-9]+", lowered)
+    return " ".join(sorted({w for w in words if w not in _INTENT_STOPWORDS}))
@@ -0,0 +1,156 @@
+"""
+Typed, compact result records for the financial tools.
+
+Records hold raw numbers (floats and ints, None when unavailable). Tools return
+record.to_dict(), which keeps those raw values so that the model and any batch
+or screening code can compute on them directly; formatting for display is left
+to the model.
+"""
+
+from typing import Optional
+
+
+def to_number(value) -> Optional[float]:
+    """Converts a yfinance/pandas value to a plain float, or None if missing."""
+    if value is None or isinstance(value, (str, bool)):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value  # NaN -> None
+
+
+def to_integer(value) -> Optional[int]:
+    value = to_number(value)
+    return None if value is None else int(value)
+
+
+class _Record:
+    """Base class: slots are the stored fields, _DERIVED are computed properties."""
+
+    __slots__ = ()
+    _DERIVED = ()
+    _KEYS = {}  # field -> dictionary key, where the two differ
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values.get(field))
+
+    def _fields(self):
+        return self.__slots__ + self._DERIVED
+
+    def to_dict(self) -> dict:
+        """Returns the record with raw values, as a tool result ('status': 'success')."""
+        result = {"status": "success"}
+        for field in self._fields():
+            result[self._KEYS.get(field, field)] = getattr(self, field)
+        return result
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+
+class QuoteRecord(_Record):
+    """Latest price data for one symbol."""
+
+    __slots__ = (
+        "symbol", "company_name", "price", "currency", "previous_close",
+        "volume", "market_cap",
+    )
+    _DERIVED = ("change", "change_percent")
+
+    @property
+    def change(self) -> float:
+        return self.price - self.previous_close if self.previous_close else 0.0
+
+    @property
+    def change_percent(self) -> float:
+        """Change in percent of the previous close (1.23 == +1.23%)."""
+        return self.change / self.previous_close * 100 if self.previous_close else 0.0
+
+    @classmethod
+    def from_info(cls, symbol: str, info: dict) -> Optional["QuoteRecord"]:
+        """Builds a quote from a yfinance info dict, or returns None if it has no price."""
+        price = to_number(info.get('currentPrice', info.get('regularMarketPrice')))
+        if not price:
+            return None
+        previous_close = to_number(info.get('previousClose'))
+        return cls(
+            symbol=symbol,
+            company_name=info.get('longName', symbol),
+            price=price,
+            currency=info.get('currency', 'USD'),
+            previous_close=price if previous_close is None else previous_close,
+            volume=to_integer(info.get('volume')) or 0,
+            market_cap=to_integer(info.get('marketCap')),
+        )
+
+
+class CompanyProfileRecord(_Record):
+    """Descriptive and valuation data for one company. Ratios such as margins are fractions."""
+
+    __slots__ = (
+        "symbol", "company_name", "sector", "industry", "description", "website",
+        "employees", "country", "city", "state", "founded", "ceo",
+        "market_cap", "enterprise_value", "pe_ratio", "forward_pe", "price_to_book",
+        "debt_to_equity", "profit_margins", "revenue_growth",
+        "fifty_two_week_high", "fifty_two_week_low", "beta", "dividend_yield",
+    )
+    _KEYS = {"fifty_two_week_high": "52_week_high", "fifty_two_week_low": "52_week_low"}
+
+    @classmethod
+    def from_info(cls, symbol: str, info: dict) -> "CompanyProfileRecord":
+        officers = info.get('companyOfficers')
+        return cls(
+            symbol=symbol,
+            company_name=info.get('longName', symbol),
+            sector=info.get('sector'),
+            industry=info.get('industry'),
+            description=info.get('longBusinessSummary'),
+            website=info.get('website'),
+            employees=to_integer(info.get('fullTimeEmployees')),
+            country=info.get('country'),
+            city=info.get('city'),
+            state=info.get('state'),
+            founded=info.get('founded'),
+            ceo=officers[0].get('name') if officers else None,
+            market_cap=to_integer(info.get('marketCap')),
+            enterprise_value=to_integer(info.get('enterpriseValue')),
+            pe_ratio=to_number(info.get('trailingPE')),
+            forward_pe=to_number(info.get('forwardPE')),
+            price_to_book=to_number(info.get('priceToBook')),
+            debt_to_equity=to_number(info.get('debtToEquity')),
+            profit_margins=to_number(info.get('profitMargins')),
+            revenue_growth=to_number(info.get('revenueGrowth')),
+            fifty_two_week_high=to_number(info.get('fiftyTwoWeekHigh')),
+            fifty_two_week_low=to_number(info.get('fiftyTwoWeekLow')),
+            beta=to_number(info.get('beta')),
+            dividend_yield=to_number(info.get('dividendYield')),
+        )
+
+
+class FinancialMetricsRecord(_Record):
+    """
+    Statement figures and ratios of one filing period. Ratios and growth rates are
+    fractions; the year-over-year growth rates are only set for quarterly periods.
+    """
+
+    __slots__ = (
+        "symbol", "frequency", "period_end",
+        "revenue", "gross_profit", "operating_income", "net_income",
+        "total_assets", "total_liabilities", "stockholders_equity", "total_debt",
+        "operating_cash_flow", "capital_expenditure", "free_cash_flow",
+        "gross_margin", "operating_margin", "net_margin", "fcf_margin",
+        "return_on_equity", "return_on_assets", "debt_to_equity", "liabilities_to_assets",
+        "revenue_growth", "net_income_growth", "fcf_growth",
+        "revenue_growth_yoy", "net_income_growth_yoy", "fcf_growth_yoy",
+    )
+
+    @classmethod
+    def from_row(cls, symbol: str, frequency: str, period_end, row) -> "FinancialMetricsRecord":
+        """Builds a record from one row of the statements engine's ratio table."""
+        values = {field: to_number(row.get(field)) for field in cls.__slots__[3:]}
+        return cls(symbol=symbol, frequency=frequency,
+                   period_end=period_end.strftime('%Y-%m-%d'), **values)
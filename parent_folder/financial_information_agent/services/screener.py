@@ -0,0 +1,270 @@
+"""
+Cross-sectional stock screener over a cached universe.
+
+Keeps a columnar table (one NumPy array per field) of key yfinance 'info'
+fields for every symbol of a configurable universe. Rows are refreshed
+incrementally, only when they are older than the maximum age, and filter and
+rank queries are answered with vectorized NumPy operations.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . import data_access, market_calendar
+from .records import to_number
+
+# Large US companies across sectors; override with SCREENER_UNIVERSE (a comma
+# separated list of symbols or the path of a file with one symbol per line).
+DEFAULT_UNIVERSE = (
+    "AAPL", "MSFT", "NVDA", "GOOGL", "META", "AVGO", "ORCL", "CRM", "ADBE", "AMD",
+    "CSCO", "ACN", "IBM", "INTC", "QCOM", "TXN", "AMAT", "INTU", "NOW", "MU",
+    "AMZN", "TSLA", "HD", "MCD", "NKE", "SBUX", "LOW", "BKNG",
+    "JPM", "BAC", "WFC", "GS", "MS", "V", "MA", "AXP", "BRK-B",
+    "UNH", "JNJ", "LLY", "PFE", "MRK", "ABBV", "TMO", "ABT",
+    "XOM", "CVX", "COP", "WMT", "PG", "KO", "PEP", "COST",
+    "CAT", "GE", "HON", "UPS", "BA", "NEE", "DUK", "T", "VZ", "DIS", "NFLX",
+)
+
+# Numeric columns: table field -> yfinance info key
+NUMERIC_FIELDS = {
+    "pe_ratio": "trailingPE",
+    "forward_pe": "forwardPE",
+    "price_to_book": "priceToBook",
+    "beta": "beta",
+    "dividend_yield": "dividendYield",
+    "market_cap": "marketCap",
+}
+TEXT_FIELDS = {"sector": "sector", "industry": "industry", "company_name": "longName"}
+
+MAX_AGE_SECONDS = 6 * 60 * 60
+REFRESH_WORKERS = 8
+# The background refresher started with the screener reloads stale rows in
+# batches; tools only ever refresh a few rows inline
+BACKGROUND_REFRESH_SECONDS = 300
+BACKGROUND_BATCH_SIZE = 25
+INLINE_REFRESH_ROWS = 4
+# Longest a screen waits for the first rows right after startup
+FIRST_LOAD_TIMEOUT_SECONDS = 20
+
+
+def load_universe() -> tuple:
+    """Returns the configured universe (SCREENER_UNIVERSE or DEFAULT_UNIVERSE)."""
+    configured = os.getenv("SCREENER_UNIVERSE", "").strip()
+    if not configured:
+        return DEFAULT_UNIVERSE
+    if os.path.isfile(configured):
+        with open(configured, 'r', encoding='utf-8') as file:
+            symbols = [line.strip() for line in file if line.strip() and not line.startswith('#')]
+    else:
+        symbols = [s for s in configured.split(',') if s.strip()]
+    return tuple(dict.fromkeys(data_access.normalize_symbol(s) for s in symbols))
+
+
+class Screener:
+    """Columnar table of valuation fields with incremental refresh and vectorized queries."""
+
+    def __init__(self, universe=None, max_age_seconds: float = MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._rows_loaded = threading.Event()
+        self.symbols = np.array([], dtype=object)
+        self._rows = {}
+        self._columns = {}
+        self.updated_at = np.array([], dtype='float64')
+        self.set_universe(universe if universe is not None else load_universe())
+
+    def set_universe(self, universe):
+        """Replaces the universe, keeping already loaded rows of symbols that remain."""
+        symbols = list(dict.fromkeys(data_access.normalize_symbol(s) for s in universe))
+        with self._lock:
+            old_rows, old_columns, old_updated = self._rows, self._columns, self.updated_at
+            size = len(symbols)
+            columns = {field: np.full(size, np.nan) for field in NUMERIC_FIELDS}
+            columns.update({field: np.full(size, None, dtype=object) for field in TEXT_FIELDS})
+            updated_at = np.zeros(size)
+            for row, symbol in enumerate(symbols):
+                old_row = old_rows.get(symbol)
+                if old_row is not None:
+                    for field, values in columns.items():
+                        values[row] = old_columns[field][old_row]
+                    updated_at[row] = old_updated[old_row]
+            self.symbols = np.array(symbols, dtype=object)
+            self._rows = {symbol: row for row, symbol in enumerate(symbols)}
+            self._columns = columns
+            self.updated_at = updated_at
+
+    def _load_row(self, symbol: str):
+        info = data_access.get_ticker_info(symbol) or {}
+        numeric = {field: to_number(info.get(key)) for field, key in NUMERIC_FIELDS.items()}
+        text = {field: info.get(key) for field, key in TEXT_FIELDS.items()}
+        return numeric, text
+
+    def refresh(self, max_rows: int = None, force: bool = False, blocking: bool = True) -> int:
+        """
+        Reloads rows that are missing or older than max_age_seconds, stalest first.
+        Rows loaded after their market closed are kept until it opens again.
+
+        Args:
+            max_rows (int): Upper bound on rows reloaded by this call (default: all stale rows).
+            force (bool): Reload every row regardless of age.
+            blocking (bool): Wait for a refresh already in progress (False: return 0 at once).
+
+        Returns:
+            int: Number of rows reloaded.
+        """
+        if not self._refresh_lock.acquire(blocking=blocking):
+            return 0
+        try:
+            with self._lock:
+                now = time.time()
+                stale = np.arange(len(self.symbols)) if force else \
+                    np.flatnonzero(now - self.updated_at > self.max_age_seconds)
+                if not force:
+                    stale = np.array([row for row in stale if not market_calendar.unchanged_since(
+                        self.symbols[row], self.updated_at[row], now)], dtype=stale.dtype)
+                stale = stale[np.argsort(self.updated_at[stale], kind='stable')]
+                if max_rows is not None:
+                    stale = stale[:max_rows]
+                symbols = [self.symbols[row] for row in stale]
+            if not symbols:
+                return 0
+
+            # Rows not loaded before the caller's deadline stay stale until the next refresh
+            with ThreadPoolExecutor(max_workers=min(REFRESH_WORKERS, len(symbols))) as pool:
+                futures = [pool.submit(contextvars.copy_context().run, self._try_load_row, s) for s in symbols]
+                results = [future.result() for future in futures]
+
+            refreshed = 0
+            with self._lock:
+                loaded_at = time.time()
+                for symbol, result in zip(symbols, results):
+                    row = self._rows.get(symbol)
+                    if row is None or result is None:
+                        continue
+                    numeric, text = result
+                    for field, value in numeric.items():
+                        self._columns[field][row] = np.nan if value is None else value
+                    for field, value in text.items():
+                        self._columns[field][row] = value
+                    self.updated_at[row] = loaded_at
+                    refreshed += 1
+            if refreshed:
+                self._rows_loaded.set()
+            return refreshed
+        finally:
+            self._refresh_lock.release()
+
+    @property
+    def loaded_count(self) -> int:
+        """Number of rows loaded at least once."""
+        with self._lock:
+            return int(np.count_nonzero(self.updated_at > 0))
+
+    def wait_for_rows(self, timeout: float = None) -> bool:
+        """Waits until some rows are loaded (the first batch after startup); False on timeout."""
+        return self._rows_loaded.wait(timeout)
+
+    def _try_load_row(self, symbol: str):
+        try:
+            return self._load_row(symbol)
+        except Exception as e:
+            print(f"Screener could not load {symbol}: {e}")
+            return None
+
+    def query(self, filters: dict = None, sector: str = "", sort_by: str = "market_cap",
+              descending: bool = True, limit: int = 20) -> list:
+        """
+        Filters and ranks the loaded rows.
+
+        Args:
+            filters (dict): field -> (minimum, maximum); either bound may be None.
+            sector (str): Case-insensitive substring of the sector or industry ("" = any).
+            sort_by (str): Numeric field to rank by.
+            descending (bool): Rank from highest to lowest.
+            limit (int): Maximum number of rows returned.
+
+        Returns:
+            list: One dict per matching symbol, with raw values (None when unavailable).
+        """
+        if sort_by not in NUMERIC_FIELDS:
+            raise ValueError(f"sort_by must be one of {sorted(NUMERIC_FIELDS)}, got {sort_by!r}")
+        with self._lock:
+            columns = {field: values.copy() for field, values in self._columns.items()}
+            symbols = self.symbols.copy()
+            loaded = self.updated_at > 0
+
+        mask = loaded.copy()
+        for field, (minimum, maximum) in (filters or {}).items():
+            if field not in NUMERIC_FIELDS:
+                raise ValueError(f"Unknown screening field {field!r}")
+            values = columns[field]
+            if minimum is not None:
+                mask &= values >= minimum  # NaN compares False, so rows without data drop out
+            if maximum is not None:
+                mask &= values <= maximum
+        if sector:
+            needle = sector.lower()
+            in_sector = np.array([
+                needle in (s or '').lower() or needle in (i or '').lower()
+                for s, i in zip(columns['sector'], columns['industry'])
+            ], dtype=bool)
+            mask &= in_sector
+
+        rows = np.flatnonzero(mask)
+        keys = columns[sort_by][rows]
+        # NaN always ranks last
+        order = np.argsort(np.where(np.isnan(keys), np.inf, -keys if descending else keys), kind='stable')
+        rows = rows[order][:max(limit, 0)]
+
+        return [
+            {
+                "symbol": symbols[row],
+                **{field: columns[field][row] for field in TEXT_FIELDS},
+                **{field: None if np.isnan(columns[field][row]) else float(columns[field][row])
+                   for field in NUMERIC_FIELDS},
+            }
+            for row in rows
+        ]
+
+    def start_background_refresh(self, interval_seconds: float = BACKGROUND_REFRESH_SECONDS,
+                                 batch_size: int = BACKGROUND_BATCH_SIZE):
+        """
+        Starts a daemon thread that refreshes up to batch_size stale rows at a
+        time: batch after batch while a full batch was stale, then every interval.
+        """
+        def loop():
+            while True:
+                try:
+                    refreshed = self.refresh(max_rows=batch_size)
+                except Exception as e:
+                    print(f"Screener background refresh failed: {e}")
+                    refreshed = 0
+                if refreshed < batch_size:
+                    time.sleep(interval_seconds)
+
+        thread = threading.Thread(target=loop, name="screener-refresh", daemon=True)
+        thread.start()
+        return thread
+
+
+_screener = None
+_screener_lock = threading.Lock()
+
+
+def get_screener() -> Screener:
+    """
+    Returns the process-wide screener, creating it on first use together with
+    its background refresher.
+    """
+    global _screener
+    with _screener_lock:
+        if _screener is None:
+            _screener = Screener()
+            _screener.start_background_refresh()
+        return _screener
@@ -0,0 +1,94 @@
+"""
+Single-flight request coalescing for upstream data calls.
+
+When several sessions (or several sub-agents of the root agent) ask for the same
+resource at the same moment, only the first caller performs the upstream call.
+Every concurrent caller with the same key waits for that call and receives its
+result (or its exception).
+
+With a timeout, the call runs in a thread of its own and every caller only
+waits on it for that long, so a hung upstream call holds one thread (until
+its network timeout ends it) and never the callers.
+"""
+
+import contextvars
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class WaitTimeout(TimeoutError):
+    """Raised to a caller whose timeout passed before the shared call finished."""
+
+
+class _Call:
+    """A single in-flight upstream call shared by all waiters."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share the same key.
+
+    Only calls that overlap in time are merged; once a call has completed, the
+    next call with the same key goes upstream again. Caching is left to callers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: float = None) -> Any:
+        """
+        Runs fn() for the first caller of a key and shares its outcome with
+        every caller that arrives while it is still running.
+
+        Args:
+            key: Hashable identifier of the upstream request (e.g. ("info", "AAPL")).
+            fn: Zero-argument callable performing the upstream request.
+            timeout: Seconds this caller waits at most. When given, a new call
+                     runs in its own thread (in a copy of the caller's context)
+                     and keeps running after the caller gives up.
+
+        Returns:
+            The value returned by fn(). Exceptions raised by fn() are re-raised
+            in every waiting caller; WaitTimeout if the timeout passes first.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            if timeout is None:
+                self._run(key, call, fn)
+            else:
+                threading.Thread(target=contextvars.copy_context().run, args=(self._run, key, call, fn),
+                                 name="single-flight", daemon=True).start()
+
+        if not call.done.wait(timeout):
+            raise WaitTimeout(f"Still waiting for {key} after {timeout:.1f}s")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _run(self, key: Hashable, call: _Call, fn: Callable[[], Any]):
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Returns the number of upstream calls currently running."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,159 @@
+"""
+Multi-period financial statements engine.
+
+Keeps the full income statement, balance sheet and cash flow frames returned by
+yfinance (annual or quarterly) and computes every ratio for all periods at once
+with vectorized pandas operations. Results are cached per filing period: a
+symbol's statements are not downloaded again until its next filing can be out,
+so the history and valuation agents share one fetch.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from . import data_access
+
+FREQUENCIES = {
+    # frequency -> (yfinance attributes, period length, typical filing lag)
+    'annual': (('income_stmt', 'balance_sheet', 'cashflow'), timedelta(days=365), timedelta(days=75)),
+    'quarterly': (('quarterly_income_stmt', 'quarterly_balance_sheet', 'quarterly_cashflow'),
+                  timedelta(days=91), timedelta(days=45)),
+}
+
+# How often to check again once a new filing is due but not yet published
+RECHECK_INTERVAL = timedelta(hours=12)
+# Ratio tables kept in memory (least recently used ones are dropped)
+MAX_ENTRIES = 512
+
+# Output column -> candidate statement rows, in order of preference
+_LINE_ITEMS = {
+    'revenue': ('Total Revenue', 'Operating Revenue'),
+    'gross_profit': ('Gross Profit',),
+    'operating_income': ('Operating Income', 'Total Operating Income As Reported'),
+    'net_income': ('Net Income', 'Net Income Common Stockholders'),
+    'total_assets': ('Total Assets',),
+    'total_liabilities': ('Total Liabilities Net Minority Interest', 'Total Liabilities'),
+    'stockholders_equity': ('Stockholders Equity', 'Common Stock Equity'),
+    'total_debt': ('Total Debt',),
+    'operating_cash_flow': ('Operating Cash Flow', 'Cash Flow From Continuing Operating Activities'),
+    'capital_expenditure': ('Capital Expenditure',),
+    'free_cash_flow': ('Free Cash Flow',),
+}
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # (symbol, frequency) -> (refresh_after, ratios DataFrame), least recently used first
+
+
+def _line_item(frame: pd.DataFrame, candidates) -> pd.Series:
+    """Returns the first available row among candidates (all NaN if none exists)."""
+    for name in candidates:
+        if name in frame.index:
+            return pd.to_numeric(frame.loc[name], errors='coerce')
+    return pd.Series(float('nan'), index=frame.columns, dtype='float64')
+
+
+def compute_ratios(income: pd.DataFrame, balance: pd.DataFrame, cashflow: pd.DataFrame,
+                   frequency: str = 'annual') -> pd.DataFrame:
+    """
+    Computes line items and ratios for every period in the statements.
+
+    Args:
+        income, balance, cashflow (pd.DataFrame): yfinance statement frames
+            (line items as rows, period end dates as columns).
+        frequency (str): 'annual' or 'quarterly' (quarterly also gets year-over-year growth).
+
+    Returns:
+        pd.DataFrame: One row per period end, oldest first; ratios are fractions.
+    """
+    frames = {'income': income, 'balance': balance, 'cashflow': cashflow}
+    periods = sorted(set().union(*(f.columns for f in frames.values() if f is not None and not f.empty)))
+    aligned = {
+        name: (f.reindex(columns=periods) if f is not None and not f.empty
+               else pd.DataFrame(columns=periods))
+        for name, f in frames.items()
+    }
+    source = {
+        'revenue': 'income', 'gross_profit': 'income', 'operating_income': 'income',
+        'net_income': 'income', 'total_assets': 'balance', 'total_liabilities': 'balance',
+        'stockholders_equity': 'balance', 'total_debt': 'balance',
+        'operating_cash_flow': 'cashflow', 'capital_expenditure': 'cashflow',
+        'free_cash_flow': 'cashflow',
+    }
+    table = pd.DataFrame(
+        {column: _line_item(aligned[source[column]], rows) for column, rows in _LINE_ITEMS.items()},
+        index=pd.DatetimeIndex(periods, name='period_end'),
+    ).astype('float64')
+
+    # Derive missing values where the components are available
+    table['stockholders_equity'] = table['stockholders_equity'].fillna(
+        table['total_assets'] - table['total_liabilities'])
+    table['free_cash_flow'] = table['free_cash_flow'].fillna(
+        table['operating_cash_flow'] + table['capital_expenditure'])
+
+    positive_equity = table['stockholders_equity'].where(table['stockholders_equity'] > 0)
+    positive_assets = table['total_assets'].where(table['total_assets'] > 0)
+    revenue = table['revenue'].where(table['revenue'] != 0)
+
+    table['gross_margin'] = table['gross_profit'] / revenue
+    table['operating_margin'] = table['operating_income'] / revenue
+    table['net_margin'] = table['net_income'] / revenue
+    table['fcf_margin'] = table['free_cash_flow'] / revenue
+    table['return_on_equity'] = table['net_income'] / positive_equity
+    table['return_on_assets'] = table['net_income'] / positive_assets
+    table['debt_to_equity'] = table['total_debt'] / positive_equity
+    table['liabilities_to_assets'] = table['total_liabilities'] / positive_assets
+
+    growth = table[['revenue', 'net_income', 'free_cash_flow']]
+    previous = growth.shift(1)
+    changes = (growth - previous) / previous.abs().where(previous != 0)
+    table[['revenue_growth', 'net_income_growth', 'fcf_growth']] = changes.to_numpy()
+    if frequency == 'quarterly':
+        year_ago = growth.shift(4)
+        yoy = (growth - year_ago) / year_ago.abs().where(year_ago != 0)
+        table[['revenue_growth_yoy', 'net_income_growth_yoy', 'fcf_growth_yoy']] = yoy.to_numpy()
+
+    # Periods without any income statement or balance sheet data are noise
+    return table.dropna(how='all', subset=['revenue', 'net_income', 'total_assets'])
+
+
+def get_statement_ratios(symbol: str, frequency: str = 'annual') -> pd.DataFrame:
+    """
+    Returns the ratio table of a symbol, downloading the statements only when the
+    cached filing period may have been superseded by a new filing.
+
+    Args:
+        symbol (str): The stock ticker symbol.
+        frequency (str): 'annual' or 'quarterly'.
+
+    Returns:
+        pd.DataFrame: See compute_ratios(). Empty if no statements are available.
+    """
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"frequency must be one of {sorted(FREQUENCIES)}, got {frequency!r}")
+    symbol = data_access.normalize_symbol(symbol)
+    key = (symbol, frequency)
+    now = datetime.now()
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] > now:
+            _cache.move_to_end(key)
+            return cached[1]
+
+    attributes, period_length, filing_lag = FREQUENCIES[frequency]
+    income, balance, cashflow = (data_access.get_ticker_attribute(symbol, a) for a in attributes)
+    ratios = compute_ratios(income, balance, cashflow, frequency)
+
+    if ratios.empty:
+        refresh_after = now + RECHECK_INTERVAL
+    else:
+        next_filing = ratios.index[-1].to_pydatetime() + period_length + filing_lag
+        refresh_after = max(next_filing, now + RECHECK_INTERVAL)
+    with _lock:
+        _cache[key] = (refresh_after, ratios)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return ratios
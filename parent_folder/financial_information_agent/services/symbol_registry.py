@@ -0,0 +1,165 @@
+"""
+Local symbol registry with negative caching.
+
+Known tickers (the entity dictionary, the screener universe and every symbol
+that has resolved successfully, with its exchange and name) are checked in
+memory, and symbols that turned out to be invalid are remembered in the shared
+cache backend, so a bad or delisted ticker is rejected without another slow
+'info' round trip, with a suggestion when the input looks like a company name.
+"""
+
+import re
+import threading
+import time
+
+from . import cache_backend, entity_tagger
+
+# How long a symbol upstream answered 404 for is remembered
+NEGATIVE_TTL_SECONDS = 6 * 60 * 60
+# An empty 'info' is often a passing upstream hiccup for a valid symbol, so it
+# only briefly counts as invalid
+EMPTY_INFO_TTL_SECONDS = 60
+# How long the exchange and name of a valid symbol are remembered across processes
+POSITIVE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+# Equities ("BRK-B", "RY.TO"), indices ("^GSPC"), currencies ("EURUSD=X"),
+# futures ("CL=F") and crypto pairs ("BTC-USD")
+_SYMBOL_PATTERN = re.compile(r'^\^?[A-Z0-9]{1,10}(?:[.\-][A-Z0-9]{1,5})?(?:=[A-Z]{1,2})?$')
+
+# Quote fields that only exist for a real instrument
+_IDENTIFYING_FIELDS = ('quoteType', 'currentPrice', 'regularMarketPrice', 'previousClose',
+                       'longName', 'shortName', 'exchange')
+
+
+class InvalidSymbolError(ValueError):
+    """Raised for a symbol that is malformed or known not to exist."""
+
+    def __init__(self, symbol: str, reason: str, suggestion: str = None):
+        self.symbol = symbol
+        self.suggestion = suggestion
+        message = f"{symbol!r} is not a valid ticker symbol ({reason})"
+        if suggestion:
+            message += f". Did you mean {suggestion}?"
+        super().__init__(message)
+
+
+def looks_invalid(info) -> bool:
+    """Whether a yfinance 'info' result describes no instrument at all."""
+    if not info:
+        return True
+    return not any(info.get(field) not in (None, '', 'NONE') for field in _IDENTIFYING_FIELDS)
+
+
+class SymbolRegistry:
+    """In-memory view of valid and invalid symbols, backed by the shared cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._known = {}     # symbol -> {'name': ..., 'exchange': ...}
+        self._invalid = {}   # symbol -> (expires_at, reason)
+        tagger = entity_tagger.get_tagger()
+        for symbol, name in tagger.names.items():
+            self._known[symbol] = {'name': name, 'exchange': None}
+        from .screener import DEFAULT_UNIVERSE  # imported here: screener depends on data_access
+        for symbol in DEFAULT_UNIVERSE:
+            self._known.setdefault(symbol, {'name': None, 'exchange': None})
+
+    def is_known(self, symbol: str) -> bool:
+        return symbol in self._known
+
+    def details(self, symbol: str) -> dict:
+        """Name and exchange of a known symbol ({} if unknown)."""
+        with self._lock:
+            details = self._known.get(symbol)
+        if details is None or details.get('exchange') is None:
+            try:
+                cached = cache_backend.get_backend().get(f"symbol:{symbol}")
+            except Exception as e:
+                print(f"Could not read the symbol cache for {symbol}: {e}")
+                cached = cache_backend.MISSING
+            if cached is not cache_backend.MISSING:
+                with self._lock:
+                    self._known[symbol] = details = cached
+        return dict(details or {})
+
+    def suggest(self, text: str):
+        """A known ticker for a company name or alias, if the text names one."""
+        return entity_tagger.resolve_symbol(text)
+
+    def check(self, symbol: str):
+        """
+        Raises InvalidSymbolError for a malformed symbol or one that recently
+        failed to resolve; returns quickly for anything else.
+        """
+        if symbol in self._known:
+            return
+        if not _SYMBOL_PATTERN.match(symbol):
+            raise InvalidSymbolError(symbol, "malformed", self._suggestion(symbol))
+        with self._lock:
+            entry = self._invalid.get(symbol)
+        if entry is None:
+            try:
+                cached = cache_backend.get_backend().get(f"invalid-symbol:{symbol}")
+            except Exception as e:
+                print(f"Could not read the negative cache for {symbol}: {e}")
+                return
+            if cached is cache_backend.MISSING:
+                return
+            entry = cached
+            with self._lock:
+                self._invalid[symbol] = entry
+        expires_at, reason = entry
+        if expires_at > time.time():
+            raise InvalidSymbolError(symbol, reason, self._suggestion(symbol))
+        with self._lock:
+            self._invalid.pop(symbol, None)
+
+    def _suggestion(self, symbol: str):
+        suggestion = self.suggest(symbol)
+        return suggestion if suggestion and suggestion != symbol else None
+
+    def record_info(self, symbol: str, info: dict):
+        """Learns from an 'info' result: remembers the symbol as valid or as invalid."""
+        if looks_invalid(info):
+            self.record_invalid(symbol, "no quote data found", EMPTY_INFO_TTL_SECONDS)
+            return
+        details = {'name': info.get('longName') or info.get('shortName'), 'exchange': info.get('exchange')}
+        with self._lock:
+            self._known[symbol] = details
+            self._invalid.pop(symbol, None)
+        try:
+            cache_backend.get_backend().set(f"symbol:{symbol}", details, POSITIVE_TTL_SECONDS)
+        except Exception as e:
+            print(f"Could not cache details of {symbol}: {e}")
+
+    def record_invalid(self, symbol: str, reason: str, ttl_seconds: float = NEGATIVE_TTL_SECONDS):
+        entry = (time.time() + ttl_seconds, reason)
+        with self._lock:
+            self._invalid[symbol] = entry
+        try:
+            cache_backend.get_backend().set(f"invalid-symbol:{symbol}", entry, ttl_seconds)
+        except Exception as e:
+            print(f"Could not cache invalid symbol {symbol}: {e}")
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> SymbolRegistry:
+    """Returns the process-wide registry, creating it on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SymbolRegistry()
+        return _registry
+
+
+def resolve(query: str):
+    """
+    Resolves a ticker or company name to a ticker symbol without network access.
+
+    Returns:
+        str or None: The symbol, or None when the query matches nothing known.
+    """
+    return entity_tagger.resolve_symbol(query)
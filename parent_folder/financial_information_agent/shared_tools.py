@@ -6,6 +6,8 @@ This provides a centralized way for all agents to access the same web scraping a
 import sys
 import os
 
+from google.adk.tools import FunctionTool
+
 # Add parent directory to path to import api_functions
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from api_functions import (
@@ -19,10 +21,16 @@ from api_functions import (
     get_company_profile,
     get_enhanced_company_news,
     scan_website_content,
+    search_scraped_content,
     check_robots_txt,
     scrape_raw_content,
-    scrape_multiple_urls
+    scrape_multiple_urls,
+    screen_stocks,
+    compare_companies,
+    get_technical_indicators,
+    analyze_portfolio
 )
+from services import profiling
 
 # Define tool sets for different agent types
 STOCK_HISTORY_TOOLS = [
@@ -33,7 +41,10 @@ STOCK_HISTORY_TOOLS = [
     get_company_news,
     get_financial_metrics,
     check_robots_txt,
-    scrape_raw_content
+    scrape_raw_content,
+    compare_companies,
+    get_technical_indicators,
+    analyze_portfolio
 ]
 
 CURRENT_VALUATION_TOOLS = [
@@ -42,11 +53,13 @@ CURRENT_VALUATION_TOOLS = [
     get_financial_metrics,
     get_realtime_stock_price,
     get_comprehensive_company_info,
-    check_robots_txt
+    check_robots_txt,
+    screen_stocks
 ]
 
 FUTURE_OUTLOOK_TOOLS = [
     get_enhanced_company_news,
+    search_scraped_content,
     scan_website_content,
     get_company_wikipedia_info,
     get_company_news,
@@ -68,11 +81,56 @@ ALL_TOOLS = [
     get_company_profile,
     get_enhanced_company_news,
     scan_website_content,
+    search_scraped_content,
     check_robots_txt,
     scrape_raw_content,
-    scrape_multiple_urls
+    scrape_multiple_urls,
+    screen_stocks,
+    compare_companies,
+    get_technical_indicators,
+    analyze_portfolio
 ]
 
+class LightweightFunctionTool(FunctionTool):
+    """
+    FunctionTool whose declaration is generated once and then reused for every
+    model request. The docstring's 'Returns:' section is dropped from the
+    description, since the model only needs to know what a tool does and what
+    arguments it takes.
+    """
+
+    def __init__(self, func):
+        super().__init__(func)
+        self._cached_declaration = None
+
+    def _get_declaration(self):
+        if self._cached_declaration is None:
+            declaration = super()._get_declaration()
+            if declaration is not None and declaration.description:
+                description = declaration.description.split('Returns:')[0]
+                declaration.description = description.strip()
+            self._cached_declaration = declaration
+        return self._cached_declaration
+
+# One tool object per function, shared by every agent that uses it
+_TOOL_CACHE = {}
+
+def as_tool(func) -> LightweightFunctionTool:
+    """
+    Get the shared LightweightFunctionTool for a function, creating it on first use.
+    The function is wrapped with profiling.profiled(), so its calls can be profiled.
+    
+    Args:
+        func: The tool function
+    
+    Returns:
+        LightweightFunctionTool: The cached tool wrapping func
+    """
+    tool = _TOOL_CACHE.get(func)
+    if tool is None:
+        tool = _TOOL_CACHE[func] = LightweightFunctionTool(profiling.profiled(func))
+    return tool
+
 def get_tools_for_agent(agent_type: str) -> list:
     """
     Get the appropriate tools for a specific agent type.
@@ -81,7 +139,7 @@ def get_tools_for_agent(agent_type: str) -> list:
         agent_type (str): One of 'stock_history', 'current_valuation', 'future_outlook', or 'all'
     
     Returns:
-        list: List of function references for the agent to use
+        list: List of shared tool objects (with cached declarations) for the agent to use
     """
     tool_mapping = {
         'stock_history': STOCK_HISTORY_TOOLS,
@@ -90,4 +148,4 @@ def get_tools_for_agent(agent_type: str) -> list:
         'all': ALL_TOOLS
     }
     
-    return tool_mapping.get(agent_type, ALL_TOOLS) 
\ No newline at end of file
+    return [as_tool(func) for func in tool_mapping.get(agent_type, ALL_TOOLS)] 
\ No newline at end of file
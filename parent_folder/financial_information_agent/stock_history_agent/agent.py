@@ -2,20 +2,41 @@ from . import prompt
 import sys
 import os
 
+from google.adk.agents import LlmAgent
+
 # Add parent directory to path to import shared_tools
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from shared_tools import get_tools_for_agent
+from services.answer_cache import record_tool_result
+
+# Model for this specialty; override with the STOCK_HISTORY_MODEL environment variable
+DEFAULT_MODEL = os.getenv("STOCK_HISTORY_MODEL", "gemini-2.5-flash")
+
+def build_stock_history_investigator(model: str = DEFAULT_MODEL, parallel: bool = False) -> LlmAgent:
+    """
+    Creates a new stock_history_investigator agent.
+    Each call returns a fresh instance, because an ADK agent can only belong to one parent.
+
+    Args:
+        model (str): The model to run this specialist on.
+        parallel (bool): Build the instance for parallel_specialists, which works
+            from the symbols of the request instead of asking the user.
 
-# For now, let's create a simple agent class until you decide on your agent framework
-class StockHistoryInvestigator:
-    def __init__(self):
-        self.name = "stock_history_investigator"
-        self.description = (
+    Returns:
+        LlmAgent: The configured agent.
+    """
+    return LlmAgent(
+        name="stock_history_investigator",
+        model=model,
+        description=(
             "Analyzes a stock's historical performance including long-term trends, "
             "earnings reports, and major corporate events."
-        )
-        self.instruction = prompt.STOCK_HISTORY_INVESTIGATOR_PROMPT
-        self.output_key = "stock_history_investigator_output"
-        self.tools = get_tools_for_agent('stock_history')
+        ),
+        instruction=(prompt.STOCK_HISTORY_INVESTIGATOR_PARALLEL_PROMPT if parallel
+                     else prompt.STOCK_HISTORY_INVESTIGATOR_PROMPT),
+        output_key="stock_history_investigator_output",
+        after_tool_callback=record_tool_result,
+        tools=get_tools_for_agent('stock_history'),
+    )
 
-stock_history_investigator = StockHistoryInvestigator()
+stock_history_investigator = build_stock_history_investigator()
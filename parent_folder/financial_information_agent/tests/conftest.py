@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Tests import the agent's packages the way the agent does (services.*, scraper.*)
+os.environ.setdefault("CONTENT_INDEX_PATH", ":memory:")
+os.environ.setdefault("MARKET_DATA_CACHE", "memory")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
@@ -0,0 +1,107 @@
+import contextvars
+from types import SimpleNamespace
+
+import pytest
+
+from services import answer_cache, data_access
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    answer_cache.answer_cache.clear()
+    yield
+    answer_cache.answer_cache.clear()
+
+
+def _context(text, earlier_invocations=()):
+    events = [SimpleNamespace(invocation_id=i) for i in (*earlier_invocations, "now")]
+    return SimpleNamespace(
+        invocation_id="now",
+        session=SimpleNamespace(events=events),
+        user_content=SimpleNamespace(parts=[SimpleNamespace(text=text)]),
+        state={},
+    )
+
+
+def _answer(context, answer, *tool_results, source_ttls=(60,)):
+    """Runs one turn through the callbacks: the lookup, the tool calls and the store."""
+    def turn():
+        served = answer_cache.serve_cached_answer(context)
+        if served is not None:
+            return served.parts[0].text
+        for ttl in source_ttls:
+            data_access.note_source_ttl(ttl)
+        for result in tool_results:
+            answer_cache.record_tool_result(SimpleNamespace(func=lambda result=result: result), {}, None, result)
+        context.state["stock_master_analyst_output"] = answer
+        answer_cache.store_answer(context)
+        return answer
+    return contextvars.copy_context().run(turn)
+
+
+def test_first_turns_share_answers():
+    ok = {"status": "success", "price": 1.0}
+    assert _answer(_context("What is AAPL trading at?"), "first", ok) == "first"
+    assert _answer(_context("What is AAPL trading at?"), "second", ok) == "first"
+
+
+def test_later_turns_are_neither_served_nor_stored():
+    ok = {"status": "success", "price": 1.0}
+    _answer(_context("What is AAPL trading at?"), "first", ok)
+    assert _answer(_context("What is AAPL trading at?", ["before"]), "follow-up", ok) == "follow-up"
+
+    answer_cache.answer_cache.clear()
+    _answer(_context("What is MSFT trading at?", ["before"]), "follow-up", ok)
+    assert _answer(_context("What is MSFT trading at?"), "fresh", ok) == "fresh"
+
+
+@pytest.mark.parametrize("failed", [
+    {"status": "error", "error_message": "upstream timed out"},
+    {"status": "success", "partial": True, "missing_sections": ["news"]},
+])
+def test_answers_built_on_failed_tools_are_not_stored(failed):
+    ok = {"status": "success", "price": 1.0}
+    _answer(_context("What is AAPL trading at?"), "degraded", ok, failed)
+    assert _answer(_context("What is AAPL trading at?"), "retried", ok) == "retried"
+
+
+def test_answers_expire_with_their_shortest_source_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "monotonic", lambda: now[0])
+    ok = {"status": "success", "price": 1.0}
+    _answer(_context("What is AAPL trading at?"), "first", ok, source_ttls=(900, 15, 300))
+
+    now[0] += 14
+    assert _answer(_context("What is AAPL trading at?"), "second", ok) == "first"
+    now[0] += 2
+    assert _answer(_context("What is AAPL trading at?"), "third", ok) == "third"
+
+
+def test_answers_without_source_ttls_expire_after_the_max_age(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "monotonic", lambda: now[0])
+    ok = {"status": "success", "results": []}
+    _answer(_context("Any AAPL news?"), "first", ok, source_ttls=())
+
+    now[0] += answer_cache.MAX_AGE_SECONDS - 1
+    assert _answer(_context("Any AAPL news?"), "second", ok) == "first"
+    now[0] += 1
+    assert _answer(_context("Any AAPL news?"), "third", ok) == "third"
+
+
+def test_a_failed_turn_does_not_leak_its_recording_into_the_next():
+    ok = {"status": "success", "price": 1.0}
+
+    def turns():
+        # The first turn fails after its lookup: store_answer never runs
+        answer_cache.serve_cached_answer(_context("What is AAPL trading at?"))
+        data_access.note_source_ttl(60)
+        # The follow-up in the same session is answered and stored normally
+        follow_up = _context("And its competitors?", ["first"])
+        assert answer_cache.serve_cached_answer(follow_up) is None
+        answer_cache.record_tool_result(SimpleNamespace(func=lambda: ok), {}, None, ok)
+        follow_up.state["stock_master_analyst_output"] = "competitors"
+        answer_cache.store_answer(follow_up)
+    contextvars.copy_context().run(turns)
+
+    assert _answer(_context("What is AAPL trading at?"), "price", ok) == "price"
@@ -0,0 +1,59 @@
+import pytest
+
+from scraper import batch_scraper, boilerplate
+
+PAGES = {
+    f"https://news.example/story-{n}": f"""<html><head><title>Story {n}</title></head><body>
+    <nav><a href="/">Home</a><a href="/markets">Markets</a></nav>
+    <article><h1>Story {n}</h1>
+    <p>{'Shares of the company moved after the quarterly report. ' * (n + 3)}</p>
+    <p>Analysts expect revenue of {n} billion dollars next quarter.</p></article>
+    <footer>Copyright News Site</footer></body></html>""".encode('utf-8')
+    for n in range(4)
+}
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    def fetch(url):
+        if url in PAGES:
+            return PAGES[url], None
+        return None, f"Failed to retrieve {url}: 404 Client Error"
+
+    monkeypatch.setattr(batch_scraper, "_fetch", fetch)
+    monkeypatch.delenv("SCRAPER_RENDERING", raising=False)
+    yield
+    batch_scraper._reset_parse_pool()
+
+
+def _fresh_learner(monkeypatch):
+    monkeypatch.setattr(boilerplate, "_learner", boilerplate.BoilerplateLearner(path=None))
+
+
+def test_process_pool_and_in_process_parsing_give_the_same_text(monkeypatch):
+    urls = list(PAGES) + ["https://news.example/missing"]
+
+    _fresh_learner(monkeypatch)
+    in_process = batch_scraper.scrape_batch(urls, use_processes=False)
+    _fresh_learner(monkeypatch)
+    pooled = batch_scraper.scrape_batch(urls, use_processes=True)
+
+    assert batch_scraper._pool is not None
+    assert pooled == in_process
+    assert list(pooled) == urls
+    assert "Analysts expect revenue of 2 billion" in pooled["https://news.example/story-2"]
+    assert pooled["https://news.example/missing"].startswith("Failed to retrieve")
+
+
+def test_a_broken_pool_falls_back_to_in_process_parsing(monkeypatch):
+    _fresh_learner(monkeypatch)
+    expected = batch_scraper.scrape_batch(list(PAGES), use_processes=False)
+
+    class BrokenPool:
+        def submit(self, *args):
+            raise RuntimeError("cannot schedule new futures after shutdown")
+
+    _fresh_learner(monkeypatch)
+    monkeypatch.setattr(batch_scraper, "get_parse_pool", lambda: BrokenPool())
+
+    assert batch_scraper.scrape_batch(list(PAGES), use_processes=True) == expected
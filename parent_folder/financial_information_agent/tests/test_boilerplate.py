@@ -0,0 +1,107 @@
+import threading
+
+from bs4 import BeautifulSoup
+
+from scraper import boilerplate
+
+TEMPLATE = """<html><body>
+<nav id="menu"><a href="/">Home</a><a href="/markets">Markets</a></nav>
+<div class="promo-{number}">Subscribe to our newsletter</div>
+<article><h1>{title}</h1><p>{body}</p></article>
+<footer>Copyright News Site</footer>
+</body></html>"""
+
+
+def _page(number: int) -> BeautifulSoup:
+    return BeautifulSoup(TEMPLATE.format(number=number, title=f"Story {number}",
+                                         body=f"Body of story number {number}."), "html.parser")
+
+
+def _fingerprints_of(soup, name):
+    fingerprints = boilerplate.fingerprint_tree(soup)
+    return [fp for fp, element in fingerprints.values() if element.name == name]
+
+
+def test_fingerprints_match_for_the_same_subtree_on_different_pages():
+    first, second = _page(1), _page(2)
+
+    assert _fingerprints_of(first, "nav") == _fingerprints_of(second, "nav")
+    # Digits in classes are treated as per-page counters
+    assert _fingerprints_of(first, "div") == _fingerprints_of(second, "div")
+    assert _fingerprints_of(first, "article") != _fingerprints_of(second, "article")
+
+
+def test_template_is_stripped_once_learned_for_its_domain():
+    learner = boilerplate.BoilerplateLearner(path=None)
+
+    removed = [learner.learn_and_strip(_page(n), "news.example", f"https://news.example/{n}")
+               for n in range(1, boilerplate.MIN_PAGES)]
+    page = _page(99)
+    removed.append(learner.learn_and_strip(page, "news.example", "https://news.example/99"))
+
+    # The page that reaches MIN_PAGES is already stripped: nav, promo block and footer
+    assert removed == [0] * (boilerplate.MIN_PAGES - 1) + [3]
+    assert page.find("nav") is None and page.find("footer") is None
+    assert page.find("article").get_text() == "Story 99Body of story number 99."
+    # Structural tags stay, and other domains have learned nothing
+    assert page.find("body") is not None
+    assert learner.boilerplate("other.example") == set()
+
+
+def test_a_url_is_counted_once():
+    learner = boilerplate.BoilerplateLearner(path=None)
+
+    for _ in range(boilerplate.MIN_PAGES + 1):
+        learner.learn_and_strip(_page(1), "news.example", "https://news.example/1")
+
+    assert learner.boilerplate("news.example") == set()
+    assert learner._domains["news.example"].pages == 1
+
+
+def _template_fingerprints():
+    fingerprints = boilerplate.fingerprint_tree(_page(0))
+    return {fp for fp, element in fingerprints.values() if element.name in ("nav", "a", "div", "footer")}
+
+
+def _observe(learner, numbers):
+    for n in numbers:
+        soup = _page(n)
+        learner.observe("news.example", f"https://news.example/{n}",
+                        boilerplate.page_fingerprints(boilerplate.fingerprint_tree(soup)))
+
+
+def test_saves_of_several_processes_are_merged(tmp_path, monkeypatch):
+    monkeypatch.setattr(boilerplate, "SAVE_EVERY_PAGES", 100)
+    path = str(tmp_path / "boilerplate.json")
+    first = boilerplate.BoilerplateLearner(path)
+    second = boilerplate.BoilerplateLearner(path)
+
+    _observe(first, [1, 2])
+    _observe(second, [2, 3])
+    first.save()
+    second.save()
+
+    merged = boilerplate.BoilerplateLearner(path)
+    assert merged._domains["news.example"].pages == 3
+    assert merged.boilerplate("news.example") == _template_fingerprints()
+    # The last one to save also picked up what the other learned
+    assert second._domains["news.example"].pages == 3
+
+
+def test_observe_saves_in_the_background(tmp_path, monkeypatch):
+    monkeypatch.setattr(boilerplate, "SAVE_EVERY_PAGES", 2)
+    learner = boilerplate.BoilerplateLearner(str(tmp_path / "boilerplate.json"))
+    saved = threading.Event()
+    saving_threads = []
+
+    def save():
+        saving_threads.append(threading.current_thread())
+        saved.set()
+
+    monkeypatch.setattr(learner, "save", save)
+    _observe(learner, [1])
+    assert not saved.is_set()
+    _observe(learner, [2])
+
+    assert saved.wait(5)
+    assert saving_threads[0] is not threading.current_thread()
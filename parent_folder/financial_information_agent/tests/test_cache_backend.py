@@ -0,0 +1,127 @@
+import pandas as pd
+import pytest
+
+from services import cache_backend
+from services.cache_backend import MISSING
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_backend, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path, clock):
+    if request.param == "sqlite":
+        return cache_backend.SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    return cache_backend.MemoryBackend()
+
+
+def test_values_round_trip(backend):
+    frame = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.to_datetime(["2026-01-05", "2026-01-06"]))
+    backend.set("frame", frame, 60)
+    backend.set("none", None, 60)
+    backend.set("large", "x" * 10_000, 60)
+
+    pd.testing.assert_frame_equal(backend.get("frame"), frame)
+    assert backend.get("none") is None
+    assert backend.get("large") == "x" * 10_000
+    assert backend.get("absent") is MISSING
+
+
+def test_overwrite_delete_and_clear(backend):
+    backend.set("a", 1, 60)
+    backend.set("a", 2, 60)
+    backend.set("b", 3, 60)
+    assert backend.get("a") == 2
+
+    backend.delete("a")
+    assert backend.get("a") is MISSING
+    assert backend.get("b") == 3
+
+    backend.clear()
+    assert backend.get("b") is MISSING
+
+
+def test_entries_expire_after_their_ttl(backend, clock):
+    backend.set("short", "value", 10)
+    backend.set("long", "value", 100)
+
+    clock.now += 9
+    assert backend.get("short") == "value"
+    clock.now += 1
+    assert backend.get("short") is MISSING
+    assert backend.get("long") == "value"
+
+
+def test_large_values_are_compressed():
+    blob = cache_backend.serialize("abc" * 1000)
+
+    assert blob[:1] == cache_backend._COMPRESSED
+    assert cache_backend.deserialize(blob) == "abc" * 1000
+    assert cache_backend.serialize("abc")[:1] == cache_backend._RAW
+
+
+def test_memory_backend_evicts_least_recently_used_beyond_its_budget(clock):
+    size = len(cache_backend.serialize("x" * 100))
+    backend = cache_backend.MemoryBackend(max_bytes=3 * size)
+    for key in ("a", "b", "c"):
+        backend.set(key, "x" * 100, 60)
+    backend.get("a")
+
+    backend.set("d", "x" * 100, 60)
+
+    assert backend.get("b") is MISSING
+    assert [backend.get(key) is MISSING for key in ("a", "c", "d")] == [False] * 3
+
+
+def test_sqlite_eviction_purges_expired_rows_then_least_recently_used(tmp_path, clock):
+    size = len(cache_backend.serialize("x" * 100))
+    backend = cache_backend.SQLiteBackend(str(tmp_path / "cache.sqlite3"), max_bytes=3 * size)
+    backend.set("expired", "x" * 100, 5)
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        backend.set(key, "x" * 100, 3600)
+    # Reads refresh the access time only after TOUCH_INTERVAL_SECONDS
+    clock.now += backend.TOUCH_INTERVAL_SECONDS + 1
+    backend.get("a")
+    clock.now += 1
+    backend.set("d", "x" * 100, 3600)
+
+    backend.evict()
+
+    # Still over budget after the purge: evicted down to 90% of it, oldest access first
+    rows = dict(backend._connection().execute("SELECT key, size FROM cache").fetchall())
+    assert sorted(rows) == ["a", "d"]
+    assert backend.get("b") is MISSING and backend.get("expired") is MISSING
+
+
+def test_sqlite_file_is_shared_between_backends(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = cache_backend.SQLiteBackend(path)
+    reader = cache_backend.SQLiteBackend(path)
+
+    writer.set("AAPL:info", {"longName": "Apple Inc."}, 60)
+
+    assert reader.get("AAPL:info") == {"longName": "Apple Inc."}
+
+
+def test_create_backend_by_name(tmp_path, monkeypatch):
+    monkeypatch.setenv("MARKET_DATA_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("MARKET_DATA_CACHE_MAX_MB", "1")
+
+    assert isinstance(cache_backend.create_backend("none"), cache_backend.NullBackend)
+    assert cache_backend.create_backend("none").get("a") is MISSING
+    sqlite = cache_backend.create_backend("sqlite")
+    assert isinstance(sqlite, cache_backend.SQLiteBackend) and sqlite.max_bytes == 2 ** 20
+    assert isinstance(cache_backend.create_backend("memory"), cache_backend.MemoryBackend)
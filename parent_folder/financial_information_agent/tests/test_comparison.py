@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import comparison, data_access, deadline, statements, symbol_registry
+
+INFO = {
+    "AAA": {"longName": "Aaa", "currentPrice": 110.0, "previousClose": 100.0, "trailingPE": 20.0},
+    "BBB": {"longName": "Bbb", "currentPrice": 50.0, "previousClose": 50.0, "trailingPE": 10.0},
+}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    def info(symbol):
+        if symbol == "ZZQX":
+            raise symbol_registry.InvalidSymbolError(symbol, "not found upstream")
+        if symbol == "SLOW":
+            raise deadline.DeadlineExceeded("loading ticker:SLOW:info")
+        return INFO[symbol]
+
+    def history(symbols, period):
+        dates = pd.bdate_range("2026-01-05", periods=30)
+        return pd.DataFrame({s: np.linspace(100, 130 if s == "AAA" else 90, 30) if s in INFO else np.nan
+                             for s in symbols}, index=dates)
+
+    monkeypatch.setattr(data_access, "get_ticker_info", info)
+    monkeypatch.setattr(data_access, "get_price_history", history)
+    monkeypatch.setattr(statements, "get_statement_ratios", lambda symbol: pd.DataFrame())
+
+
+def test_failed_symbols_get_none_metrics_and_an_error(upstream):
+    result = comparison.compare(["AAA", "ZZQX", "BBB", "SLOW"])
+
+    assert result["symbols"] == ["AAA", "ZZQX", "BBB", "SLOW"]
+    assert result["metrics"]["price"] == [110.0, None, 50.0, None]
+    assert result["metrics"]["pe_ratio"] == [20.0, None, 10.0, None]
+    assert result["metrics"]["company_name"] == ["Aaa", None, "Bbb", None]
+    assert result["partial"] is True
+    assert set(result["errors"]) == {"ZZQX", "SLOW"}
+    assert result["returns"]["total_return"][0] == pytest.approx(0.3)
+    assert result["returns"]["total_return"][2] == pytest.approx(-0.1)
+
+
+def test_a_complete_comparison_has_no_errors(upstream):
+    result = comparison.compare(["AAA", "BBB"])
+    assert "errors" not in result and "partial" not in result
+    assert result["metrics"]["change_percent"] == [pytest.approx(10.0), 0.0]
+
+
+def test_comparison_fails_when_no_symbol_loads(upstream):
+    with pytest.raises(ValueError):
+        comparison.compare(["ZZQX", "SLOW"])
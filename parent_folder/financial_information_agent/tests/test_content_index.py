@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from services import content_index
+
+NOW = time.time()
+
+
+@pytest.fixture
+def index():
+    index = content_index.ContentIndex(":memory:")
+    index.add("https://news.example/nvda-earnings", "Nvidia earnings beat. Earnings rose on data center "
+              "demand, and earnings guidance was raised again.", title="Nvidia earnings", fetched_at=NOW - 3600)
+    index.add("https://news.example/apple-dividend", "Apple raised its dividend and mentioned earnings once.",
+              title="Apple dividend", fetched_at=NOW - 2 * 86400)
+    index.add("https://news.example/tesla-deliveries", "Tesla deliveries fell short of estimates.",
+              title="Tesla deliveries", fetched_at=NOW - 10 * 86400)
+    yield index
+    index.close()
+
+
+def _urls(results):
+    return [result["url"].rsplit('/', 1)[1] for result in results]
+
+
+def test_results_are_ranked_by_bm25(index):
+    results = index.search("earnings")
+
+    assert _urls(results) == ["nvda-earnings", "apple-dividend"]
+    assert "earnings" in results[0]["snippet"].lower()
+
+
+def test_title_matches_outrank_body_matches(index):
+    index.add("https://news.example/body-only", "Analysts discussed the dividend at length, the dividend "
+              "policy and a special dividend.", title="Market wrap", fetched_at=NOW)
+
+    assert _urls(index.search("dividend"))[0] == "apple-dividend"
+
+
+def test_query_terms_are_stemmed_and_any_term_matches(index):
+    assert _urls(index.search("delivery")) == ["tesla-deliveries"]
+    assert set(_urls(index.search("dividends deliveries"))) == {"apple-dividend", "tesla-deliveries"}
+    # FTS5 syntax in the query is treated as plain terms
+    assert _urls(index.search('tesla" OR title:*')) == ["tesla-deliveries"]
+
+
+def test_symbol_and_since_filters(index):
+    assert _urls(index.search("earnings", symbol="AAPL")) == ["apple-dividend"]
+    assert _urls(index.search("earnings", symbol="Nvidia")) == ["nvda-earnings"]
+    assert _urls(index.search("earnings", since="1d")) == ["nvda-earnings"]
+    assert index.search("deliveries", since="7d") == []
+
+
+def test_empty_query_lists_newest_first(index):
+    results = index.search("", limit=2)
+
+    assert _urls(results) == ["nvda-earnings", "apple-dividend"]
+    assert results[0]["symbols"] == ["NVDA"]
+
+
+def test_re_adding_a_url_replaces_its_text(index):
+    index.add("https://news.example/tesla-deliveries", "Tesla deliveries beat estimates.",
+              title="Tesla deliveries", fetched_at=NOW)
+
+    assert index.count() == 3
+    assert "beat" in index.search("deliveries")[0]["snippet"]
+    assert index.search("short") == []
+
+
+def test_parse_since():
+    assert content_index.parse_since("") == 0.0
+    assert content_index.parse_since(1700000000) == 1700000000.0
+    assert content_index.parse_since("2d") == pytest.approx(time.time() - 2 * 86400, abs=5)
+    with pytest.raises(ValueError):
+        content_index.parse_since("last week")
@@ -0,0 +1,109 @@
+import functools
+import http.server
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from scraper import boilerplate, crawl_pipeline, scraper
+
+ARTICLE = "<html><head><title>{title}</title></head><body><article><h1>{title}</h1><p>{body}</p>{links}</article></body></html>"
+
+
+def _write(directory, name, title, links=()):
+    body = f"{title} reported quarterly results that beat expectations. " * 10
+    anchors = ''.join(f'<a href="{link}">{link}</a>' for link in links)
+    (directory / name).write_text(ARTICLE.format(title=title, body=body, links=anchors), encoding='utf-8')
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    root = tmp_path / "site"
+    root.mkdir()
+    _write(root, "index.html", "Front Page", ["a.html", "b.html#comments", "https://elsewhere.example/x"])
+    _write(root, "a.html", "Story A")
+    _write(root, "b.html", "Story B", ["index.html"])
+
+    handler = functools.partial(_QuietHandler, directory=str(root))
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    monkeypatch.setattr(scraper, "check_robots_txt", lambda url: True)
+    monkeypatch.setattr(boilerplate, "_learner", boilerplate.BoilerplateLearner(path=None))
+    monkeypatch.delenv("SCRAPER_RENDERING", raising=False)
+    yield root, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _pipeline(base, data_dir, seeds=None, **kwargs):
+    documents = []
+    pipeline = crawl_pipeline.CrawlPipeline(
+        [f"{base}/index.html"] if seeds is None else seeds, data_dir=str(data_dir), max_depth=1,
+        fetch_workers=2, clean_workers=2, request_timeout=5, sinks=[documents.append], **kwargs)
+    return pipeline, documents
+
+
+def test_extract_links_are_absolute_without_fragments_or_duplicates():
+    html = '<a href="/a">A</a><a href="/a#top">A</a><a href="b.html">B</a><a href="mailto:x@y.z">M</a>'
+
+    assert crawl_pipeline.extract_links(html, "https://news.example/dir/page.html") == [
+        "https://news.example/a", "https://news.example/dir/b.html"]
+
+
+def test_crawl_stores_same_site_pages_up_to_max_depth(site, tmp_path):
+    _, base = site
+    pipeline, documents = _pipeline(base, tmp_path / "data")
+
+    stats = pipeline.run()
+
+    assert stats["stored"] == 3 and stats["failed"] == 0
+    assert sorted(d["title"] for d in documents) == ["Front Page", "Story A", "Story B"]
+    front = next(d for d in documents if d["title"] == "Front Page")
+    assert f"{base}/b.html" in front["links"] and "https://elsewhere.example/x" in front["links"]
+    assert "quarterly results" in front["text"]
+    assert len(os.listdir(tmp_path / "data" / "pages")) == 3
+
+
+def test_crawl_state_round_trip_skips_unchanged_pages(site, tmp_path):
+    root, base = site
+    first, _ = _pipeline(base, tmp_path / "data")
+    first.run()
+    with open(tmp_path / "data" / "crawl_state.json", encoding='utf-8') as file:
+        saved = json.load(file)
+    assert saved["pending"] == {}
+    assert saved["pages"][f"{base}/index.html"]["last_modified"]
+
+    # A new pipeline loads the state: conditional requests, links from the saved state
+    second, documents = _pipeline(base, tmp_path / "data")
+    assert second.state.pages == saved["pages"]
+    stats = second.run()
+    assert stats["not_modified"] == 3 and stats["stored"] == 0 and documents == []
+
+    # A page served again with the same text is fetched but not stored again
+    modified = time.time() + 3600
+    os.utime(root / "a.html", (modified, modified))
+    third, documents = _pipeline(base, tmp_path / "data")
+    stats = third.run()
+    assert stats["fetched"] == 1 and stats["unchanged"] == 1 and documents == []
+
+
+def test_an_interrupted_crawl_resumes_its_pending_urls(site, tmp_path):
+    _, base = site
+    state = crawl_pipeline.CrawlState(str(tmp_path / "data" / "crawl_state.json"))
+    state.add_pending(f"{base}/a.html", 1)
+    state.save()
+
+    pipeline, documents = _pipeline(base, tmp_path / "data", seeds=[])
+    stats = pipeline.run()
+
+    assert stats["stored"] == 1
+    assert [d["title"] for d in documents] == ["Story A"]
+    assert crawl_pipeline.CrawlState(pipeline.state.path).pending == {}
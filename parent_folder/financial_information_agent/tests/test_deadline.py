@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+from services import deadline
+from services.single_flight import SingleFlight
+
+
+def _hung(release: threading.Event, started: list):
+    def load():
+        started.append(1)
+        release.wait(10)
+        return "late"
+    return load
+
+
+def test_hung_loads_do_not_starve_later_calls():
+    flight, release, started = SingleFlight(), threading.Event(), []
+    try:
+        # Far more hung loads than any pool would hold
+        for key in range(64):
+            with deadline.budget(0.02):
+                with pytest.raises(deadline.DeadlineExceeded):
+                    deadline.coalesce(flight, key, _hung(release, started), f"loading {key}")
+        assert flight.in_flight() == 64
+
+        # A fresh budget gets a fresh load answered at once
+        started_at = time.monotonic()
+        with deadline.budget(1.0):
+            assert deadline.coalesce(flight, "fresh", lambda: "ok") == "ok"
+            assert deadline.call(lambda: "ok") == "ok"
+        assert time.monotonic() - started_at < 0.5
+    finally:
+        release.set()
+
+    # The hung loads end on their own and free their keys
+    for _ in range(100):
+        if flight.in_flight() == 0:
+            break
+        time.sleep(0.01)
+    assert flight.in_flight() == 0
+
+
+def test_waiters_share_one_load_and_give_up_on_their_own_budget():
+    flight, release, started = SingleFlight(), threading.Event(), []
+    errors = []
+
+    def caller(budget):
+        with deadline.budget(budget):
+            try:
+                deadline.coalesce(flight, "key", _hung(release, started))
+            except deadline.DeadlineExceeded as e:
+                errors.append(e)
+
+    try:
+        threads = [threading.Thread(target=caller, args=(0.05,)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(2)
+        assert len(errors) == 10
+        assert len(started) == 1
+    finally:
+        release.set()
+
+    # Once the upstream call returns, callers get its result again
+    with deadline.budget(1.0):
+        assert deadline.coalesce(flight, "key", _hung(release, started)) == "late"
+
+
+def test_without_a_deadline_calls_run_inline():
+    flight = SingleFlight()
+    caller = threading.get_ident()
+    assert deadline.coalesce(flight, "key", threading.get_ident) == caller
+
+
+def test_background_load_runs_without_the_callers_deadline():
+    seen = []
+    with deadline.budget(1.0):
+        deadline.call(lambda: seen.append(deadline.remaining()))
+    assert seen == [None]
+
+
+def test_concurrent_gathers_do_not_queue_behind_each_other():
+    outcomes = []
+
+    def session():
+        with deadline.budget(1.0):
+            parts = {f"part{i}": (lambda: time.sleep(0.2) or "done") for i in range(5)}
+            outcomes.append(deadline.gather(parts, "collecting a report"))
+
+    # 10 sessions x 5 parts: more parts than a shared pool of 16 would run at once
+    threads = [threading.Thread(target=session) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(outcomes) == 10
+    assert all(not missing and len(results) == 5 for results, missing in outcomes)
+
+
+def test_gather_reports_parts_that_miss_the_deadline():
+    with deadline.budget(0.1):
+        results, missing = deadline.gather({"fast": lambda: 1, "slow": lambda: time.sleep(0.5)})
+    assert results == {"fast": 1}
+    assert missing == ["slow"]
+
+
+def test_turn_deadline_is_removed_when_the_turn_ends():
+    deadline.start_turn(None)
+    assert deadline.remaining() is not None
+    deadline.end_turn(None)
+    assert deadline.remaining() is None
+
+
+def test_a_failed_turn_does_not_leak_its_deadline_into_the_next():
+    deadline.start_turn(None)  # this turn fails: end_turn never runs
+    deadline.start_turn(None)
+    deadline.end_turn(None)
+    assert deadline.remaining() is None
@@ -0,0 +1,64 @@
+import pytest
+
+from services import entity_tagger
+
+
+@pytest.fixture(scope="module")
+def tagger():
+    return entity_tagger.EntityTagger(entity_tagger.DEFAULT_SYMBOLS)
+
+
+def _mentions(tagger, text):
+    return [(text[start:end], symbol) for start, end, symbol in tagger.find(text)]
+
+
+def test_overlapping_aliases_keep_the_leftmost_longest_match():
+    tagger = entity_tagger.EntityTagger([
+        ("BAC", "Bank of America", ()),
+        ("AMER", "America Holdings", ("America",)),
+        ("TXN", "Texas Instruments", ()),
+        ("INST", "Instruments Ltd", ("Instruments",)),
+    ])
+
+    assert _mentions(tagger, "Bank of America beat America.") == [
+        ("Bank of America", "BAC"), ("America", "AMER")]
+    # "Instruments" is a suffix of a longer pattern, found through a failure link
+    assert _mentions(tagger, "Texas Instruments and Instruments") == [
+        ("Texas Instruments", "TXN"), ("Instruments", "INST")]
+    assert _mentions(tagger, "Texas Instrumentation") == []
+
+
+def test_longer_alias_wins_over_its_prefix(tagger):
+    assert _mentions(tagger, "Goldman Sachs and JPMorgan Chase reported") == [
+        ("Goldman Sachs", "GS"), ("JPMorgan Chase", "JPM")]
+    assert _mentions(tagger, "Goldman said") == [("Goldman", "GS")]
+
+
+def test_matches_respect_word_boundaries(tagger):
+    assert tagger.tag("Applesauce, Pineapple and Metaverse stocks") == []
+    assert tagger.tag("Apple's results lifted Intel-based PCs") == ["AAPL", "INTC"]
+    assert tagger.tag("INTCX is a fund, INTC is a stock") == ["INTC"]
+
+
+def test_names_fold_case_but_must_start_capitalized(tagger):
+    assert tagger.tag("APPLE and Apple and Nvidia and NVIDIA") == ["AAPL", "NVDA"]
+    assert tagger.tag("an apple pie and a visa application") == []
+
+
+def test_tickers_must_be_upper_case_and_ambiguous_ones_need_a_dollar(tagger):
+    assert tagger.tag("aapl and tsla") == []
+    assert tagger.tag("AAPL and TSLA rallied") == ["AAPL", "TSLA"]
+    assert tagger.tag("Shares are LOW NOW") == []
+    assert tagger.tag("$NOW and $LOW rose, $now did not") == ["NOW", "LOW"]
+    assert tagger.tag("F fell but $F rose") == ["F"]
+    assert tagger.tag("BRK.B and BRK-B") == ["BRK-B"]
+
+
+def test_resolve_names_and_symbols(tagger):
+    assert tagger.resolve("Apple Inc.") == "AAPL"
+    assert tagger.resolve("alphabet") == "GOOGL"
+    assert tagger.resolve("$msft") == "MSFT"
+    assert tagger.resolve("brk.b") == "BRK-B"
+    assert tagger.resolve("What about Tesla today?") == "TSLA"
+    assert tagger.resolve("Unknown Widgets Co") is None
+    assert tagger.resolve("  ") is None
@@ -0,0 +1,101 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import data_access, indicators, live_quotes
+
+
+def _bars(count: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    spread = np.abs(rng.normal(0, 0.5, count))
+    return pd.DataFrame({"High": close + spread, "Low": close - spread, "Close": close},
+                        index=pd.bdate_range("2025-01-02", periods=count))
+
+
+def _assert_same(values: dict, expected: dict):
+    assert values.keys() == expected.keys()
+    for name, value in expected.items():
+        if value is None:
+            assert values[name] is None, name
+        else:
+            assert values[name] == pytest.approx(value, rel=1e-9, abs=1e-9), name
+
+
+@pytest.mark.parametrize("initial", [2, 15, 30, 250])
+def test_incremental_updates_match_the_vectorized_build(initial):
+    bars = _bars(300)
+    vectorized = indicators.IndicatorSet("AAA", "1d")
+    vectorized.initialize(bars)
+
+    incremental = indicators.IndicatorSet("AAA", "1d")
+    incremental.initialize(bars.iloc[:initial])
+    assert incremental.extend(bars.iloc[initial - 2:])
+
+    assert incremental.bar_count == vectorized.bar_count
+    assert incremental.last_timestamp == vectorized.last_timestamp
+    _assert_same(incremental.committed, vectorized.committed)
+    _assert_same(incremental.values(), vectorized.values())
+
+
+def test_peek_matches_committing_the_forming_bar():
+    bars = _bars(120)
+    peeked = indicators.IndicatorSet("AAA", "1d")
+    peeked.initialize(bars)
+    expected = indicators.IndicatorSet("AAA", "1d")
+    expected.initialize(pd.concat([bars, bars.iloc[-1:].shift(1, freq="B")]))
+
+    _assert_same(peeked.values(), expected.committed)
+    # Peeking does not change the committed state
+    _assert_same(peeked.values(), expected.committed)
+
+
+def test_extend_asks_for_a_rebuild_when_history_was_readjusted():
+    bars = _bars(60)
+    indicator_set = indicators.IndicatorSet("AAA", "1d")
+    indicator_set.initialize(bars.iloc[:40])
+
+    adjusted = bars.copy()
+    adjusted[["High", "Low", "Close"]] *= 0.5
+    assert not indicator_set.extend(adjusted.iloc[30:])
+    assert not indicator_set.extend(bars.iloc[45:])
+
+
+def test_downloads_do_not_hold_the_set_lock(monkeypatch):
+    bars = _bars(80)
+    downloading = threading.Event()
+    release = threading.Event()
+
+    def get_price_bars(symbol, period, interval):
+        downloading.set()
+        release.wait(5)
+        return bars
+
+    monkeypatch.setattr(data_access, "get_price_bars", get_price_bars)
+    monkeypatch.setattr(live_quotes, "get_service", lambda: None)
+    monkeypatch.setattr(indicators, "_sets", type(indicators._sets)())
+
+    worker = threading.Thread(target=indicators.get_indicators, args=("AAA", "1d"))
+    worker.start()
+    try:
+        assert downloading.wait(5)
+        indicator_set = indicators._sets[("AAA", "1d")]
+        assert indicator_set.lock.acquire(timeout=1)
+        indicator_set.lock.release()
+    finally:
+        release.set()
+        worker.join(5)
+
+
+def test_indicator_sets_are_bounded(monkeypatch):
+    monkeypatch.setattr(indicators, "MAX_SETS", 2)
+    monkeypatch.setattr(indicators, "_sets", type(indicators._sets)())
+
+    first = indicators._indicator_set("AAA", "1d")
+    indicators._indicator_set("BBB", "1d")
+    assert indicators._indicator_set("AAA", "1d") is first
+    indicators._indicator_set("CCC", "1d")
+
+    assert list(indicators._sets) == [("AAA", "1d"), ("CCC", "1d")]
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from services import live_quotes, market_calendar
+from services.live_quotes import LiveQuoteService, MockFeed, QuoteTable, Tick
+
+
+@pytest.fixture
+def market_open(monkeypatch):
+    monkeypatch.setattr(market_calendar, "unchanged_since", lambda symbol, timestamp, at=None: False)
+
+
+def _ticks(seed: int, rounds: int) -> list:
+    service = LiveQuoteService(MockFeed(seed=seed))
+    service.subscribe(["aapl", "MSFT"])
+    prices = []
+    for _ in range(rounds):
+        service.feed.tick(service)
+        prices.append({s: service.latest(s).price for s in ("AAPL", "MSFT")})
+    return prices
+
+
+def test_mock_feed_is_reproducible_with_a_seed(market_open):
+    first, second = _ticks(seed=3, rounds=5), _ticks(seed=3, rounds=5)
+    assert first == second
+    assert first != _ticks(seed=4, rounds=5)
+    # A random walk: every round moves the price a little from the start price
+    assert len({round(p["AAPL"], 4) for p in first}) == 5
+    assert all(abs(p["AAPL"] / first[0]["AAPL"] - 1) < 0.05 for p in first)
+
+
+def test_mock_ticks_fill_the_table(market_open):
+    service = LiveQuoteService(MockFeed(seed=1))
+    service.subscribe(["AAPL"])
+    service.feed.tick(service)
+    tick = service.latest("aapl")
+    assert tick.source == "mock" and tick.currency == "USD"
+    assert tick.previous_close == MockFeed()._start_price("AAPL")
+    assert service.latest("MSFT") is None
+
+
+def test_partial_ticks_keep_the_fields_they_do_not_carry(market_open):
+    table = QuoteTable()
+    table.update(Tick("AAPL", 100.0, previous_close=98.0, day_volume=1_000, currency="USD", name="Apple"))
+    table.update(Tick("AAPL", 101.0, day_volume=1_500))
+    tick = table.get("AAPL")
+    assert (tick.price, tick.previous_close, tick.day_volume, tick.name) == (101.0, 98.0, 1_500, "Apple")
+
+
+def test_ticks_expire_after_the_max_age_while_the_market_trades(market_open):
+    table = QuoteTable()
+    table.update(Tick("AAPL", 100.0, timestamp=time.time() - 90))
+    assert table.get("AAPL") is None
+    assert table.get("AAPL", max_age_seconds=120).price == 100.0
+
+
+def test_ticks_taken_after_the_close_are_served_until_the_open(monkeypatch):
+    monkeypatch.setattr(market_calendar, "unchanged_since", lambda symbol, timestamp, at=None: True)
+    table = QuoteTable()
+    table.update(Tick("AAPL", 100.0, timestamp=time.time() - 3600))
+    assert table.get("AAPL").price == 100.0
+    assert table.current("AAPL")
+
+
+def test_cached_quotes_are_not_published_as_live_ticks(market_open, monkeypatch):
+    import api_functions
+    from services import data_access
+
+    service = LiveQuoteService(MockFeed(seed=1))
+    monkeypatch.setattr(live_quotes, "get_service", lambda: service)
+    monkeypatch.setattr(data_access, "get_quote", lambda symbol: {"currentPrice": 100.0, "previousClose": 99.0})
+    assert api_functions.get_realtime_stock_price("AAPL")["price"] == 100.0
+    assert service.latest("AAPL") is None
+    assert service.subscriptions() == {"AAPL"}
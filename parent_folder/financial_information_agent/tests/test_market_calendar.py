@@ -0,0 +1,83 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from services import market_calendar
+from services.market_calendar import CALENDARS
+
+NEW_YORK = ZoneInfo("America/New_York")
+UTC = ZoneInfo("UTC")
+
+
+def _at(year, month, day, hour, minute=0, tz=NEW_YORK) -> float:
+    return datetime(year, month, day, hour, minute, tzinfo=tz).timestamp()
+
+
+@pytest.mark.parametrize("code, day, trading", [
+    # Juneteenth on a Saturday is observed on the Friday
+    ("XNYS", date(2027, 6, 18), False),
+    # Christmas on a Saturday: New York closes on the Friday...
+    ("XNYS", date(2027, 12, 24), False),
+    ("XNYS", date(2027, 12, 27), True),
+    # ...but does not close for a New Year's Day that falls on a Saturday
+    ("XNYS", date(2027, 12, 31), True),
+    # London and Toronto move Christmas and Boxing Day to the Monday and Tuesday
+    ("XLON", date(2027, 12, 24), True),
+    ("XLON", date(2027, 12, 27), False),
+    ("XLON", date(2027, 12, 28), False),
+    ("XTSE", date(2027, 12, 27), False),
+    ("XTSE", date(2027, 12, 28), False),
+    ("XTSE", date(2027, 12, 29), True),
+    ("XNYS", date(2026, 11, 26), False),
+    ("XNYS", date(2026, 11, 27), True),
+])
+def test_trading_days(code, day, trading):
+    assert CALENDARS[code].is_trading_day(day) is trading
+
+
+def test_day_after_thanksgiving_closes_at_one():
+    calendar = CALENDARS["XNYS"]
+    assert calendar.session(date(2026, 11, 27))[1] == datetime(2026, 11, 27, 13, 0, tzinfo=NEW_YORK)
+    assert calendar.is_open(_at(2026, 11, 27, 12, 59))
+    assert not calendar.is_open(_at(2026, 11, 27, 13, 0))
+    assert calendar.last_close(_at(2026, 11, 27, 15, 0)) == datetime(2026, 11, 27, 13, 0, tzinfo=NEW_YORK)
+    assert calendar.next_open(_at(2026, 11, 27, 15, 0)) == datetime(2026, 11, 30, 9, 30, tzinfo=NEW_YORK)
+
+
+@pytest.mark.parametrize("day", [date(2027, 12, 24), date(2027, 12, 31)])
+def test_london_closes_at_half_past_twelve_before_christmas_and_new_year(day):
+    london = ZoneInfo("Europe/London")
+    assert CALENDARS["XLON"].session(day)[1] == datetime(day.year, day.month, day.day, 12, 30, tzinfo=london)
+
+
+@pytest.mark.parametrize("symbol, at, is_open", [
+    # Currencies trade from Sunday 17:00 to Friday 17:00 New York time, overnight included
+    ("EURUSD=X", _at(2026, 10, 18, 16, 59), False),   # Sunday
+    ("EURUSD=X", _at(2026, 10, 18, 17, 0), True),
+    ("EURUSD=X", _at(2026, 10, 21, 23, 30), True),    # Wednesday night
+    ("EURUSD=X", _at(2026, 10, 22, 3, 0), True),      # Thursday before dawn
+    ("EURUSD=X", _at(2026, 10, 23, 16, 59), True),    # Friday
+    ("EURUSD=X", _at(2026, 10, 23, 17, 0), False),
+    ("EURUSD=X", _at(2026, 10, 24, 12, 0), False),    # Saturday
+    ("CL=F", _at(2026, 10, 20, 2, 0), True),
+    # Crypto never closes
+    ("BTC-USD", _at(2026, 10, 24, 12, 0), True),
+    ("BTC-USD", _at(2026, 10, 25, 0, 0, tz=UTC), True),
+    ("ETH-USD", _at(2026, 12, 25, 0, 0), True),
+])
+def test_overnight_sessions_are_open(symbol, at, is_open):
+    assert market_calendar.is_open(symbol, at) is is_open
+
+
+@pytest.mark.parametrize("symbol, at, expected", [
+    # Open, and still settling after Friday's close: the normal TTL
+    ("EURUSD=X", _at(2026, 10, 21, 23, 30), 60),
+    ("EURUSD=X", _at(2026, 10, 23, 17, 10), 60),
+    # Settled on Saturday at noon: until the Sunday 17:00 open
+    ("EURUSD=X", _at(2026, 10, 24, 12, 0), 29 * 3600),
+    ("EURUSD=X", _at(2026, 10, 23, 17, 15), 48 * 3600 - 15 * 60),
+    ("BTC-USD", _at(2026, 10, 24, 12, 0), 60),
+])
+def test_ttl_of_overnight_sessions(symbol, at, expected):
+    assert market_calendar.ttl(symbol, 60, at) == pytest.approx(expected)
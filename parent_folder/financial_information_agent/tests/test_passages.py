@@ -0,0 +1,88 @@
+import pytest
+
+from scraper import passages
+
+
+def test_tokenize_drops_stopwords_and_stems():
+    assert passages.tokenize("The company's earnings and the companies' revenues") == [
+        "company", "earning", "company", "revenue"]
+
+
+def test_bm25_ranks_by_term_frequency_and_rarity():
+    documents = [passages.tokenize(text) for text in (
+        "revenue grew while margins held",
+        "revenue revenue revenue guidance",
+        "dividend raised again",
+        "revenue dividend",
+    )]
+
+    scores = passages.bm25_scores({"revenue": 1, "dividend": 1}, documents)
+
+    # A rarer term (dividend: 2 documents) counts as much as the more common one (revenue: 3)
+    assert scores[3] > scores[1] > scores[0] > 0
+    assert scores[2] > scores[0]
+
+
+def test_bm25_gives_equal_documents_equal_scores():
+    documents = [passages.tokenize("free cash flow rose"), passages.tokenize("guidance cut"),
+                 passages.tokenize("free cash flow rose")]
+
+    scores = passages.bm25_scores({"cash": 1}, documents)
+
+    assert scores[0] == scores[2] > 0
+    assert scores[1] == 0
+
+
+def test_bm25_empty_query_or_corpus():
+    assert passages.bm25_scores({}, [["revenue"], ["dividend"]]) == [0.0, 0.0]
+    assert passages.bm25_scores({"revenue": 1}, []) == []
+
+
+def _page():
+    # Four passages of PASSAGE_WORDS words (six-word sentences)
+    return "\n".join([
+        "Intro sentence about the weather today. " * 20,
+        "Apple reported record revenue this quarter. Revenue rose on strong iPhone sales. " * 10,
+        "The dividend was kept unchanged today. " * 20,
+        "Analysts said revenue guidance looked cautious. " * 20,
+    ])
+
+
+def test_rank_passages_returns_best_first_with_positions():
+    result = passages.rank_passages(_page(), "revenue this quarter", top_k=2)
+
+    assert result["matched"]
+    assert result["total_passages"] == 4
+    assert [p["position"] for p in result["passages"]] == [1, 3]
+    assert result["passages"][0]["score"] > result["passages"][1]["score"] > 0
+
+
+def test_rank_passages_breaks_ties_by_page_order():
+    text = "\n".join(["Revenue rose. " + "Filler words here. " * 40] * 3)
+
+    result = passages.rank_passages(text, "revenue")
+
+    scores = {p["score"] for p in result["passages"]}
+    assert len(scores) == 1
+    assert [p["position"] for p in result["passages"]] == [0, 1, 2]
+
+
+def test_boost_terms_only_break_ties():
+    text = "\n".join([
+        "Revenue rose at Microsoft. " + "Filler words here. " * 40,
+        "Revenue rose at Apple. " + "Filler words here. " * 40,
+        "Apple opened a store. " + "Filler words here. " * 40,
+    ])
+
+    result = passages.rank_passages(text, "revenue", boost_terms=["Apple"])
+
+    assert [p["position"] for p in result["passages"]] == [1, 0, 2]
+
+
+@pytest.mark.parametrize("query", ["", "the of and", "semiconductor"])
+def test_query_without_matching_terms_returns_the_first_passages(query):
+    result = passages.rank_passages(_page(), query, top_k=2)
+
+    assert not result["matched"]
+    assert [p["position"] for p in result["passages"]] == [0, 1]
+    assert all(p["score"] == 0 for p in result["passages"])
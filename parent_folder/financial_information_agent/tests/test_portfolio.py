@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import data_access, portfolio
+from services.comparison import TRADING_DAYS_PER_YEAR
+
+SYMBOLS = ["AAA", "BBB", "CCC"]
+WEIGHTS = np.array([0.5, 0.3, 0.2])
+
+
+def _synthetic_returns(days: int = 250) -> pd.DataFrame:
+    """Daily returns of three holdings with known betas (1.5, 0.5, 0) plus noise, and the benchmark."""
+    rng = np.random.default_rng(7)
+    market = rng.normal(0.0004, 0.01, days)
+    noise = rng.normal(0, 0.005, (days, 3))
+    holdings = np.outer(market, [1.5, 0.5, 0.0]) + noise
+    dates = pd.bdate_range("2025-01-02", periods=days + 1)
+    return pd.DataFrame(np.column_stack([holdings, market]), index=dates[1:], columns=SYMBOLS + ["SPY"])
+
+
+def _closes(returns: pd.DataFrame) -> pd.DataFrame:
+    first = pd.DataFrame(100.0, index=[returns.index[0] - pd.offsets.BDay()], columns=returns.columns)
+    return pd.concat([first, 100 * (1 + returns).cumprod()])
+
+
+@pytest.fixture
+def prices(monkeypatch):
+    closes = {}
+    monkeypatch.setattr(data_access, "get_price_history", lambda symbols, period: closes["value"][symbols])
+
+    def use(frame):
+        closes["value"] = frame
+    return use
+
+
+def test_statistics_match_the_returns_matrix(prices):
+    returns = _synthetic_returns()
+    prices(_closes(returns))
+    result = portfolio.analyze(SYMBOLS, weights=list(WEIGHTS))
+
+    holdings, market = returns[SYMBOLS].to_numpy(), returns["SPY"].to_numpy()
+    covariance = np.cov(holdings, rowvar=False) * TRADING_DAYS_PER_YEAR
+    betas = [np.cov(holdings[:, i], market)[0, 1] / np.var(market, ddof=1) for i in range(3)]
+    variance = WEIGHTS @ covariance @ WEIGHTS
+    contribution = WEIGHTS * (covariance @ WEIGHTS) / variance
+
+    assert result["observations"] == len(returns)
+    assert result["portfolio"]["annualized_volatility"] == pytest.approx(variance ** 0.5, abs=1e-6)
+    assert result["holdings"]["annualized_volatility"] == pytest.approx(np.sqrt(np.diag(covariance)), abs=1e-6)
+    assert result["holdings"]["beta"] == pytest.approx(betas, abs=1e-6)
+    assert result["holdings"]["beta"] == pytest.approx([1.5, 0.5, 0.0], abs=0.1)
+    assert result["portfolio"]["beta"] == pytest.approx(WEIGHTS @ betas, abs=1e-6)
+    assert result["holdings"]["risk_contribution"] == pytest.approx(contribution, abs=1e-6)
+    assert sum(result["holdings"]["risk_contribution"]) == pytest.approx(1.0, abs=1e-5)
+    correlation = np.corrcoef(holdings, rowvar=False)
+    assert np.array(result["correlation"]["matrix"]) == pytest.approx(correlation, abs=1e-6)
+
+
+def test_a_holiday_on_one_exchange_costs_no_other_day(prices):
+    closes = _closes(_synthetic_returns())
+    holidays = closes.index[[40, 120, 200]]
+    closes.loc[holidays, "BBB"] = np.nan
+    prices(closes)
+    result = portfolio.analyze(SYMBOLS)
+
+    assert result["observations"] == len(closes) - 1
+    assert result["excluded"] == []
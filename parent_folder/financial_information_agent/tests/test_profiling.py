@@ -0,0 +1,116 @@
+import inspect
+import json
+import pstats
+import time
+import tracemalloc
+
+import pytest
+
+from services import profiling
+
+
+@profiling.profiled
+def busy_tool(symbol: str, seconds: float = 0.05) -> dict:
+    """Spins for a while and allocates a little."""
+    blocks = []
+    until = time.perf_counter() + seconds
+    while time.perf_counter() < until:
+        blocks.append(bytearray(1024))
+    # Returned, so the allocations are still live when the call is measured
+    return {"symbol": symbol, "blocks": blocks}
+
+
+@profiling.profiled
+def failing_tool(symbol: str):
+    raise ValueError(f"no data for {symbol}")
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(profiling, "PROFILER", "sample")
+    return tmp_path
+
+
+def _records(directory):
+    path = directory / "tool_profiles.jsonl"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_wrapper_keeps_the_tool_declaration():
+    assert busy_tool.__name__ == "busy_tool"
+    assert busy_tool.__doc__ == "Spins for a while and allocates a little."
+    assert list(inspect.signature(busy_tool).parameters) == ["symbol", "seconds"]
+
+
+def test_calls_are_not_profiled_by_default(profile_dir):
+    assert busy_tool("AAPL", seconds=0)["symbol"] == "AAPL"
+
+    assert list(profile_dir.iterdir()) == []
+
+
+def test_sampled_profile_records_stacks_time_and_memory(profile_dir):
+    was_tracing = tracemalloc.is_tracing()
+    with profiling.profile_requests():
+        result = busy_tool("AAPL", seconds=0.1)
+
+    assert result["symbol"] == "AAPL"
+    [record] = _records(profile_dir)
+    assert record["tool"] == "busy_tool"
+    assert record["call"] == "busy_tool('AAPL', seconds=0.1)"
+    assert record["wall_ms"] >= 100 and record["cpu_ms"] > 0
+    assert record["memory_delta_kb"] > 0 and record["top_allocations"]
+    assert record["samples"] > 0
+    folded = open(record["profile"], encoding='utf-8').read().splitlines()
+    counts = {line.rsplit(' ', 1)[0]: int(line.rsplit(' ', 1)[1]) for line in folded}
+    assert all(stack.startswith("busy_tool('AAPL', seconds=0.1)") for stack in counts)
+    assert sum(counts.values()) == record["samples"]
+    # Most samples land in the tool's own frame (the rest in the wrapper around it)
+    in_tool = sum(count for stack, count in counts.items() if ";busy_tool (test_profiling.py:" in stack)
+    assert in_tool > record["samples"] / 2
+    # tracemalloc is stopped again unless it was running before
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+def test_cprofile_writes_a_stats_file(profile_dir, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILER", "cprofile")
+    with profiling.profile_requests():
+        busy_tool("MSFT", seconds=0.02)
+
+    [record] = _records(profile_dir)
+    assert record["profile"].endswith(".prof")
+    stats = pstats.Stats(record["profile"])
+    assert any(function == "busy_tool" for _, _, function in stats.stats)
+    assert record["top_functions"]
+
+
+def test_a_failing_call_is_profiled_and_raises(profile_dir):
+    with profiling.profile_requests():
+        with pytest.raises(ValueError):
+            failing_tool("ZZZZ")
+
+    [record] = _records(profile_dir)
+    assert record["call"] == "failing_tool('ZZZZ')"
+
+
+def test_sample_rate_is_clamped_and_applies_to_every_call(profile_dir):
+    profiling.set_sample_rate(5)
+    assert profiling.SAMPLE_RATE == 1.0
+    busy_tool("AAPL", seconds=0)
+    busy_tool("MSFT", seconds=0)
+    profiling.set_sample_rate(-1)
+    busy_tool("NVDA", seconds=0)
+
+    assert profiling.SAMPLE_RATE == 0.0
+    assert [record["call"] for record in _records(profile_dir)] == [
+        "busy_tool('AAPL', seconds=0)", "busy_tool('MSFT', seconds=0)"]
+
+
+def test_describe_call_is_short_and_safe_for_collapsed_stacks():
+    assert profiling.describe_call("tool", ("a;b",), {"query": "x\ny"}) == "tool('a,b', query='x\\ny')"
+    long_call = profiling.describe_call("tool", ("x" * 500,), {})
+    assert len(long_call) == len("tool()") + profiling.MAX_ARGUMENTS_LENGTH
+    assert long_call.endswith("...)")
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from services import records
+
+INFO = {
+    "longName": "Apple Inc.", "currentPrice": 202.0, "previousClose": 200.0, "currency": "USD",
+    "volume": 51_234_567.0, "marketCap": 3.0e12, "sector": "Technology", "industry": "Consumer Electronics",
+    "fullTimeEmployees": 164000, "trailingPE": 31.5, "forwardPE": "Infinity", "beta": float("nan"),
+    "fiftyTwoWeekHigh": 260.1, "fiftyTwoWeekLow": 169.2, "companyOfficers": [{"name": "Tim Cook"}],
+}
+
+
+@pytest.mark.parametrize("value, expected", [
+    (1, 1.0), ("2.5", None), (True, None), (None, None), (float("nan"), None),
+    (np.float64(3.5), 3.5), (np.int64(7), 7.0), ([1], None),
+])
+def test_to_number(value, expected):
+    assert records.to_number(value) == expected
+
+
+def test_to_integer_truncates_and_keeps_none():
+    assert records.to_integer(51_234_567.9) == 51_234_567
+    assert records.to_integer(float("nan")) is None
+
+
+def test_quote_record_derives_the_change():
+    quote = records.QuoteRecord.from_info("AAPL", INFO)
+
+    assert quote.price == 202.0
+    assert quote.volume == 51_234_567 and isinstance(quote.volume, int)
+    assert quote.change == pytest.approx(2.0)
+    assert quote.change_percent == pytest.approx(1.0)
+    assert quote.to_dict() == {
+        "status": "success", "symbol": "AAPL", "company_name": "Apple Inc.", "price": 202.0,
+        "currency": "USD", "previous_close": 200.0, "volume": 51_234_567, "market_cap": 3_000_000_000_000,
+        "change": pytest.approx(2.0), "change_percent": pytest.approx(1.0),
+    }
+
+
+def test_quote_record_falls_back_and_needs_a_price():
+    quote = records.QuoteRecord.from_info("XYZ", {"regularMarketPrice": 10.0})
+
+    assert quote.company_name == "XYZ"
+    assert quote.previous_close == 10.0 and quote.change == 0.0
+    assert quote.volume == 0 and quote.market_cap is None
+    assert records.QuoteRecord.from_info("XYZ", {"longName": "No Price"}) is None
+
+
+def test_company_profile_record_keeps_raw_values_and_renames_keys():
+    profile = records.CompanyProfileRecord.from_info("AAPL", INFO).to_dict()
+
+    assert profile["ceo"] == "Tim Cook"
+    assert profile["employees"] == 164000
+    assert profile["pe_ratio"] == 31.5
+    # Values yfinance reports as strings or NaN become None
+    assert profile["forward_pe"] is None and profile["beta"] is None
+    assert profile["52_week_high"] == 260.1 and "fifty_two_week_high" not in profile
+    assert profile["description"] is None
+
+
+def test_records_only_hold_their_fields():
+    quote = records.QuoteRecord(symbol="AAPL", price=1.0)
+
+    assert quote.company_name is None
+    with pytest.raises(AttributeError):
+        quote.unknown = 1
+    assert repr(quote).startswith("QuoteRecord(symbol='AAPL', company_name=None, price=1.0")
@@ -0,0 +1,111 @@
+import functools
+import http.server
+import threading
+import urllib.request
+
+import pytest
+
+from scraper import render_pool
+
+
+class _FakeDriver:
+    """Stands in for a Selenium driver: fetches pages without running scripts."""
+
+    def __init__(self, started):
+        self.number = len(started)
+        self.page_source = None
+        self.quit_called = False
+        started.append(self)
+
+    def get(self, url):
+        with urllib.request.urlopen(url, timeout=5) as response:
+            self.page_source = response.read().decode('utf-8')
+
+    def execute_script(self, script):
+        return True
+
+    def quit(self):
+        self.quit_called = True
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / 'index.html').write_text('<html><body><p>Rendered page</p></body></html>', encoding='utf-8')
+    handler = functools.partial(_QuietHandler, directory=str(tmp_path))
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def started():
+    return []
+
+
+def _pool(started, **kwargs):
+    return render_pool.RenderPool(driver_factory=functools.partial(_FakeDriver, started), **kwargs)
+
+
+def test_browsers_are_returned_to_the_pool_and_reused(site, started):
+    pool = _pool(started, size=1)
+
+    for _ in range(3):
+        assert 'Rendered page' in pool.render(f"{site}/index.html", wait_seconds=1)
+
+    assert len(started) == 1
+    assert not started[0].quit_called
+
+
+def test_browsers_are_recycled_after_max_pages(site, started):
+    pool = _pool(started, size=1, max_pages_per_browser=2)
+
+    for _ in range(5):
+        pool.render(f"{site}/index.html", wait_seconds=1)
+
+    assert len(started) == 3
+    assert [driver.quit_called for driver in started] == [True, True, False]
+
+
+def test_a_failed_page_quits_its_browser_and_frees_the_slot(site, started):
+    pool = _pool(started, size=1)
+
+    with pytest.raises(Exception):
+        pool.render(f"{site}/missing.html", wait_seconds=1)
+    assert started[0].quit_called
+
+    assert 'Rendered page' in pool.render(f"{site}/index.html", wait_seconds=1, checkout_timeout=1)
+    assert len(started) == 2
+
+
+def test_checkout_gives_up_when_no_browser_becomes_free(site, started):
+    pool = _pool(started, size=1)
+    busy = pool._checkout(None)
+
+    with pytest.raises(TimeoutError):
+        pool.render(f"{site}/index.html", checkout_timeout=0.1)
+
+    pool._checkin(busy)
+    assert 'Rendered page' in pool.render(f"{site}/index.html", wait_seconds=1, checkout_timeout=1)
+
+
+def test_close_quits_idle_and_busy_browsers(site, started):
+    pool = _pool(started, size=2)
+    pool.warm()
+    busy = pool._checkout(None)
+
+    pool.close()
+
+    assert len(started) == 2
+    assert all(driver.quit_called for driver in started)
+    with pytest.raises(RuntimeError):
+        pool.render(f"{site}/index.html")
+    # A browser handed back after close is not kept
+    pool._checkin(busy)
+    assert pool._idle.empty()
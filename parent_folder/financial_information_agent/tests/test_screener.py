@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+import api_functions
+from services import data_access, deadline, screener
+
+INFO = {
+    "AAA": {"sector": "Technology", "trailingPE": 15.0, "marketCap": 3e12, "longName": "Aaa"},
+    "BBB": {"sector": "Technology", "trailingPE": 35.0, "marketCap": 2e12, "longName": "Bbb"},
+    "CCC": {"sector": "Energy", "trailingPE": 9.0, "marketCap": 1e12, "longName": "Ccc"},
+}
+
+
+@pytest.fixture
+def fresh_screener(monkeypatch):
+    def slow_info(symbol):
+        time.sleep(0.2)
+        return INFO[symbol]
+    monkeypatch.setattr(data_access, "get_ticker_info", slow_info)
+    instance = screener.Screener(universe=tuple(INFO))
+    monkeypatch.setattr(screener, "_screener", instance)
+    return instance
+
+
+def test_first_screen_waits_for_the_first_batch(fresh_screener):
+    fresh_screener.start_background_refresh(interval_seconds=60)
+    with deadline.budget(5):
+        result = api_functions.screen_stocks(sector="Technology", max_pe=20)
+    assert result["status"] == "success"
+    assert result["loaded_count"] == 3
+    assert [match["symbol"] for match in result["matches"]] == ["AAA"]
+
+
+def test_screen_before_any_row_loads_is_an_error_not_an_empty_result(fresh_screener):
+    with deadline.budget(0.3):
+        result = api_functions.screen_stocks(sector="Technology")
+    assert result["status"] == "error"
+    assert "loading" in result["error_message"]
+
+
+def test_query_filters_and_ranks_loaded_rows(fresh_screener):
+    assert fresh_screener.refresh() == 3
+    rows = fresh_screener.query(filters={"pe_ratio": (None, 20)}, sort_by="pe_ratio", descending=False)
+    assert [row["symbol"] for row in rows] == ["CCC", "AAA"]
+    assert rows[0]["market_cap"] == 1e12 and rows[0]["forward_pe"] is None
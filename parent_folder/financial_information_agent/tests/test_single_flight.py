@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from services import cache_backend, data_access, symbol_registry
+from services.single_flight import SingleFlight, WaitTimeout
+
+
+class _SlowLoad:
+    """An upstream call that blocks until released and counts its invocations."""
+
+    def __init__(self, result="value", error=None):
+        self.result, self.error = result, error
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _callers(count, target):
+    outcomes = [None] * count
+
+    def run(index):
+        try:
+            outcomes[index] = target()
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    return threads, outcomes
+
+
+def _run_concurrently(load, target, count=8):
+    """Starts the first caller, then the others while its load is running."""
+    threads, outcomes = _callers(count, target)
+    threads[0].start()
+    assert load.started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)  # let the followers join the running call
+    load.release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_identical_calls_share_one_load():
+    flight, load = SingleFlight(), _SlowLoad()
+
+    outcomes = _run_concurrently(load, lambda: flight.do("key", load))
+
+    assert load.calls == 1
+    assert outcomes == ["value"] * 8
+    assert flight.in_flight() == 0
+
+
+def test_every_waiter_gets_the_shared_error():
+    flight, load = SingleFlight(), _SlowLoad(error=ConnectionError("upstream down"))
+
+    outcomes = _run_concurrently(load, lambda: flight.do("key", load))
+
+    assert load.calls == 1
+    assert all(isinstance(outcome, ConnectionError) for outcome in outcomes)
+
+
+def test_only_overlapping_calls_with_the_same_key_are_merged():
+    flight = SingleFlight()
+    calls = []
+
+    assert flight.do("a", lambda: calls.append("a") or 1) == 1
+    assert flight.do("a", lambda: calls.append("a") or 2) == 2
+    assert flight.do("b", lambda: calls.append("b") or 3) == 3
+
+    assert calls == ["a", "a", "b"]
+
+
+def test_a_waiter_with_a_timeout_gives_up_while_the_load_finishes():
+    flight, load = SingleFlight(), _SlowLoad()
+
+    with pytest.raises(WaitTimeout):
+        flight.do("key", load, timeout=0.05)
+    assert flight.in_flight() == 1
+
+    load.release.set()
+    for _ in range(100):
+        if flight.in_flight() == 0:
+            break
+        time.sleep(0.01)
+    assert flight.in_flight() == 0
+    assert load.calls == 1
+
+
+def test_concurrent_ticker_reads_make_one_upstream_request(monkeypatch):
+    load = _SlowLoad(result={"longName": "Coalesced Corp", "currentPrice": 10.0})
+
+    class Ticker:
+        @property
+        def info(self):
+            return load()
+
+    monkeypatch.setattr(data_access, "_ticker", lambda symbol: Ticker())
+    monkeypatch.setattr(cache_backend, "_backend", cache_backend.MemoryBackend())
+    registry = symbol_registry.SymbolRegistry()
+    monkeypatch.setattr(symbol_registry, "get_registry", lambda: registry)
+
+    outcomes = _run_concurrently(load, lambda: data_access.get_ticker_info("COAL"))
+
+    assert load.calls == 1
+    assert all(outcome["longName"] == "Coalesced Corp" for outcome in outcomes)
+    # Later reads are served from the cache
+    data_access.get_ticker_info("COAL")
+    assert load.calls == 1
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+import pandas as pd
+import pytest
+
+from services import data_access, records, statements
+
+QUARTERS = pd.to_datetime(["2025-03-31", "2025-06-30", "2025-09-30", "2025-12-31", "2026-03-31"])
+
+
+def _statements():
+    income = pd.DataFrame({"Total Revenue": [100.0, 110.0, 120.0, 130.0, 150.0],
+                           "Net Income": [10.0, 11.0, 12.0, 13.0, 20.0]}, index=QUARTERS).T
+    balance = pd.DataFrame({"Total Assets": [500.0] * 5, "Stockholders Equity": [200.0] * 5}, index=QUARTERS).T
+    cashflow = pd.DataFrame({"Free Cash Flow": [5.0, 6.0, 7.0, 8.0, 10.0]}, index=QUARTERS).T
+    return income, balance, cashflow
+
+
+def test_latest_quarter_record_includes_year_over_year_growth():
+    ratios = statements.compute_ratios(*_statements(), frequency='quarterly')
+
+    record = records.FinancialMetricsRecord.from_row("AAA", "quarterly", ratios.index[-1], ratios.iloc[-1])
+
+    assert record.revenue_growth == pytest.approx(150 / 130 - 1)
+    assert record.revenue_growth_yoy == pytest.approx(0.5)
+    assert record.net_income_growth_yoy == pytest.approx(1.0)
+    assert record.fcf_growth_yoy == pytest.approx(1.0)
+    assert record.to_dict()["revenue_growth_yoy"] == pytest.approx(0.5)
+
+
+def test_annual_record_has_no_year_over_year_growth():
+    ratios = statements.compute_ratios(*_statements(), frequency='annual')
+
+    record = records.FinancialMetricsRecord.from_row("AAA", "annual", ratios.index[-1], ratios.iloc[-1])
+
+    assert record.revenue_growth_yoy is None
+    assert record.return_on_equity == pytest.approx(0.1)
+
+
+def test_ratio_cache_is_bounded(monkeypatch):
+    downloads = []
+
+    def get_ticker_attribute(symbol, attribute):
+        downloads.append(symbol)
+        return dict(zip(statements.FREQUENCIES['annual'][0], _statements()))[attribute]
+
+    monkeypatch.setattr(data_access, "get_ticker_attribute", get_ticker_attribute)
+    monkeypatch.setattr(statements, "MAX_ENTRIES", 2)
+    monkeypatch.setattr(statements, "_cache", OrderedDict())
+
+    for symbol in ("AAA", "BBB", "AAA", "CCC", "AAA", "BBB"):
+        statements.get_statement_ratios(symbol)
+
+    # AAA stays cached as the most recently used table; BBB was dropped for CCC
+    assert downloads == ["AAA"] * 3 + ["BBB"] * 3 + ["CCC"] * 3 + ["BBB"] * 3
+    assert list(statements._cache) == [("AAA", "annual"), ("BBB", "annual")]
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services import cache_backend, data_access, symbol_registry
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP Error {status_code}")
+        self.response = SimpleNamespace(status_code=status_code)
+
+
+class _Missing:
+    def __getattr__(self, attribute):
+        raise _HTTPError(404)
+
+
+class _Empty:
+    info = {}
+
+
+class _Flaky:
+    @property
+    def info(self):
+        raise _HTTPError(503)
+
+
+class _BrokenBackend:
+    def get(self, key):
+        raise ConnectionError("cache down")
+
+    def set(self, key, value, ttl):
+        raise ConnectionError("cache down")
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = symbol_registry.SymbolRegistry()
+    monkeypatch.setattr(symbol_registry, "get_registry", lambda: registry)
+    monkeypatch.setattr(data_access, "_ticker", lambda symbol: _Missing())
+    return registry
+
+
+def test_404_on_other_attributes_does_not_invalidate_the_symbol(registry):
+    with pytest.raises(_HTTPError):
+        data_access._load_attribute("ZZQX", "news")
+    registry.check("ZZQX")
+
+
+def test_404_on_info_invalidates_the_symbol(registry):
+    with pytest.raises(symbol_registry.InvalidSymbolError):
+        data_access._load_attribute("ZZQX", "info")
+    with pytest.raises(symbol_registry.InvalidSymbolError):
+        registry.check("ZZQX")
+
+
+def test_failing_backend_is_a_miss_for_details(registry, monkeypatch):
+    monkeypatch.setattr(cache_backend, "get_backend", lambda: _BrokenBackend())
+    assert registry.details("ZZQX") == {}
+
+
+def test_other_http_errors_do_not_invalidate_the_symbol(registry, monkeypatch):
+    monkeypatch.setattr(data_access, "_ticker", lambda symbol: _Flaky())
+    with pytest.raises(_HTTPError):
+        data_access._load_attribute("AAPL", "info")
+    registry.check("AAPL")
+
+
+def test_a_temporary_empty_info_blocks_the_symbol_only_briefly(registry, monkeypatch):
+    now, stored = [1_000_000.0], {}
+    monkeypatch.setattr(symbol_registry.time, "time", lambda: now[0])
+    monkeypatch.setattr(data_access, "_ticker", lambda symbol: _Empty())
+    monkeypatch.setattr(cache_backend, "get_backend", lambda: SimpleNamespace(
+        get=lambda key: stored.get(key, cache_backend.MISSING),
+        set=lambda key, value, ttl: stored.update({key: ttl})))
+    with pytest.raises(symbol_registry.InvalidSymbolError):
+        data_access._load_attribute("ZZQY", "info")
+    with pytest.raises(symbol_registry.InvalidSymbolError):
+        registry.check("ZZQY")
+
+    assert stored == {"invalid-symbol:ZZQY": symbol_registry.EMPTY_INFO_TTL_SECONDS}
+
+    now[0] += symbol_registry.EMPTY_INFO_TTL_SECONDS + 1
+    registry.check("ZZQY")
@@ -0,0 +1,131 @@
+"""
+Batch scraping with network I/O and HTML parsing overlapped.
+
+Pages are fetched by a thread pool. As soon as a page arrives, its raw bytes are
+handed to a process pool (one worker per core) that parses and cleans it and
+sends back only the extracted text, so parsing scales with cores instead of
+being serialized on the GIL while the remaining fetches continue.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse
+
+import requests
+
+try:
+    from . import boilerplate, render_pool, scraper
+except ImportError:
+    import boilerplate
+    import render_pool
+    import scraper
+
+FETCH_WORKERS = 8
+# Batches this small are parsed in-process; a worker round trip is not worth it
+MIN_BATCH_FOR_PROCESSES = 3
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Returns the process-wide parse pool (sized to the CPU count), started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # 'spawn' keeps workers independent of the parent's threads and locks
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context('spawn'))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _reset_parse_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _fetch(url: str):
+    """Returns the raw page bytes, or the same error string scrape_content would return."""
+    if not scraper.check_robots_txt(url):
+        return None, f"Scraping of {url} is disallowed by robots.txt."
+    try:
+        response = requests.get(url, headers=scraper.HEADERS, timeout=15)
+        response.raise_for_status()
+        return response.content, None
+    except requests.exceptions.RequestException as e:
+        return None, f"Failed to retrieve {url}: {e}"
+
+
+def _finish(url: str, html: bytes, text, fingerprints) -> str:
+    """Learns from the parsed page and applies the rendering fallback, like scrape_content."""
+    boilerplate.get_learner().observe(urlparse(url).netloc, url, fingerprints)
+    pool = render_pool.get_pool()
+    if pool is not None and render_pool.looks_like_empty_shell(html.decode('utf-8', 'ignore'), text):
+        print(f"Rendering JavaScript page {url} in a headless browser")
+        text = scraper.extract_main_text(pool.render(url), url)
+    return text if text is not None else "No main content found in the page."
+
+
+def scrape_batch(urls: list, fetch_workers: int = FETCH_WORKERS, use_processes: bool = None) -> dict:
+    """
+    Scrapes several URLs, overlapping fetches with parsing in worker processes.
+
+    Args:
+        urls (list): URLs to scrape (duplicates are scraped once).
+        fetch_workers (int): Concurrent downloads.
+        use_processes (bool): Parse in the process pool (default: for batches of
+                              MIN_BATCH_FOR_PROCESSES URLs or more).
+
+    Returns:
+        dict: url -> cleaned text, or the error message scrape_content would return.
+    """
+    urls = list(dict.fromkeys(urls))
+    if use_processes is None:
+        use_processes = len(urls) >= MIN_BATCH_FOR_PROCESSES
+    learner = boilerplate.get_learner()
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(fetch_workers, len(urls)))) as fetchers:
+        fetches = {fetchers.submit(_fetch, url): url for url in urls}
+        parses = {}
+        for future in as_completed(fetches):
+            url = fetches[future]
+            html, error = future.result()
+            if error:
+                results[url] = error
+                continue
+            known = learner.boilerplate(urlparse(url).netloc)
+            if use_processes:
+                try:
+                    parses[get_parse_pool().submit(scraper.parse_page, html, known)] = (url, html)
+                    continue
+                except (BrokenProcessPool, RuntimeError) as e:
+                    print(f"Parse pool unavailable ({e}); parsing in-process")
+                    _reset_parse_pool()
+                    use_processes = False
+            try:
+                results[url] = _finish(url, html, *scraper.parse_page(html, known))
+            except Exception as e:
+                results[url] = f"An unexpected error occurred while processing {url}: {e}"
+
+        for future in as_completed(parses):
+            url, html = parses[future]
+            try:
+                try:
+                    text, fingerprints = future.result()
+                except BrokenProcessPool:
+                    _reset_parse_pool()
+                    text, fingerprints = scraper.parse_page(html, learner.boilerplate(urlparse(url).netloc))
+                results[url] = _finish(url, html, text, fingerprints)
+            except Exception as e:
+                results[url] = f"An unexpected error occurred while processing {url}: {e}"
+
+    return {url: results[url] for url in urls}
@@ -0,0 +1,275 @@
+"""
+Per-domain boilerplate learning from DOM fingerprints.
+
+Pages of one news site share their template: navigation, footers, promo and
+newsletter blocks are the same DOM subtree on every page. Each element gets a
+fingerprint (a hash of its tag, attributes, text and child fingerprints,
+computed bottom-up in one pass), and the learner counts on how many pages of a
+domain each fingerprint occurs. Subtrees found on most pages of a domain are
+boilerplate and are removed before the main text is extracted, so later pages
+of that site skip the template right away.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves still replace the file atomically, without merging locks
+    fcntl = None
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'crawl_data', 'boilerplate.json')
+
+# A subtree is boilerplate once it occurs on MIN_PAGES pages and on at least
+# BOILERPLATE_SHARE of the pages seen for its domain
+MIN_PAGES = 3
+BOILERPLATE_SHARE = 0.5
+MAX_FINGERPRINTS_PER_DOMAIN = 20000
+MAX_URLS_PER_DOMAIN = 500
+SAVE_EVERY_PAGES = 25
+
+_DIGITS = re.compile(r'\d+')
+_WHITESPACE = re.compile(r'\s+')
+# Subtrees that are never removed as boilerplate, however often they repeat
+_STRUCTURAL_TAGS = {'html', 'head', 'body', 'main', 'article'}
+
+
+def _signature(element) -> str:
+    # Digits in ids and classes are usually per-page counters ("post-1234")
+    classes = ' '.join(sorted(element.get('class') or ()))
+    return _DIGITS.sub('0', f"{element.name}#{element.get('id') or ''}.{classes}")
+
+
+def fingerprint_tree(root) -> dict:
+    """
+    Fingerprints every element under root (BeautifulSoup Tag) bottom-up.
+
+    Returns:
+        dict: id(element) -> (fingerprint, element) for every Tag in the tree.
+    """
+    fingerprints = {}
+    stack = [(root, False)]
+    while stack:
+        element, children_done = stack.pop()
+        if not children_done:
+            stack.append((element, True))
+            stack.extend((child, False) for child in element.children if getattr(child, 'name', None))
+            continue
+        digest = hashlib.blake2b(_signature(element).encode('utf-8'), digest_size=8)
+        for child in element.children:
+            if getattr(child, 'name', None):
+                digest.update(fingerprints[id(child)][0].encode('ascii'))
+            elif isinstance(child, str):
+                text = _WHITESPACE.sub(' ', child).strip()
+                if text:
+                    digest.update(text.encode('utf-8', 'ignore'))
+        fingerprints[id(element)] = (digest.hexdigest(), element)
+    return fingerprints
+
+
+def page_fingerprints(fingerprints: dict) -> list:
+    """The fingerprints of a page that count towards learning (see fingerprint_tree())."""
+    return [fp for fp, element in fingerprints.values() if element.name not in _STRUCTURAL_TAGS]
+
+
+def strip(soup, fingerprints: dict, known) -> int:
+    """
+    Removes the subtrees whose fingerprint is in known (top-down, so the
+    descendants of a removed subtree are skipped).
+
+    Returns:
+        int: Number of subtrees removed.
+    """
+    if not known:
+        return 0
+    removed = 0
+    stack = [soup]
+    while stack:
+        element = stack.pop()
+        for child in list(element.children):
+            if not getattr(child, 'name', None):
+                continue
+            fingerprint = fingerprints.get(id(child))
+            if fingerprint and fingerprint[0] in known and child.name not in _STRUCTURAL_TAGS:
+                child.decompose()
+                removed += 1
+            else:
+                stack.append(child)
+    return removed
+
+
+class _DomainStats:
+    __slots__ = ('pages', 'counts', 'urls')
+
+    def __init__(self, pages=0, counts=None, urls=None):
+        self.pages = pages
+        self.counts = counts or {}
+        self.urls = OrderedDict.fromkeys(urls or ())
+
+    def record(self, url: str, fingerprints) -> bool:
+        """Counts the fingerprints of one page; False if the URL was already counted."""
+        if url in self.urls:
+            self.urls.move_to_end(url)
+            return False
+        self.urls[url] = None
+        if len(self.urls) > MAX_URLS_PER_DOMAIN:
+            self.urls.popitem(last=False)
+        self.pages += 1
+        counts = self.counts
+        for fingerprint in fingerprints:
+            counts[fingerprint] = counts.get(fingerprint, 0) + 1
+        if len(counts) > MAX_FINGERPRINTS_PER_DOMAIN:
+            # Forget subtrees seen only once; page-specific content dominates those
+            self.counts = {fp: count for fp, count in counts.items() if count > 1}
+        return True
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Holds an exclusive lock on path + '.lock' across processes (where fcntl exists)."""
+    with open(path + '.lock', 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _load(path: str) -> dict:
+    """Reads a saved state file: domain -> _DomainStats (empty if missing or unreadable)."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            saved = json.load(file)
+        return {domain: _DomainStats(stats['pages'], stats['counts'], stats.get('urls'))
+                for domain, stats in saved.items()}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ignoring unreadable boilerplate state {path}: {e}")
+        return {}
+
+
+class BoilerplateLearner:
+    """
+    Learns and strips the repeated template subtrees of each domain.
+
+    Pages observed since the last save are kept as pending observations. A save
+    replays them onto the state file as it is on disk (under a file lock), so
+    several processes crawling at once add up their counts instead of
+    overwriting each other, and each process picks up what the others learned.
+    Saves triggered by observe() run in a background thread.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one save at a time
+        self._domains = _load(path)
+        self._pending = []  # (domain, url, fingerprints) observed since the last save
+        self._saving = False
+
+    def observe(self, domain: str, url: str, fingerprints):
+        """Counts the distinct fingerprints of one page (each URL is counted once)."""
+        fingerprints = frozenset(fingerprints)
+        with self._lock:
+            if not self._domains.setdefault(domain, _DomainStats()).record(url, fingerprints):
+                return
+            if not self.path:
+                return
+            self._pending.append((domain, url, fingerprints))
+            save = len(self._pending) >= SAVE_EVERY_PAGES and not self._saving
+            if save:
+                self._saving = True
+        if save:
+            threading.Thread(target=self._save_in_background, name='boilerplate-save', daemon=True).start()
+
+    def _save_in_background(self):
+        try:
+            self.save()
+        except Exception as e:
+            print(f"Could not save boilerplate state {self.path}: {e}")
+        finally:
+            with self._lock:
+                self._saving = False
+
+    def boilerplate(self, domain: str) -> set:
+        """Fingerprints currently considered boilerplate for a domain."""
+        with self._lock:
+            stats = self._domains.get(domain)
+            if stats is None or stats.pages < MIN_PAGES:
+                return set()
+            threshold = max(MIN_PAGES, BOILERPLATE_SHARE * stats.pages)
+            return {fp for fp, count in stats.counts.items() if count >= threshold}
+
+    def learn_and_strip(self, soup, domain: str, url: str) -> int:
+        """
+        Records the page's subtrees for its domain, then removes the subtrees
+        known to be boilerplate.
+
+        Returns:
+            int: Number of subtrees removed.
+        """
+        fingerprints = fingerprint_tree(soup)
+        self.observe(domain, url, page_fingerprints(fingerprints))
+        return strip(soup, fingerprints, self.boilerplate(domain))
+
+    def save(self):
+        """Merges the pending observations into the state file and reloads it."""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            try:
+                with _file_lock(self.path):
+                    domains = _load(self.path)
+                    for domain, url, fingerprints in pending:
+                        domains.setdefault(domain, _DomainStats()).record(url, fingerprints)
+                    data = {
+                        domain: {'pages': stats.pages, 'counts': stats.counts, 'urls': list(stats.urls)}
+                        for domain, stats in domains.items()
+                    }
+                    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                    try:
+                        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                            json.dump(data, file)
+                        os.replace(temp_path, self.path)
+                    except Exception:
+                        os.remove(temp_path)
+                        raise
+            except Exception:
+                with self._lock:
+                    self._pending[:0] = pending
+                raise
+            with self._lock:
+                # Pages observed while saving are not in the file yet
+                for domain, url, fingerprints in self._pending:
+                    domains.setdefault(domain, _DomainStats()).record(url, fingerprints)
+                self._domains = domains
+
+
+_learner = None
+_learner_lock = threading.Lock()
+
+
+def get_learner() -> BoilerplateLearner:
+    """Returns the process-wide learner, loading its saved state on first use."""
+    global _learner
+    with _learner_lock:
+        if _learner is None:
+            _learner = BoilerplateLearner()
+            atexit.register(_learner.save)
+        return _learner
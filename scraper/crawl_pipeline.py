@@ -0,0 +1,389 @@
+"""
+Background crawl pipeline for the news sources in sites.txt.
+
+    fetch -> clean -> extract links -> store
+
+Each stage has its own pool of worker threads, and the stages are connected by
+bounded queues so a slow stage applies back-pressure instead of buffering the
+whole crawl in memory. Pages are re-fetched conditionally (ETag /
+Last-Modified), so an unchanged page costs one cheap request; a page whose
+extracted text hashes as before is not stored again. The crawl state (per-URL
+validators and hashes plus the pending frontier) is saved to disk, so an
+interrupted crawl resumes where it stopped.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import deque
+from html.parser import HTMLParser
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import requests
+
+try:
+    from . import boilerplate, render_pool, scraper
+except ImportError:
+    import boilerplate
+    import render_pool
+    import scraper
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'crawl_data')
+
+_STOP = object()
+
+
+class _LinkParser(HTMLParser):
+    """Collects href targets of <a> tags and the <title> text without building a DOM."""
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+        self.title = ''
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            for name, value in attrs:
+                if name == 'href' and value:
+                    self.links.append(value)
+        elif tag == 'title':
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+def _parse(html: str) -> _LinkParser:
+    parser = _LinkParser()
+    try:
+        parser.feed(html)
+    except Exception:
+        pass
+    return parser
+
+
+def _absolute_links(hrefs, base_url: str) -> list:
+    links = []
+    for href in hrefs:
+        url = urldefrag(urljoin(base_url, href.strip()))[0]
+        if urlparse(url).scheme in ('http', 'https'):
+            links.append(url)
+    return list(dict.fromkeys(links))
+
+
+def extract_links(html: str, base_url: str) -> list:
+    """Returns the absolute http(s) links of a page, without fragments or duplicates."""
+    return _absolute_links(_parse(html).links, base_url)
+
+
+class CrawlState:
+    """Per-URL validators and content hashes plus the pending frontier, persisted as JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.pages = {}      # url -> {etag, last_modified, content_hash, links, fetched_at, depth}
+        self.pending = {}    # url -> depth
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                saved = json.load(file)
+            self.pages = saved.get('pages', {})
+            self.pending = saved.get('pending', {})
+
+    def page(self, url: str) -> dict:
+        with self._lock:
+            return dict(self.pages.get(url, {}))
+
+    def update_page(self, url: str, **values):
+        with self._lock:
+            self.pages.setdefault(url, {}).update(values)
+
+    def add_pending(self, url: str, depth: int):
+        with self._lock:
+            self.pending[url] = depth
+
+    def remove_pending(self, url: str):
+        with self._lock:
+            self.pending.pop(url, None)
+
+    def save(self):
+        # Serialized under the lock: workers keep updating pages while a save runs
+        with self._lock:
+            data = json.dumps({'pages': self.pages, 'pending': self.pending})
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                file.write(data)
+            os.replace(temp_path, self.path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+
+class CrawlPipeline:
+    """
+    Crawls seed URLs (and, up to max_depth, same-site links found on them)
+    through the fetch, clean, extract-links and store stages.
+    """
+
+    def __init__(self, seeds, data_dir: str = DEFAULT_DATA_DIR, max_depth: int = 0,
+                 fetch_workers: int = 8, clean_workers: int = 4, link_workers: int = 2,
+                 store_workers: int = 1, queue_size: int = 32, max_pages: int = 500,
+                 request_timeout: float = 15, sinks=None):
+        self.seeds = list(dict.fromkeys(seeds))
+        self.data_dir = data_dir
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.request_timeout = request_timeout
+        # Callables receiving every stored document (e.g. a search index)
+        self.sinks = list(sinks or [])
+        self.workers = {'fetch': fetch_workers, 'clean': clean_workers,
+                        'links': link_workers, 'store': store_workers}
+        self.state = CrawlState(os.path.join(data_dir, 'crawl_state.json'))
+        self.session = requests.Session()
+        self.session.headers.update(scraper.HEADERS)
+
+        self._queues = {stage: queue.Queue(maxsize=queue_size) for stage in ('fetch', 'clean', 'links', 'store')}
+        self._frontier = deque()
+        self._frontier_ready = threading.Condition()
+        self._seen = set()
+        self._outstanding = 0
+        self._outstanding_lock = threading.Lock()
+        self._done = threading.Event()
+        self._robots = {}
+        self._robots_lock = threading.Lock()
+        self.stats = {'fetched': 0, 'not_modified': 0, 'unchanged': 0, 'stored': 0,
+                      'failed': 0, 'disallowed': 0, 'discovered': 0}
+        self._stats_lock = threading.Lock()
+
+    # -- bookkeeping -------------------------------------------------------
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _enqueue(self, url: str, depth: int):
+        """Adds a URL to the frontier once per crawl; never blocks."""
+        with self._outstanding_lock:
+            if url in self._seen or len(self._seen) >= self.max_pages:
+                return
+            self._seen.add(url)
+            self._outstanding += 1
+        self.state.add_pending(url, depth)
+        with self._frontier_ready:
+            self._frontier.append((url, depth))
+            self._frontier_ready.notify()
+
+    def _finish(self, url: str):
+        """Marks one URL as fully processed (at whichever stage it stopped)."""
+        self.state.remove_pending(url)
+        with self._outstanding_lock:
+            self._outstanding -= 1
+            finished = self._outstanding == 0
+        if finished:
+            self._done.set()
+            with self._frontier_ready:
+                self._frontier_ready.notify_all()
+
+    def _allowed(self, url: str) -> bool:
+        netloc = urlparse(url).netloc
+        with self._robots_lock:
+            allowed = self._robots.get(netloc)
+        if allowed is None:
+            allowed = scraper.check_robots_txt(url)
+            with self._robots_lock:
+                self._robots[netloc] = allowed
+        return allowed
+
+    # -- stages ------------------------------------------------------------
+
+    def _dispatch(self):
+        """Moves URLs from the unbounded frontier into the bounded fetch queue."""
+        while True:
+            with self._frontier_ready:
+                while not self._frontier and not self._done.is_set():
+                    self._frontier_ready.wait()
+                if not self._frontier:
+                    return
+                item = self._frontier.popleft()
+            self._queues['fetch'].put(item)
+
+    def _fetch(self, item):
+        url, depth = item
+        if not self._allowed(url):
+            self._count('disallowed')
+            return None
+        known = self.state.page(url)
+        headers = {}
+        if known.get('etag'):
+            headers['If-None-Match'] = known['etag']
+        if known.get('last_modified'):
+            headers['If-Modified-Since'] = known['last_modified']
+        response = self.session.get(url, headers=headers, timeout=self.request_timeout)
+        if response.status_code == 304:
+            self._count('not_modified')
+            self.state.update_page(url, fetched_at=time.time())
+            self._follow(url, depth, known.get('links', []))
+            return None
+        response.raise_for_status()
+        self._count('fetched')
+        self.state.update_page(
+            url, etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'), fetched_at=time.time(),
+            depth=depth,
+        )
+        return {'url': url, 'depth': depth, 'html': response.text}
+
+    def _clean(self, page):
+        page['text'] = scraper.extract_main_text(page['html'], page['url'])
+        pool = render_pool.get_pool()
+        if pool is not None and render_pool.looks_like_empty_shell(page['html'], page['text']):
+            page['html'] = pool.render(page['url'])
+            page['text'] = scraper.extract_main_text(page['html'], page['url'])
+        # Hash the article text, not the HTML: ads, timestamps and session
+        # tokens change the HTML on every request while the article does not
+        page['content_hash'] = hashlib.sha1((page['text'] or '').encode('utf-8')).hexdigest()
+        known = self.state.page(page['url'])
+        if page['content_hash'] == known.get('content_hash'):
+            self._count('unchanged')
+            self._follow(page['url'], page['depth'], known.get('links', []))
+            return None
+        return page
+
+    def _follow(self, url: str, depth: int, links):
+        """Queues the same-site links of a page while within max_depth."""
+        if depth >= self.max_depth:
+            return
+        site = urlparse(url).netloc
+        for link in links:
+            if urlparse(link).netloc == site:
+                self._count('discovered')
+                self._enqueue(link, depth + 1)
+
+    def _extract_links(self, page):
+        parser = _parse(page.pop('html'))
+        page['title'] = ' '.join(parser.title.split())
+        page['links'] = _absolute_links(parser.links, page['url'])
+        self._follow(page['url'], page['depth'], page['links'])
+        return page
+
+    def _store(self, page):
+        document = {
+            'url': page['url'],
+            'title': page['title'],
+            'fetched_at': time.time(),
+            'content_hash': page['content_hash'],
+            'text': page['text'] or '',
+            'links': page['links'],
+        }
+        name = hashlib.sha1(page['url'].encode('utf-8')).hexdigest() + '.json'
+        pages_dir = os.path.join(self.data_dir, 'pages')
+        os.makedirs(pages_dir, exist_ok=True)
+        with open(os.path.join(pages_dir, name), 'w', encoding='utf-8') as file:
+            json.dump(document, file)
+        for sink in self.sinks:
+            try:
+                sink(document)
+            except Exception as e:
+                print(f"Crawl sink failed for {page['url']}: {e}")
+        # Only record the hash once the page is stored, so a crash re-processes it
+        self.state.update_page(page['url'], content_hash=page['content_hash'], links=page['links'])
+        self._count('stored')
+        return None
+
+    def _worker(self, stage: str, handler, next_stage: str):
+        source = self._queues[stage]
+        while True:
+            item = source.get()
+            if item is _STOP:
+                return
+            url = item[0] if stage == 'fetch' else item['url']
+            try:
+                result = handler(item)
+            except Exception as e:
+                self._count('failed')
+                print(f"Crawl {stage} failed for {url}: {e}")
+                result = None
+            if result is None or next_stage is None:
+                self._finish(url)
+            else:
+                self._queues[next_stage].put(result)
+
+    # -- running -----------------------------------------------------------
+
+    def run(self) -> dict:
+        """
+        Crawls the seeds plus any frontier left by an interrupted run, and
+        returns the statistics of this run once every URL has been processed.
+        """
+        self._done.clear()
+        self._seen.clear()
+        with self._stats_lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+        resumed = dict(self.state.pending)
+        for url, depth in resumed.items():
+            self._enqueue(url, depth)
+        for url in self.seeds:
+            self._enqueue(url, 0)
+        if self._outstanding == 0:
+            return dict(self.stats)
+
+        stages = (('fetch', self._fetch, 'clean'), ('clean', self._clean, 'links'),
+                  ('links', self._extract_links, 'store'), ('store', self._store, None))
+        threads = [threading.Thread(target=self._dispatch, name='crawl-dispatch', daemon=True)]
+        for stage, handler, next_stage in stages:
+            for index in range(self.workers[stage]):
+                threads.append(threading.Thread(target=self._worker, args=(stage, handler, next_stage),
+                                                name=f'crawl-{stage}-{index}', daemon=True))
+        for thread in threads:
+            thread.start()
+
+        try:
+            while not self._done.wait(timeout=10):
+                self.state.save()
+        finally:
+            self._done.set()
+            with self._frontier_ready:
+                self._frontier_ready.notify_all()
+            for stage, _, _ in stages:
+                for _ in range(self.workers[stage]):
+                    self._queues[stage].put(_STOP)
+            for thread in threads:
+                thread.join(timeout=self.request_timeout)
+            self.state.save()
+            boilerplate.get_learner().save()
+        return dict(self.stats)
+
+    def run_forever(self, interval_seconds: float = 900):
+        """Re-crawls continuously; unchanged pages cost only a conditional request."""
+        while True:
+            stats = self.run()
+            print(f"Crawl pass finished: {stats}")
+            time.sleep(interval_seconds)
+
+    def start_background(self, interval_seconds: float = 900) -> threading.Thread:
+        """Runs run_forever() in a daemon thread."""
+        thread = threading.Thread(target=self.run_forever, args=(interval_seconds,),
+                                  name='crawl-pipeline', daemon=True)
+        thread.start()
+        return thread
+
+
+def load_sites(path: str = None) -> list:
+    """Reads the seed URLs from sites.txt (one per line)."""
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sites.txt')
+    with open(path, 'r', encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip()]
@@ -0,0 +1,141 @@
+"""
+Query-aware passage retrieval for cleaned page text.
+
+The text extracted from a page is split into passages of roughly PASSAGE_WORDS
+words, cut at sentence ends, and scored against the query with BM25. The
+statistics come from the passages of the page itself, so no corpus or index is
+needed.
+Only the top-k passages are returned, so a tool can hand the model the
+relevant few hundred words of a page instead of all of it.
+"""
+
+import math
+import re
+from collections import Counter
+
+PASSAGE_WORDS = 120
+MAX_PASSAGE_WORDS = 200
+TOP_K = 5
+
+# BM25 parameters (the usual defaults)
+K1 = 1.5
+B = 0.75
+# Weight of a boost term relative to a query term: the company a question is
+# about should break ties, not outrank what was asked
+BOOST_WEIGHT = 0.3
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.&'][a-z0-9]+)*")
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"“(])')
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can did do does for from had has have how i if in into is it its
+me my no not of on or our so than that the their them then there these they this to was we were
+what when where which who why will with would you your about any
+""".split())
+
+
+def _stem(token: str) -> str:
+    # Light suffix stripping, enough to match "earnings"/"earning" and "companies"/"company"
+    if token.endswith("'s"):
+        token = token[:-2]
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list:
+    """Lowercased, stemmed terms of a text, without stopwords."""
+    return [_stem(t) for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def split_passages(text: str, target_words: int = PASSAGE_WORDS, max_words: int = MAX_PASSAGE_WORDS) -> list:
+    """
+    Splits cleaned page text into passages of about target_words words.
+
+    Returns:
+        list: The passage strings, in page order.
+    """
+    # Text nodes of one paragraph often end up on separate lines (links, bold
+    # words), so lines are merged and passages are cut at sentence ends
+    sentences = []
+    for line in text.splitlines():
+        line = ' '.join(line.split())
+        if line:
+            sentences.extend(_SENTENCE_END.split(line))
+
+    passages, current, words = [], [], 0
+    for sentence in sentences:
+        length = len(sentence.split())
+        if current and (words >= target_words or words + length > max_words):
+            passages.append(' '.join(current))
+            current, words = [], 0
+        current.append(sentence)
+        words += length
+    if current:
+        passages.append(' '.join(current))
+    return passages
+
+
+def bm25_scores(query_weights: dict, documents: list) -> list:
+    """
+    BM25 score of every tokenized document for the weighted query terms
+    (term -> weight), with the documents themselves as the corpus.
+    """
+    count = len(documents)
+    if not count or not query_weights:
+        return [0.0] * count
+    average_length = sum(len(d) for d in documents) / count or 1.0
+    document_frequency = Counter()
+    for document in documents:
+        document_frequency.update(set(document))
+
+    scores = []
+    for document in documents:
+        frequencies = Counter(document)
+        norm = K1 * (1 - B + B * len(document) / average_length)
+        score = 0.0
+        for term, weight in query_weights.items():
+            frequency = frequencies.get(term)
+            if frequency:
+                idf = math.log(1 + (count - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+                score += weight * idf * frequency * (K1 + 1) / (frequency + norm)
+        scores.append(score)
+    return scores
+
+
+def rank_passages(text: str, query: str, top_k: int = TOP_K, boost_terms=()) -> dict:
+    """
+    Returns the passages of text that best match query.
+
+    Args:
+        text (str): Cleaned page text.
+        query (str): What the user is looking for.
+        top_k (int): Number of passages to return.
+        boost_terms: Extra text with a lower weight (BOOST_WEIGHT), e.g. the
+                     ticker and company name the question is about.
+
+    Returns:
+        dict: 'passages' (best first; each with 'text', 'score' and its 'position'
+              in the page), 'total_passages' and 'matched' (False when no passage
+              contains a query term, in which case the first passages are returned).
+    """
+    passages = split_passages(text)
+    weights = Counter(tokenize(query))
+    for extra in boost_terms:
+        for term in tokenize(extra or ''):
+            weights[term] += BOOST_WEIGHT
+    scores = bm25_scores(weights, [tokenize(p) for p in passages])
+    matched = any(score > 0 for score in scores)
+    if matched:
+        order = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+    else:
+        order = range(len(passages))
+    return {
+        "passages": [
+            {"text": passages[i], "score": round(scores[i], 3), "position": i}
+            for i in list(order)[:max(1, top_k)] if not matched or scores[i] > 0
+        ],
+        "total_passages": len(passages),
+        "matched": matched,
+    }
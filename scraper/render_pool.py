@@ -0,0 +1,228 @@
+"""
+Optional headless-browser rendering for JavaScript-heavy pages.
+
+Keeps a bounded pool of warm, reusable headless Chrome instances (Selenium), so
+a page that arrives as an empty JavaScript shell can be rendered without paying
+a browser start-up per request. scrape_content only falls back to the pool when
+the static HTML looks like such a shell.
+
+Opt-in: set SCRAPER_RENDERING=1 (pool size RENDER_POOL_SIZE, default 2).
+Run this module directly to try it against a local static server.
+"""
+
+import atexit
+import os
+import queue
+import re
+import threading
+import time
+
+DEFAULT_POOL_SIZE = 2
+# Browsers are restarted after this many pages to bound their memory growth
+MAX_PAGES_PER_BROWSER = 50
+PAGE_TIMEOUT_SECONDS = 20
+# Longest a render waits for a browser of the pool to become free
+CHECKOUT_TIMEOUT_SECONDS = 20
+RENDER_WAIT_SECONDS = 5
+
+# Shell pages: little visible text but an app mount point or many scripts
+MIN_STATIC_TEXT_LENGTH = 200
+_APP_ROOT = re.compile(r'<div[^>]+id=["\'](root|app|__next|__nuxt|svelte)["\']', re.IGNORECASE)
+_SCRIPT_TAG = re.compile(r'<script\b', re.IGNORECASE)
+_ENABLE_JS = re.compile(r'enable javascript|requires javascript|javascript is disabled', re.IGNORECASE)
+
+
+def looks_like_empty_shell(html: str, text: str) -> bool:
+    """
+    Whether a statically fetched page needs JavaScript to show its content.
+
+    Args:
+        html (str): The raw HTML.
+        text (str): The main text extracted from it (None if nothing was found).
+    """
+    if text and len(text) >= MIN_STATIC_TEXT_LENGTH:
+        return False
+    return bool(_APP_ROOT.search(html) or _ENABLE_JS.search(html) or len(_SCRIPT_TAG.findall(html)) >= 3)
+
+
+def _chrome_driver():
+    """Starts a headless Chrome instance (Selenium Manager or webdriver-manager finds the driver)."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    for argument in ('--headless=new', '--disable-gpu', '--no-sandbox', '--disable-dev-shm-usage',
+                     '--blink-settings=imagesEnabled=false', '--window-size=1366,900'):
+        options.add_argument(argument)
+    options.page_load_strategy = 'eager'
+    try:
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    except ImportError:
+        driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(PAGE_TIMEOUT_SECONDS)
+    return driver
+
+
+class _Browser:
+    __slots__ = ('driver', 'pages')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class RenderPool:
+    """Bounded pool of reusable browser instances."""
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, driver_factory=_chrome_driver,
+                 max_pages_per_browser: int = MAX_PAGES_PER_BROWSER):
+        self.size = size
+        self.driver_factory = driver_factory
+        self.max_pages_per_browser = max_pages_per_browser
+        self._idle = queue.LifoQueue()  # most recently used first: its caches are warmest
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._browsers = set()
+        self._closed = False
+
+    def warm(self, count: int = None):
+        """Starts browsers ahead of the first request (all of them by default)."""
+        started = []
+        for _ in range(min(count or self.size, self.size)):
+            started.append(self._checkout(None))
+        for browser in started:
+            self._checkin(browser)
+
+    def _checkout(self, timeout) -> _Browser:
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser of the render pool became free within {timeout:g}s")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            browser = _Browser(self.driver_factory())
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._browsers.add(browser)
+        return browser
+
+    def _checkin(self, browser: _Browser, healthy: bool = True):
+        if self._closed or not healthy or browser.pages >= self.max_pages_per_browser:
+            self._quit(browser)
+        else:
+            self._idle.put(browser)
+        self._slots.release()
+
+    def _quit(self, browser: _Browser):
+        with self._lock:
+            self._browsers.discard(browser)
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+
+    def render(self, url: str, wait_seconds: float = RENDER_WAIT_SECONDS,
+               checkout_timeout: float = CHECKOUT_TIMEOUT_SECONDS) -> str:
+        """
+        Loads a page in a pooled browser and returns the HTML after its scripts
+        ran (once the body has text, or after wait_seconds).
+
+        Raises:
+            TimeoutError: No browser became free within checkout_timeout seconds.
+        """
+        if self._closed:
+            raise RuntimeError("Render pool is closed")
+        browser = self._checkout(checkout_timeout)
+        healthy = False
+        try:
+            driver = browser.driver
+            driver.get(url)
+            deadline = time.monotonic() + wait_seconds
+            while time.monotonic() < deadline:
+                if driver.execute_script(
+                        "return document.readyState === 'complete' && "
+                        "document.body !== null && document.body.innerText.trim().length > 0"):
+                    break
+                time.sleep(0.1)
+            html = driver.page_source
+            browser.pages += 1
+            healthy = True
+            return html
+        finally:
+            self._checkin(browser, healthy)
+
+    def close(self):
+        """Quits every browser of the pool."""
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            remaining = list(self._browsers)
+        for browser in remaining:
+            self._quit(browser)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def rendering_enabled() -> bool:
+    return os.getenv("SCRAPER_RENDERING", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_pool():
+    """Returns the process-wide render pool, or None when rendering is not enabled."""
+    global _pool
+    if not rendering_enabled():
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = RenderPool(size=int(os.getenv("RENDER_POOL_SIZE", DEFAULT_POOL_SIZE)))
+            atexit.register(_pool.close)
+        return _pool
+
+
+if __name__ == "__main__":
+    # Serves a JavaScript-only page from a temporary directory and scrapes it
+    # with the static path and then through the render pool.
+    import functools
+    import http.server
+    import tempfile
+
+    try:
+        from . import scraper
+    except ImportError:
+        import scraper
+
+    page = """<html><head><title>Shell</title></head><body><div id="root"></div><script>
+    document.getElementById('root').innerHTML = '<article><h1>Rendered headline</h1>' +
+        '<p>' + 'This paragraph only exists after JavaScript ran. '.repeat(8) + '</p></article>';
+    </script></body></html>"""
+    directory = tempfile.mkdtemp()
+    with open(os.path.join(directory, 'index.html'), 'w', encoding='utf-8') as file:
+        file.write(page)
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+    os.environ.pop("SCRAPER_RENDERING", None)
+    print("Static only:", scraper.scrape_content(url)[:200])
+    os.environ["SCRAPER_RENDERING"] = "1"
+    pool = get_pool()
+    started = time.perf_counter()
+    pool.warm()
+    print(f"Pool of {pool.size} browsers warmed in {time.perf_counter() - started:.2f}s")
+    for attempt in range(3):
+        started = time.perf_counter()
+        text = scraper.scrape_content(url)
+        print(f"Rendered ({time.perf_counter() - started:.2f}s):", text[:200])
+    server.shutdown()
@@ -3,15 +3,12 @@ from bs4 import BeautifulSoup
 import re
 from urllib.parse import urlparse, urljoin
 import os
-# These imports are for Selenium, which is currently commented out for simplicity in this agent integration.
-# from selenium import webdriver
-# from selenium.webdriver.chrome.options import Options
-# from selenium.webdriver.chrome.service import Service
-# from selenium.webdriver.common.by import By
-# from selenium.webdriver.support.ui import WebDriverWait
-# from selenium.webdriver.support import expected_conditions as EC
-# from webdriver_manager.chrome import ChromeDriverManager
-# import time
+
+try:
+    from . import boilerplate, render_pool
+except ImportError:
+    import boilerplate
+    import render_pool
 
 # Define a browser-like User-Agent header for all requests
 HEADERS = {
@@ -48,10 +45,107 @@ def check_robots_txt(url):
         print(f"Error checking robots.txt at {robots_url}: {e}. Proceeding assuming allowed.")
         return True # Default to True if robots.txt check fails
 
+def extract_main_text(html, url: str = None) -> str:
+    """
+    Extracts the main text content from an HTML document, removing navigation,
+    scripts, ads and other page furniture.
+    
+    Args:
+        html (str | bytes): The raw HTML document.
+        url (str): The page URL. When given, the page's template is learned per
+                   domain and blocks repeated across the site's pages are removed first.
+        
+    Returns:
+        str: The cleaned text of the main content, or None if no content container was found.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Drop the site's known template blocks before the generic cleanup below
+    if url:
+        boilerplate.get_learner().learn_and_strip(soup, urlparse(url).netloc, url)
+    
+    return _extract_from_soup(soup)
+
+def parse_page(html, known_boilerplate=None) -> tuple:
+    """
+    Process-pool friendly variant of extract_main_text: strips the given
+    boilerplate fingerprints and returns the text together with the page's
+    fingerprints, so the calling process can update its boilerplate learner.
+    
+    Args:
+        html (str | bytes): The raw HTML document.
+        known_boilerplate (set): Boilerplate fingerprints of the page's domain.
+        
+    Returns:
+        tuple: (cleaned text or None, list of the page's fingerprints)
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    fingerprints = boilerplate.fingerprint_tree(soup)
+    boilerplate.strip(soup, fingerprints, known_boilerplate)
+    return _extract_from_soup(soup), boilerplate.page_fingerprints(fingerprints)
+
+def _extract_from_soup(soup) -> str:
+    """Generic cleanup and main-container extraction shared by extract_main_text and parse_page."""
+    # Remove unwanted elements that are typically not part of the main content
+    unwanted_tags = [
+        'nav', 'header', 'footer', 'aside', 'script', 'style', 'noscript',
+        'iframe', 'embed', 'object', 'applet', 'form', 'button', 'input',
+        'select', 'textarea', 'fieldset', 'legend', 'optgroup', 'option',
+        'img', 'svg', 'canvas', # Consider if images/visuals are needed. For text, remove.
+        'audio', 'video'
+    ]
+    
+    for tag in unwanted_tags:
+        for element in soup.find_all(tag):
+            element.decompose()
+    
+    # Remove elements with common ad/navigation/social classes or IDs
+    unwanted_patterns = [
+        'nav', 'navigation', 'menu', 'sidebar', 'ad', 'advertisement',
+        'banner', 'header', 'footer', 'social', 'share', 'comment',
+        'related', 'recommended', 'popular', 'trending', 'newsletter',
+        'promo', 'popup', 'modal', 'overlay'
+    ]
+    
+    for pattern in unwanted_patterns:
+        # Find by class
+        for element in soup.find_all(class_=lambda x: x and pattern in x.lower()):
+            element.decompose()
+        # Find by id
+        for element in soup.find_all(id=lambda x: x and pattern in x.lower()):
+            element.decompose()
+    
+    # Extract main content using common content containers
+    main_content = None
+    content_selectors = [
+        'main', 'article', '.content', '.main-content', '.post-content',
+        '.entry-content', '.article-content', '.page-content', '#content',
+        '#main', '#primary', '.primary', '.main', 'body' # 'body' as a last resort
+    ]
+    
+    for selector in content_selectors:
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+    
+    if not main_content:
+        return None
+    
+    # Clean up whitespace and get text
+    cleaned_content = main_content.get_text(separator='\n', strip=True)
+    
+    # Remove excessive whitespace and multiple spaces
+    cleaned_content = re.sub(r'\n\s*\n', '\n\n', cleaned_content) # Multiple newlines to double newline
+    cleaned_content = re.sub(r' +', ' ', cleaned_content) # Multiple spaces to single space
+    cleaned_content = re.sub(r'\t', ' ', cleaned_content) # Tabs to spaces
+    
+    return cleaned_content
+
 def scrape_content(url: str) -> str:
     """
     Scrapes content from a single URL using requests (for static content).
     This function focuses on extracting meaningful text content from the HTML.
+    Pages that need JavaScript are rendered through render_pool when SCRAPER_RENDERING is set.
     
     Args:
         url (str): The URL to scrape.
@@ -66,59 +160,15 @@ def scrape_content(url: str) -> str:
         response = requests.get(url, headers=HEADERS, timeout=15)
         response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        cleaned_content = extract_main_text(response.content, url)
         
-        # Remove unwanted elements that are typically not part of the main content
-        unwanted_tags = [
-            'nav', 'header', 'footer', 'aside', 'script', 'style', 'noscript',
-            'iframe', 'embed', 'object', 'applet', 'form', 'button', 'input',
-            'select', 'textarea', 'fieldset', 'legend', 'optgroup', 'option',
-            'img', 'svg', 'canvas', # Consider if images/visuals are needed. For text, remove.
-            'audio', 'video'
-        ]
+        # JavaScript-rendered sites return an empty shell; render those in a pooled browser (opt-in)
+        pool = render_pool.get_pool()
+        if pool is not None and render_pool.looks_like_empty_shell(response.text, cleaned_content):
+            print(f"Rendering JavaScript page {url} in a headless browser")
+            cleaned_content = extract_main_text(pool.render(url), url)
         
-        for tag in unwanted_tags:
-            for element in soup.find_all(tag):
-                element.decompose()
-        
-        # Remove elements with common ad/navigation/social classes or IDs
-        unwanted_patterns = [
-            'nav', 'navigation', 'menu', 'sidebar', 'ad', 'advertisement',
-            'banner', 'header', 'footer', 'social', 'share', 'comment',
-            'related', 'recommended', 'popular', 'trending', 'newsletter',
-            'promo', 'popup', 'modal', 'overlay'
-        ]
-        
-        for pattern in unwanted_patterns:
-            # Find by class
-            for element in soup.find_all(class_=lambda x: x and pattern in x.lower()):
-                element.decompose()
-            # Find by id
-            for element in soup.find_all(id=lambda x: x and pattern in x.lower()):
-                element.decompose()
-        
-        # Extract main content using common content containers
-        main_content = None
-        content_selectors = [
-            'main', 'article', '.content', '.main-content', '.post-content',
-            '.entry-content', '.article-content', '.page-content', '#content',
-            '#main', '#primary', '.primary', '.main', 'body' # 'body' as a last resort
-        ]
-        
-        for selector in content_selectors:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-        
-        if main_content:
-            # Clean up whitespace and get text
-            cleaned_content = main_content.get_text(separator='\n', strip=True)
-            
-            # Remove excessive whitespace and multiple spaces
-            cleaned_content = re.sub(r'\n\s*\n', '\n\n', cleaned_content) # Multiple newlines to double newline
-            cleaned_content = re.sub(r' +', ' ', cleaned_content) # Multiple spaces to single space
-            cleaned_content = re.sub(r'\t', ' ', cleaned_content) # Tabs to spaces
-            
+        if cleaned_content is not None:
             return cleaned_content
         else:
             return "No main content found in the page."
@@ -130,22 +180,26 @@ def scrape_content(url: str) -> str:
 
 # Example of how you might use it if running directly, though the agent will call scrape_content
 if __name__ == "__main__":
-    # For local testing, read URLs from sites.txt
+    # Crawl every site in sites.txt through the staged pipeline and index the
+    # stored pages for the agent's search_scraped_content tool. Pass --forever
+    # to keep re-crawling in the background; unchanged pages are skipped.
+    import sys
+    from crawl_pipeline import CrawlPipeline, load_sites
+
+    # The content index lives in the agent's services package
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'parent_folder',
+                                 'financial_information_agent'))
+    from services import content_index
+
     try:
-        with open('sites.txt', 'r', encoding='utf-8') as file:
-            test_urls = [line.strip() for line in file if line.strip()]
+        test_urls = load_sites()
     except FileNotFoundError:
         print("sites.txt not found. Please create it with URLs for testing.")
         test_urls = ["https://www.cnbc.com/finance/", "https://finance.yahoo.com/news/"]
 
-    print("--- Starting example scraping ---")
-    for url in test_urls:
-        processed_text = scrape_content(url)
-        print(f"\n--- Processed content from {url} ---")
-        print(processed_text[:500]) # Print first 500 characters for brevity
-        print("...")
-
-    # Clean up temp directory
-    # import shutil
-    # if os.path.exists(TEMP_UNPROCESSED_DIR):
-    #     shutil.rmtree(TEMP_UNPROCESSED_DIR)
\ No newline at end of file
+    print("--- Starting crawl ---")
+    pipeline = CrawlPipeline(test_urls, sinks=[content_index.get_index().add_crawled_document])
+    if "--forever" in sys.argv:
+        pipeline.run_forever()
+    else:
+        print(pipeline.run())